@@ -0,0 +1,409 @@
+"""
+Local HTTP analysis service for the web front end.
+
+Serves precomputed analysis results as compact JSON so the browser fetches kilobytes of results
+instead of downloading and parsing the raw consumption workbook and price CSV. The service reads
+the files the Node server stores in node-js-app/uploads (or explicit paths), reloads them when
+they change, and answers from the rollup cube and ProfileCube built once per data version.
+Responses are cached per data version and query, carry an ETag, and are gzip-compressed when the
+client accepts it.
+
+Endpoints (GET):
+    /api/analysis/summary                       data range and version
+    /api/analysis/monthly?grid_base_fee=&grid_work_fee=
+                                                monthly cost breakdown (all data)
+    /api/analysis/profile?start=YYYY-MM-DD&end=YYYY-MM-DD
+                                                time-of-day profile, selected range vs overall
+    /api/analysis/statistics?start=&end=&grid_base_fee=&grid_work_fee=
+                                                totals and monthly averages of a range
+
+Usage:
+    python analysis_service.py --port 8050
+"""
+
+import argparse
+import glob
+import gzip
+import hashlib
+import json
+import os
+import sys
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+import pandas as pd
+
+from cost_calculator import PowerCostCalculator
+from data_loader import CACHE_DIR, CONSUMPTION_COL, PRICE_COL, load_consumption, load_prices
+from profile_cube import SLOT_LABELS, ProfileCube
+from tariff import GRID_BASE_FEE, GRID_WORK_FEE
+
+DEFAULT_PORT = 8050
+DEFAULT_UPLOAD_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'node-js-app', 'uploads')
+
+# Cached response bodies (all data versions together)
+RESPONSE_CACHE_SIZE = 256
+
+# Responses smaller than this are sent uncompressed
+GZIP_MIN_BYTES = 1024
+
+# Decimals of floats in responses
+DECIMALS = 4
+
+
+class RequestError(Exception):
+    """Invalid request; carries the HTTP status code."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+@dataclass
+class AnalysisData:
+    """
+    One loaded data version.
+
+    Attributes
+    ----------
+    version : str
+        Short digest of the input files' names, sizes and modification times.
+    consumption_file, price_file : str
+        Input files.
+    calculator : PowerCostCalculator
+        Calculator with the merged data (provider fees only; grid fees are added per request).
+    profile_cube : ProfileCube
+        Time-of-day profile cube of the consumption.
+    min_date, max_date : datetime.date
+        First and last local day with consumption.
+    """
+
+    version: str
+    consumption_file: str
+    price_file: str
+    calculator: PowerCostCalculator
+    profile_cube: ProfileCube
+    min_date: object
+    max_date: object
+
+
+def _rounded(values) -> list:
+    """Return floats as a JSON list rounded to DECIMALS (NaN becomes null)."""
+    values = np.round(np.asarray(values, dtype='float64'), DECIMALS)
+    return [None if np.isnan(v) else float(v) for v in values]
+
+
+def _date_param(query: dict, name: str, default):
+    """Read a YYYY-MM-DD query parameter."""
+    if name not in query:
+        return default
+    try:
+        value = pd.Timestamp(query[name])
+    except ValueError:
+        value = pd.NaT
+    if pd.isna(value):
+        raise RequestError(400, f"Invalid date for '{name}': {query[name]!r}")
+    return value.date()
+
+
+def _fee_param(query: dict, name: str, default: float) -> float:
+    """Read a non-negative fee query parameter."""
+    if name not in query:
+        return default
+    try:
+        value = float(query[name])
+    except ValueError:
+        value = -1.0
+    if not value >= 0:
+        raise RequestError(400, f"Invalid value for '{name}': {query[name]!r}")
+    return value
+
+
+class AnalysisService:
+    """
+    Load data on demand and answer analysis requests.
+
+    Parameters
+    ----------
+    consumption_file, price_file : str, optional
+        Input files. Default: the latest uploads in upload_dir.
+    upload_dir : str, optional
+        Directory where the Node server stores uploads as consumption_latest.* and
+        price_latest.*. Default: node-js-app/uploads next to this module.
+    cache_dir : str or None, optional
+        Parsed-data cache directory (None disables it). Default: CACHE_DIR.
+    """
+
+    def __init__(self, consumption_file: str | None = None, price_file: str | None = None,
+                 upload_dir: str = DEFAULT_UPLOAD_DIR, cache_dir: str | None = CACHE_DIR):
+        """
+        Initialize an AnalysisService.
+
+        See class docstring for parameter details.
+        """
+        self.consumption_file = consumption_file
+        self.price_file = price_file
+        self.upload_dir = upload_dir
+        self.cache_dir = cache_dir
+        self._data: AnalysisData | None = None
+        self._responses: OrderedDict[tuple, bytes] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def input_files(self) -> tuple[str, str]:
+        """
+        Return the consumption and price file to analyse.
+
+        Raises
+        ------
+        RequestError
+            404 if a file is missing.
+        """
+        def latest(kind: str, given: str | None) -> str:
+            if given:
+                candidates = [given] if os.path.exists(given) else []
+            else:
+                candidates = sorted(glob.glob(os.path.join(self.upload_dir, f'{kind}_latest.*')),
+                                    key=os.path.getmtime)
+            if not candidates:
+                raise RequestError(404, f'No {kind} file found')
+            return candidates[-1]
+
+        return latest('consumption', self.consumption_file), latest('price', self.price_file)
+
+    def data(self) -> AnalysisData:
+        """Return the loaded data, reloading it if an input file changed."""
+        consumption_file, price_file = self.input_files()
+        digest = hashlib.blake2b(digest_size=6)
+        for path in (consumption_file, price_file):
+            stat = os.stat(path)
+            digest.update(f'{os.path.abspath(path)}|{stat.st_size}|{stat.st_mtime_ns}|'.encode())
+        version = digest.hexdigest()
+        if self._data is not None and self._data.version == version:
+            return self._data
+
+        try:
+            consumption = load_consumption(consumption_file, self.cache_dir)
+            prices = load_prices(price_file, self.cache_dir)
+        except Exception as e:
+            raise RequestError(422, f'Could not read input files: {type(e).__name__}: {e}')
+        if consumption.empty:
+            raise RequestError(422, 'Consumption file holds no valid intervals')
+
+        calculator = PowerCostCalculator(
+            consumption_df=consumption,
+            price_df=prices,
+            price_col=PRICE_COL,
+            consumption_col=CONSUMPTION_COL,
+            timestamp_col='timestamp'
+        )
+        # Merge and rollup cube once per data version; requests only read the cube
+        calculator.rollup()
+        self._data = AnalysisData(
+            version=version,
+            consumption_file=consumption_file,
+            price_file=price_file,
+            calculator=calculator,
+            profile_cube=ProfileCube(consumption, CONSUMPTION_COL, 'timestamp'),
+            min_date=consumption['timestamp'].min().date(),
+            max_date=consumption['timestamp'].max().date(),
+        )
+        return self._data
+
+    def respond(self, path: str, query: dict) -> tuple[bytes, str]:
+        """
+        Return the JSON body and data version for a request, from the cache if possible.
+
+        Raises
+        ------
+        RequestError
+            For unknown endpoints, invalid parameters or missing/unreadable data.
+        """
+        endpoints = {
+            '/api/analysis/summary': self.summary,
+            '/api/analysis/monthly': self.monthly,
+            '/api/analysis/profile': self.profile,
+            '/api/analysis/statistics': self.statistics,
+        }
+        endpoint = endpoints.get(path.rstrip('/'))
+        if endpoint is None:
+            raise RequestError(404, f'Unknown endpoint {path}')
+
+        with self._lock:
+            data = self.data()
+            key = (data.version, path.rstrip('/'), tuple(sorted(query.items())))
+            body = self._responses.pop(key, None)
+            if body is None:
+                body = json.dumps(endpoint(data, query), separators=(',', ':')).encode()
+            # Most recently used entries last
+            self._responses[key] = body
+            while len(self._responses) > RESPONSE_CACHE_SIZE:
+                del self._responses[next(iter(self._responses))]
+            return body, data.version
+
+    def summary(self, data: AnalysisData, query: dict) -> dict:
+        """Data range, input files and merge counts."""
+        stats = data.calculator.merge_stats
+        return {
+            'version': data.version,
+            'consumption_file': os.path.basename(data.consumption_file),
+            'price_file': os.path.basename(data.price_file),
+            'min_date': data.min_date.isoformat(),
+            'max_date': data.max_date.isoformat(),
+            'intervals': len(data.calculator.merged_df),
+            'filled': stats.filled,
+            'dropped': stats.dropped,
+        }
+
+    def monthly(self, data: AnalysisData, query: dict) -> dict:
+        """Monthly cost breakdown of all data, provider fees plus grid fees (column arrays)."""
+        grid_base_fee = _fee_param(query, 'grid_base_fee', GRID_BASE_FEE)
+        grid_work_fee = _fee_param(query, 'grid_work_fee', GRID_WORK_FEE)
+        monthly = data.calculator.rollup().frame('month')
+        grid_work = monthly['consumption'].to_numpy() * grid_work_fee
+        grid_base = np.full(len(monthly), grid_base_fee)
+        total = monthly['total_cost'].to_numpy() + grid_work + grid_base
+        return {
+            'months': [str(month) for month in monthly.index],
+            'consumption': _rounded(monthly['consumption']),
+            'market_cost': _rounded(monthly['market_cost']),
+            'variable_fee': _rounded(monthly['variable_fee']),
+            'fixed_fee': _rounded(monthly['fixed_fee']),
+            'grid_work_cost': _rounded(grid_work),
+            'grid_base_cost': _rounded(grid_base),
+            'total_cost': _rounded(total),
+        }
+
+    def profile(self, data: AnalysisData, query: dict) -> dict:
+        """Time-of-day profile of a date range and the overall profile scaled to its total."""
+        start = _date_param(query, 'start', data.min_date)
+        end = _date_param(query, 'end', data.max_date)
+        selected, overall = data.profile_cube.compare(start, end)
+        return {
+            'start': start.isoformat(),
+            'end': end.isoformat(),
+            'labels': SLOT_LABELS.tolist(),
+            'selected': _rounded(selected),
+            'overall': _rounded(overall),
+        }
+
+    def statistics(self, data: AnalysisData, query: dict) -> dict:
+        """Totals and monthly averages of a date range, provider fees plus grid fees."""
+        start = _date_param(query, 'start', data.min_date)
+        end = _date_param(query, 'end', data.max_date)
+        grid_base_fee = _fee_param(query, 'grid_base_fee', GRID_BASE_FEE)
+        grid_work_fee = _fee_param(query, 'grid_work_fee', GRID_WORK_FEE)
+        totals = data.calculator.rollup().window(start, end)
+        months = max(totals.months, 1)
+        total_cost = totals.total_cost + totals.consumption * grid_work_fee + totals.months * grid_base_fee
+        market_price = totals.market_cost / totals.consumption if totals.consumption > 0 else 0.0
+        return {
+            'start': start.isoformat(),
+            'end': end.isoformat(),
+            'intervals': totals.intervals,
+            'months': totals.months,
+            'total_consumption': round(totals.consumption, DECIMALS),
+            'total_cost': round(total_cost, DECIMALS),
+            'avg_monthly_consumption': round(totals.consumption / months, DECIMALS),
+            'avg_monthly_cost': round(total_cost / months, DECIMALS),
+            'avg_market_price': round(market_price * 100, DECIMALS),  # cents/kWh
+        }
+
+
+class AnalysisRequestHandler(BaseHTTPRequestHandler):
+    """HTTP handler answering GET requests from the server's AnalysisService."""
+
+    server_version = 'PowerAnalysis/1.0'
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        query = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        try:
+            body, version = self.server.service.respond(url.path, query)
+        except RequestError as e:
+            self._send(e.status, json.dumps({'success': False, 'error': str(e)}).encode())
+            return
+        except Exception as e:
+            # Answer instead of dropping the connection, so the web app's proxy can report it
+            self.log_error('%s failed: %r', url.path, e)
+            self._send(500, json.dumps({'success': False, 'error': f'{type(e).__name__}: {e}'}).encode())
+            return
+
+        etag = f'"{version}-{hashlib.blake2b(body, digest_size=6).hexdigest()}"'
+        if self.headers.get('If-None-Match') == etag:
+            self._send(304, b'', etag=etag)
+            return
+        self._send(200, body, etag=etag)
+
+    def do_OPTIONS(self):
+        self._send(204, b'')
+
+    def _send(self, status: int, body: bytes, etag: str | None = None):
+        """Send a JSON response, gzip-compressed if accepted and worthwhile."""
+        self.send_response(status)
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Cache-Control', 'no-cache')
+        if etag:
+            self.send_header('ETag', etag)
+        if status in (204, 304):
+            self.end_headers()
+            return
+        if len(body) >= GZIP_MIN_BYTES and 'gzip' in self.headers.get('Accept-Encoding', ''):
+            body = gzip.compress(body)
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+
+def make_server(service: AnalysisService, host: str = '127.0.0.1', port: int = DEFAULT_PORT,
+                quiet: bool = False) -> ThreadingHTTPServer:
+    """Return an HTTP server answering requests from service (call serve_forever() to run it)."""
+    server = ThreadingHTTPServer((host, port), AnalysisRequestHandler)
+    server.service = service
+    server.quiet = quiet
+    return server
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Return the command line parser."""
+    parser = argparse.ArgumentParser(
+        prog='analysis-service',
+        description='Serve power consumption analysis results as JSON for the web front end.')
+    parser.add_argument('--host', default='127.0.0.1', help='Address to bind (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help=f'Port (default: {DEFAULT_PORT})')
+    parser.add_argument('--upload-dir', default=DEFAULT_UPLOAD_DIR,
+                        help='Directory with the web app uploads (default: node-js-app/uploads)')
+    parser.add_argument('--consumption', help='Consumption XLSX file (default: latest upload)')
+    parser.add_argument('--prices', help='Price CSV file (default: latest upload)')
+    parser.add_argument('--cache-dir', default=CACHE_DIR,
+                        help=f"Parsed-data cache directory, '' to disable (default: {CACHE_DIR})")
+    parser.add_argument('--quiet', action='store_true', help='Do not log requests')
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the analysis service until interrupted."""
+    args = build_parser().parse_args(argv)
+    service = AnalysisService(args.consumption, args.prices, args.upload_dir, args.cache_dir or None)
+    server = make_server(service, args.host, args.port, args.quiet)
+    print(f'Analysis service on http://{args.host}:{args.port}/api/analysis/ (data: {args.upload_dir})')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
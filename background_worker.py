@@ -0,0 +1,190 @@
+"""
+Background worker module.
+
+Runs parsing, merging and aggregation off the Tk main thread. Jobs execute one at a time on a
+single worker thread; the main thread polls for progress messages and finished results with
+`root.after`, so all Tk and matplotlib calls stay on the main thread and only the final results
+are handed over. Submitting a job cancels the previous job of the same kind, and results of
+cancelled jobs are discarded.
+"""
+
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+POLL_INTERVAL_MS = 50
+
+
+class JobCancelled(Exception):
+    """Raised inside a job when it was superseded or the worker shut down."""
+
+
+class Job:
+    """
+    Handle of a submitted background job.
+
+    The job function receives its Job as first argument and should call `check()` between
+    expensive steps and `report()` to publish progress messages.
+
+    Parameters
+    ----------
+    kind : str
+        Job category; a new job of the same kind cancels this one.
+    progress : queue.Queue
+        Queue that progress messages are put on.
+    """
+
+    def __init__(self, kind: str, progress: queue.Queue):
+        """
+        Initialize a Job.
+
+        See class docstring for parameter details.
+        """
+        self.kind = kind
+        self._progress = progress
+        self._cancelled = threading.Event()
+        self.future = None
+        self.on_done = None
+        self.on_error = None
+        self.on_progress = None
+
+    @property
+    def cancelled(self) -> bool:
+        """True once the job was cancelled."""
+        return self._cancelled.is_set()
+
+    def cancel(self):
+        """Request cancellation; the job stops at its next check()."""
+        self._cancelled.set()
+
+    def check(self):
+        """
+        Stop the job if it was cancelled.
+
+        Raises
+        ------
+        JobCancelled
+            If cancel() was called.
+        """
+        if self._cancelled.is_set():
+            raise JobCancelled(self.kind)
+
+    def report(self, message: str):
+        """Publish a progress message to the main thread (ignored once cancelled)."""
+        if not self._cancelled.is_set():
+            self._progress.put((self, message))
+
+
+class BackgroundWorker:
+    """
+    Single-thread job executor polled from the Tk event loop.
+
+    Parameters
+    ----------
+    root : tk.Tk
+        Tk root used to schedule polling with after().
+    poll_interval_ms : int, optional
+        Polling interval while jobs are pending. Default: 50 ms.
+    """
+
+    def __init__(self, root, poll_interval_ms: int = POLL_INTERVAL_MS):
+        """
+        Initialize a BackgroundWorker.
+
+        See class docstring for parameter details.
+        """
+        self.root = root
+        self.poll_interval_ms = poll_interval_ms
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='power-worker')
+        self._progress: queue.Queue = queue.Queue()
+        self._pending: list[Job] = []
+        self._polling = None
+
+    @property
+    def busy(self) -> bool:
+        """True while any job is pending."""
+        return bool(self._pending)
+
+    def submit(self, kind: str, fn, *args, on_done=None, on_error=None, on_progress=None) -> Job:
+        """
+        Run fn(job, *args) on the worker thread.
+
+        Callbacks are invoked on the main thread: on_done(result) when the job finishes,
+        on_error(exception) if it raises, on_progress(message) for each report(). None of them
+        is called for a cancelled job.
+
+        Parameters
+        ----------
+        kind : str
+            Job category; the pending job of the same kind is cancelled.
+        fn : callable
+            Job function taking the Job followed by args.
+        *args
+            Arguments passed to fn. Pass data explicitly rather than reading GUI state in fn.
+        on_done, on_error, on_progress : callable, optional
+            Main-thread callbacks.
+
+        Returns
+        -------
+        Job
+            Handle of the submitted job.
+        """
+        self.cancel(kind)
+        job = Job(kind, self._progress)
+        job.on_done, job.on_error, job.on_progress = on_done, on_error, on_progress
+        job.future = self._executor.submit(self._run, job, fn, args)
+        self._pending.append(job)
+        if self._polling is None:
+            self._polling = self.root.after(self.poll_interval_ms, self._poll)
+        return job
+
+    def cancel(self, kind: str | None = None):
+        """Cancel the pending job of kind, or all pending jobs if kind is None."""
+        for job in self._pending:
+            if kind is None or job.kind == kind:
+                job.cancel()
+                job.future.cancel()
+
+    def shutdown(self):
+        """Cancel all jobs and stop polling; does not wait for a running job."""
+        self.cancel()
+        if self._polling is not None:
+            self.root.after_cancel(self._polling)
+            self._polling = None
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    @staticmethod
+    def _run(job: Job, fn, args):
+        """Worker-thread entry point; skips jobs cancelled while queued."""
+        job.check()
+        return fn(job, *args)
+
+    def _poll(self):
+        """Dispatch progress messages and finished jobs on the main thread."""
+        self._polling = None
+        while True:
+            try:
+                job, message = self._progress.get_nowait()
+            except queue.Empty:
+                break
+            if not job.cancelled and job.on_progress is not None:
+                job.on_progress(message)
+
+        finished, pending = [], []
+        for job in self._pending:
+            (finished if job.future.done() else pending).append(job)
+        self._pending = pending
+        for job in finished:
+            if job.cancelled or job.future.cancelled():
+                continue
+            error = job.future.exception()
+            if isinstance(error, JobCancelled):
+                continue
+            if error is not None:
+                if job.on_error is not None:
+                    job.on_error(error)
+            elif job.on_done is not None:
+                job.on_done(job.future.result())
+
+        if self._pending:
+            self._polling = self.root.after(self.poll_interval_ms, self._poll)
@@ -0,0 +1,337 @@
+"""
+Benchmark harness.
+
+Generates synthetic ökostrom consumption exports and APG price exports (see synthetic_data) for
+every combination of the requested years, meter counts and price resolutions, then times the
+processing stages on them and writes the timings as JSON, so regressions and scaling curves can
+be compared between runs:
+
+- load_consumption / load_prices: parsing the exports (cold, without the parse cache) and
+  load_consumption_cached: reloading from the parse cache
+- merge: aligning prices to the first meter's consumption (merge memo cleared)
+- calculate_costs, monthly_total (cold and cached), rollup
+- profile_cube / profile_compare: profile aggregation as used by the GUI
+- pyramid: building the time series level-of-detail pyramids
+- plot_profile, plot_monthly, plot_timeseries, pan_timeseries: the GUI charts rendered by the
+  Agg backend at the GUI's figure sizes, plot_monthly_costs: the calculator's pyplot chart
+- analysis_job: the GUI's background analysis (skipped when tkinter is unavailable)
+- portfolio: all meters costed by PortfolioCalculator (more than one meter only)
+
+Every stage runs --repeat times; min, median and mean seconds are recorded.
+
+Usage:
+    python benchmark.py --years 1 5 20 --meters 1 10 --price-resolution 15min hourly \\
+        --repeat 3 --output benchmark_results.json
+"""
+
+import argparse
+import datetime
+import gc
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+import matplotlib
+
+matplotlib.use('Agg')
+
+import matplotlib.pyplot as plt  # noqa: E402
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+from matplotlib.backends.backend_agg import FigureCanvasAgg  # noqa: E402
+from matplotlib.figure import Figure  # noqa: E402
+
+from charts import MonthlyChart, ProfileChart, TimeSeriesChart  # noqa: E402
+from cost_calculator import PowerCostCalculator, clear_merge_cache  # noqa: E402
+from data_loader import CONSUMPTION_COL, PRICE_COL, load_consumption, load_prices  # noqa: E402
+from downsampling import SeriesPyramid  # noqa: E402
+from portfolio import PortfolioCalculator  # noqa: E402
+from profile_cube import SLOT_LABELS, ProfileCube  # noqa: E402
+from synthetic_data import PRICE_RESOLUTIONS, write_dataset  # noqa: E402
+from tariff import provider_tariff  # noqa: E402
+from time_index import TimeIndex  # noqa: E402
+
+MAX_YEARS = 20
+MAX_METERS = 1000
+
+
+def time_stage(run, setup=None, repeat: int = 3) -> dict:
+    """
+    Time a callable.
+
+    Parameters
+    ----------
+    run : callable
+        Work to time; called with the result of setup (or without arguments).
+    setup : callable, optional
+        Untimed preparation before every run, e.g. clearing caches.
+    repeat : int, optional
+        Number of timed runs. Default: 3.
+
+    Returns
+    -------
+    dict
+        min, median and mean seconds and the individual runs.
+    """
+    runs = []
+    for _ in range(repeat):
+        args = () if setup is None else (setup(),)
+        gc.collect()
+        start = time.perf_counter()
+        run(*args)
+        runs.append(time.perf_counter() - start)
+    return {
+        'min': min(runs),
+        'median': statistics.median(runs),
+        'mean': statistics.fmean(runs),
+        'runs': runs,
+    }
+
+
+def _draw(figure):
+    """Render a figure completely with the Agg canvas."""
+    figure.canvas.draw()
+
+
+def _profile_chart():
+    """Fresh profile chart on an Agg canvas, sized like the GUI's."""
+    figure = Figure(figsize=(12, 5), dpi=100)
+    canvas = FigureCanvasAgg(figure)
+    return ProfileChart(figure, figure.add_subplot(111), canvas)
+
+
+def _monthly_chart():
+    """Fresh monthly chart on an Agg canvas, sized like the GUI's."""
+    figure = Figure(figsize=(12, 6), dpi=100)
+    canvas = FigureCanvasAgg(figure)
+    ax_costs = figure.add_subplot(111)
+    return MonthlyChart(figure, ax_costs, ax_costs.twinx(), canvas)
+
+
+def _timeseries_chart():
+    """Fresh time series chart on an Agg canvas, sized like the GUI's."""
+    figure = Figure(figsize=(12, 6), dpi=100)
+    canvas = FigureCanvasAgg(figure)
+    ax_consumption = figure.add_subplot(211)
+    return TimeSeriesChart(figure, ax_consumption, figure.add_subplot(212, sharex=ax_consumption), canvas)
+
+
+def _analysis_job():
+    """The GUI's analysis job, or None when the GUI cannot be imported (no tkinter/tkcalendar)."""
+    try:
+        from background_worker import Job
+        from power_consumption_gui import PowerConsumptionGUI
+    except ImportError:
+        return None
+    import queue
+    return lambda *args: PowerConsumptionGUI.analysis_job(Job('benchmark', queue.Queue()), *args)
+
+
+def run_scenario(consumption_files: list[str], price_file: str, repeat: int = 3,
+                 cache_dir: str | None = None) -> dict:
+    """
+    Time all stages on one generated dataset.
+
+    Parameters
+    ----------
+    consumption_files : list of str
+        Consumption exports; the single-meter stages use the first one.
+    price_file : str
+        Price export.
+    repeat : int, optional
+        Timed runs per stage. Default: 3.
+    cache_dir : str, optional
+        Directory for the parse cache of load_consumption_cached. Default: no cached load stage.
+
+    Returns
+    -------
+    dict
+        Timings per stage name.
+    """
+    stages = {}
+    stages['load_consumption'] = time_stage(
+        lambda: [load_consumption(path, cache_dir=None) for path in consumption_files], repeat=repeat)
+    stages['load_prices'] = time_stage(lambda: load_prices(price_file, cache_dir=None), repeat=repeat)
+    if cache_dir is not None:
+        load_consumption(consumption_files[0], cache_dir=cache_dir)
+        stages['load_consumption_cached'] = time_stage(
+            lambda: load_consumption(consumption_files[0], cache_dir=cache_dir), repeat=repeat)
+
+    df_consumption = load_consumption(consumption_files[0], cache_dir=None)
+    df_price = load_prices(price_file, cache_dir=None)
+    calculator = PowerCostCalculator(df_consumption, df_price)
+
+    def fresh_merge():
+        clear_merge_cache()
+        calculator.invalidate()
+
+    def fresh_results():
+        # Re-assigning the tariff keeps the merge but drops all computed results
+        calculator.tariff = calculator.tariff
+
+    stages['merge'] = time_stage(lambda _: calculator.merge_data(), fresh_merge, repeat)
+    stages['calculate_costs'] = time_stage(lambda _: calculator.calculate_costs(), fresh_results, repeat)
+    stages['monthly_total'] = time_stage(lambda _: calculator.monthly_total(), fresh_results, repeat)
+    stages['monthly_total_cached'] = time_stage(calculator.monthly_total, repeat=repeat)
+    stages['rollup'] = time_stage(lambda _: calculator.rollup(), fresh_results, repeat)
+
+    # Last 30 days as the selected range, like a typical GUI selection
+    end_date = df_consumption['timestamp'].max().date()
+    start_date = end_date - datetime.timedelta(days=29)
+    stages['profile_cube'] = time_stage(lambda: ProfileCube(df_consumption), repeat=repeat)
+    profile_cube = ProfileCube(df_consumption)
+    stages['profile_compare'] = time_stage(lambda: profile_cube.compare(start_date, end_date), repeat=repeat)
+    stages['pyramid'] = time_stage(
+        lambda: (SeriesPyramid(df_consumption, CONSUMPTION_COL), SeriesPyramid(df_price, PRICE_COL)), repeat=repeat)
+
+    # GUI charts
+    profile = profile_cube.compare(start_date, end_date)
+    monthly = calculator.rollup().frame('month')
+    pyramids = (SeriesPyramid(df_consumption, CONSUMPTION_COL), SeriesPyramid(df_price, PRICE_COL))
+
+    def plot_profile(chart):
+        chart.update(SLOT_LABELS, *profile)
+        _draw(chart.figure)
+
+    def plot_monthly(chart):
+        chart.update(monthly)
+        _draw(chart.figure)
+
+    def plot_timeseries(chart):
+        chart.set_data(*pyramids)
+        _draw(chart.figure)
+
+    def timeseries_at_full_range():
+        chart = _timeseries_chart()
+        plot_timeseries(chart)
+        return chart
+
+    def pan_timeseries(chart):
+        chart.show_range(pd.Timestamp(start_date), pd.Timestamp(end_date) + pd.Timedelta(days=1))
+        _draw(chart.figure)
+
+    def plot_monthly_costs(_):
+        calculator.plot_monthly_costs()
+        _draw(plt.gcf())
+        plt.close('all')
+
+    stages['plot_profile'] = time_stage(plot_profile, _profile_chart, repeat)
+    stages['plot_monthly'] = time_stage(plot_monthly, _monthly_chart, repeat)
+    stages['plot_timeseries'] = time_stage(plot_timeseries, _timeseries_chart, repeat)
+    stages['pan_timeseries'] = time_stage(pan_timeseries, timeseries_at_full_range, repeat)
+    stages['plot_monthly_costs'] = time_stage(plot_monthly_costs, calculator.rollup, repeat)
+
+    analysis_job = _analysis_job()
+    if analysis_job is not None:
+        time_index = TimeIndex(df_consumption['timestamp'])
+        tariffs = [calculator.tariff, provider_tariff(fixed_fee=0.0, variable_fee_per_kwh=0.03)]
+        stages['analysis_job'] = time_stage(
+            lambda _: analysis_job(time_index, calculator, profile_cube, start_date, end_date, tariffs),
+            fresh_results, repeat)
+
+    if len(consumption_files) > 1:
+        frames = [load_consumption(path, cache_dir=None) for path in consumption_files]
+
+        def portfolio():
+            calculator = PortfolioCalculator(df_price)
+            for path, frame in zip(consumption_files, frames):
+                calculator.add_meter(os.path.basename(path), frame)
+            return calculator.compute()
+
+        stages['portfolio'] = time_stage(portfolio, repeat=repeat)
+    return stages
+
+
+def environment() -> dict:
+    """Interpreter, library versions and machine of the run."""
+    return {
+        'created': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'matplotlib': matplotlib.__version__,
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Return the command line parser."""
+    parser = argparse.ArgumentParser(
+        prog='power-benchmark',
+        description='Time loading, merging, cost calculation and plotting on synthetic data of '
+                    'configurable size and write the timings as JSON.')
+    parser.add_argument('--years', type=int, nargs='+', default=[1],
+                        help=f'Years of data per scenario, 1-{MAX_YEARS} (default: 1)')
+    parser.add_argument('--meters', type=int, nargs='+', default=[1],
+                        help=f'Number of meters per scenario, 1-{MAX_METERS} (default: 1)')
+    parser.add_argument('--price-resolution', nargs='+', choices=tuple(PRICE_RESOLUTIONS), default=['15min'],
+                        help='Price interval length(s) (default: 15min)')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed runs per stage (default: 3)')
+    parser.add_argument('--start', default='2020-01-01', help='First day of the generated data (default: 2020-01-01)')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed of the generated data (default: 0)')
+    parser.add_argument('--data-dir',
+                        help='Keep the generated files in this directory (default: temporary, deleted afterwards)')
+    parser.add_argument('--output', '-o', default='benchmark_results.json',
+                        help='JSON file for the results (default: benchmark_results.json)')
+    return parser
+
+
+def main(argv=None) -> int:
+    """Run the benchmark command line; returns the process exit code."""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if any(not 1 <= years <= MAX_YEARS for years in args.years):
+        parser.error(f'--years must be between 1 and {MAX_YEARS}')
+    if any(not 1 <= meters <= MAX_METERS for meters in args.meters):
+        parser.error(f'--meters must be between 1 and {MAX_METERS}')
+    if args.repeat < 1:
+        parser.error('--repeat must be at least 1')
+
+    data_dir = args.data_dir or tempfile.mkdtemp(prefix='power_benchmark_')
+    results = {'environment': environment(), 'repeat': args.repeat, 'scenarios': []}
+    try:
+        for years in args.years:
+            for meters in args.meters:
+                for resolution in args.price_resolution:
+                    name = f'{years}y_{meters}m_{resolution}'
+                    directory = os.path.join(data_dir, name)
+                    print(f'{name}: generating data...', flush=True)
+                    start = time.perf_counter()
+                    consumption_files, price_file = write_dataset(
+                        directory, args.start, years, meters, resolution, args.seed)
+                    generated = time.perf_counter() - start
+
+                    print(f'{name}: timing stages...', flush=True)
+                    stages = run_scenario(consumption_files, price_file, args.repeat,
+                                          cache_dir=os.path.join(directory, '.power_cache'))
+                    results['scenarios'].append({
+                        'name': name,
+                        'years': years,
+                        'meters': meters,
+                        'price_resolution': resolution,
+                        'consumption_bytes': sum(os.path.getsize(path) for path in consumption_files),
+                        'price_bytes': os.path.getsize(price_file),
+                        'generate_seconds': generated,
+                        'stages': stages,
+                    })
+                    for stage, timing in stages.items():
+                        print(f'  {stage:<24} {timing["median"] * 1000:10.1f} ms')
+    finally:
+        if args.data_dir is None:
+            shutil.rmtree(data_dir, ignore_errors=True)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f'Results written to {args.output}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,455 @@
+"""
+Chart rendering module for the GUI.
+
+Creates the matplotlib artists of each chart once and updates them in place on later calls
+(bar heights, line data, annotation text) instead of clearing the axes and rebuilding
+everything. The consumption profile chart is redrawn by blitting its animated bars and line onto
+a cached background; the monthly chart is skipped entirely when its data did not change. The
+interval time series only ever plots the downsampled buckets of the visible range.
+"""
+
+import hashlib
+
+import matplotlib.dates as mdates
+import numpy as np
+import pandas as pd
+
+from downsampling import LEVELS
+
+# Profile y-axis: headroom above the highest value, and the fraction of the current limit below
+# which the axis is shrunk again (in between, updates are blitted without rescaling)
+PROFILE_HEADROOM = 1.1
+PROFILE_SHRINK = 0.5
+
+
+class ProfileChart:
+    """
+    Consumption profile comparison: bars for the selected period, a line for the overall profile.
+
+    Parameters
+    ----------
+    figure : matplotlib.figure.Figure
+        Figure holding the chart.
+    ax : matplotlib.axes.Axes
+        Axes to draw on.
+    canvas : FigureCanvasBase
+        Canvas of the figure (must support copy_from_bbox/restore_region for blitting).
+    """
+
+    def __init__(self, figure, ax, canvas):
+        """
+        Initialize a ProfileChart.
+
+        See class docstring for parameter details.
+        """
+        self.figure = figure
+        self.ax = ax
+        self.canvas = canvas
+        self.bars = None
+        self.line = None
+        self._background = None
+        self.canvas.mpl_connect('draw_event', self._on_draw)
+
+    def _artists(self):
+        """Animated artists, drawn on top of the cached background."""
+        return [*self.bars.patches, self.line]
+
+    def _on_draw(self, event):
+        """Cache the static background after every full draw and paint the animated artists."""
+        if self.bars is None:
+            return
+        self._background = self.canvas.copy_from_bbox(self.figure.bbox)
+        for artist in self._artists():
+            self.ax.draw_artist(artist)
+
+    def update(self, labels, profile_selected, profile_full_normalized):
+        """
+        Show new profile values.
+
+        The first call (or a change in the number of slots) builds the chart; later calls only
+        set bar heights and line data and blit them, unless the y-axis needs rescaling.
+
+        Parameters
+        ----------
+        labels : array-like of str
+            Time-of-day label of each slot.
+        profile_selected : np.ndarray
+            Consumption per slot of the selected period in kWh.
+        profile_full_normalized : np.ndarray
+            Overall profile scaled to the selected period's total.
+        """
+        if self.bars is None or len(self.bars.patches) != len(profile_selected):
+            self._create(labels, profile_selected, profile_full_normalized)
+            return
+
+        for bar, height in zip(self.bars.patches, profile_selected):
+            bar.set_height(height)
+        self.line.set_ydata(profile_full_normalized)
+
+        top = self._top(profile_selected, profile_full_normalized)
+        current = self.ax.get_ylim()[1]
+        if self._background is None or top > current or top < current * PROFILE_SHRINK:
+            # Tick labels change: full redraw, which also refreshes the background
+            self.ax.set_ylim(0, top)
+            self.canvas.draw()
+            return
+
+        self.canvas.restore_region(self._background)
+        for artist in self._artists():
+            self.ax.draw_artist(artist)
+        self.canvas.blit(self.figure.bbox)
+
+    @staticmethod
+    def _top(profile_selected, profile_full_normalized) -> float:
+        """Upper y-limit leaving headroom above both series."""
+        top = max(np.max(profile_selected, initial=0), np.max(profile_full_normalized, initial=0))
+        return top * PROFILE_HEADROOM if top > 0 else 1.0
+
+    def _create(self, labels, profile_selected, profile_full_normalized):
+        """Build all artists of the chart and draw it."""
+        self.ax.clear()
+        x_pos = np.arange(len(profile_selected))
+        self.bars = self.ax.bar(
+            x_pos,
+            profile_selected,
+            color='skyblue',
+            edgecolor='black',
+            alpha=0.7,
+            label='Selected Period',
+            animated=True
+        )
+        self.line, = self.ax.plot(
+            x_pos,
+            profile_full_normalized,
+            color='red',
+            linestyle='--',
+            linewidth=2,
+            marker='o',
+            markersize=3,
+            alpha=0.7,
+            label='Overall (normalized)',
+            animated=True
+        )
+
+        self.ax.set_xlabel(
+            'Time of Day (HH:MM)', fontsize=11, fontweight='bold')
+        self.ax.set_ylabel(
+            'Consumption (kWh)', fontsize=11, fontweight='bold')
+        self.ax.set_title(
+            'Daily Consumption Profile Comparison',
+            fontsize=13,
+            fontweight='bold',
+            pad=15
+        )
+
+        # Set x-ticks (show every 8th label to avoid crowding)
+        self.ax.set_xticks(x_pos[::8])
+        self.ax.set_xticklabels(np.asarray(labels)[::8], rotation=45, ha='right')
+        self.ax.set_ylim(0, self._top(profile_selected, profile_full_normalized))
+
+        # Legend entries copy the animated flag from their artists; they belong to the background
+        legend = self.ax.legend(loc='upper left', fontsize=10)
+        for handle in legend.legend_handles:
+            handle.set_animated(False)
+        self.ax.grid(axis='y', linestyle='--', alpha=0.3)
+
+        self.figure.tight_layout()
+        self.canvas.draw()
+
+
+class MonthlyChart:
+    """
+    Monthly cost breakdown (stacked bars) with consumption on a secondary axis.
+
+    Parameters
+    ----------
+    figure : matplotlib.figure.Figure
+        Figure holding the chart.
+    ax_costs : matplotlib.axes.Axes
+        Axes for the cost bars.
+    ax_consumption : matplotlib.axes.Axes
+        Twin axes for the consumption line.
+    canvas : FigureCanvasBase
+        Canvas of the figure.
+    """
+
+    def __init__(self, figure, ax_costs, ax_consumption, canvas):
+        """
+        Initialize a MonthlyChart.
+
+        See class docstring for parameter details.
+        """
+        self.figure = figure
+        self.ax_costs = ax_costs
+        self.ax_consumption = ax_consumption
+        self.canvas = canvas
+        self.months = None
+        self.fingerprint = None
+
+    @staticmethod
+    def data_fingerprint(monthly: pd.DataFrame) -> str:
+        """Fingerprint of the monthly values and months that the chart shows."""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update('|'.join(monthly.index.astype(str)).encode())
+        digest.update(np.ascontiguousarray(monthly.to_numpy(dtype='float64')).tobytes())
+        return digest.hexdigest()
+
+    def update(self, monthly: pd.DataFrame) -> bool:
+        """
+        Show new monthly values, skipping all work if they did not change.
+
+        Parameters
+        ----------
+        monthly : pd.DataFrame
+            Monthly frame as returned by CostResult.monthly_frame().
+
+        Returns
+        -------
+        bool
+            True if the chart was redrawn.
+        """
+        fingerprint = self.data_fingerprint(monthly)
+        if fingerprint == self.fingerprint:
+            return False
+
+        months = list(monthly.index.astype(str))
+        rebuild = months != self.months
+        if rebuild:
+            self._create(months)
+        self._set_data(monthly)
+        if rebuild:
+            self.figure.tight_layout()
+        self.fingerprint = fingerprint
+        self.canvas.draw_idle()
+        return True
+
+    def _create(self, months):
+        """Build the artists for the given months with zero values."""
+        self.ax_costs.clear()
+        self.ax_consumption.clear()
+        self.months = months
+        x_pos = np.arange(len(months))
+        zeros = np.zeros(len(months))
+        width = 0.6
+
+        # Stacked bar chart for COSTS (left axis)
+        self.bars_market = self.ax_costs.bar(
+            x_pos, zeros, width,
+            label='Market Cost', color='#3498db'
+        )
+        self.bars_variable = self.ax_costs.bar(
+            x_pos, zeros, width,
+            label='Variable Fee', color='#e67e22'
+        )
+        self.bars_fixed = self.ax_costs.bar(
+            x_pos, zeros, width,
+            label='Fixed Fee', color='#2ecc71'
+        )
+
+        self.ax_costs.set_xlabel('Month', fontsize=11, fontweight='bold')
+        self.ax_costs.set_ylabel(
+            'Cost (EUR)', fontsize=11, fontweight='bold', color='#3498db')
+        self.ax_costs.set_title(
+            'Monthly Cost Breakdown & Consumption (All Available Data)',
+            fontsize=13,
+            fontweight='bold',
+            pad=15
+        )
+        self.ax_costs.set_xticks(x_pos)
+        self.ax_costs.set_xticklabels(months, rotation=45, ha='right')
+        self.ax_costs.tick_params(axis='y', labelcolor='#3498db')
+        self.ax_costs.grid(axis='y', linestyle='--', alpha=0.3)
+
+        # Total cost labels on top of bars
+        self.cost_labels = [
+            self.ax_costs.text(
+                i, 0, '',
+                ha='center', va='bottom',
+                fontsize=8, fontweight='bold',
+                color='#2c3e50'
+            )
+            for i in x_pos
+        ]
+
+        # CONSUMPTION line (right axis)
+        self.consumption_line, = self.ax_consumption.plot(
+            x_pos,
+            zeros,
+            color='#e74c3c',
+            linestyle='-',
+            linewidth=3,
+            marker='o',
+            markersize=8,
+            label='Consumption',
+            zorder=10
+        )
+        self.ax_consumption.set_ylabel(
+            'Consumption (kWh)', fontsize=11, fontweight='bold', color='#e74c3c')
+        self.ax_consumption.yaxis.set_label_position("right")
+        self.ax_consumption.tick_params(axis='y', labelcolor='#e74c3c')
+
+        # Consumption value labels
+        self.consumption_labels = [
+            self.ax_consumption.text(
+                i, 0, '',
+                ha='center', va='bottom',
+                fontsize=8, fontweight='bold',
+                color='#e74c3c'
+            )
+            for i in x_pos
+        ]
+
+        # Combined legend
+        lines1, labels1 = self.ax_costs.get_legend_handles_labels()
+        lines2, labels2 = self.ax_consumption.get_legend_handles_labels()
+        self.ax_costs.legend(lines1 + lines2, labels1 +
+                             labels2, loc='upper left', fontsize=10)
+
+    def _set_data(self, monthly: pd.DataFrame):
+        """Update bar heights, line data, labels and axis limits in place."""
+        market = monthly['market_cost'].to_numpy()
+        variable = monthly['variable_fee'].to_numpy()
+        fixed = monthly['fixed_fee'].to_numpy()
+        total = monthly['total_cost'].to_numpy()
+        consumption = monthly['consumption'].to_numpy()
+        avg_price = monthly['avg_price'].to_numpy() * 100  # to cents/kWh
+
+        for bars, heights, bottoms in ((self.bars_market, market, np.zeros(len(market))),
+                                       (self.bars_variable, variable, market),
+                                       (self.bars_fixed, fixed, market + variable)):
+            for bar, height, bottom in zip(bars.patches, heights, bottoms):
+                bar.set_y(bottom)
+                bar.set_height(height)
+
+        max_total = np.max(total, initial=0)
+        for i, label in enumerate(self.cost_labels):
+            label.set_position((i, total[i] + max_total * 0.02))
+            label.set_text(f'{total[i]:.2f} EUR\n({avg_price[i]:.2f} c/kWh)')
+        self.ax_costs.set_ylim(0, max_total * 1.25 if max_total > 0 else 1)
+
+        max_consumption = np.max(consumption, initial=0)
+        self.consumption_line.set_ydata(consumption)
+        for i, label in enumerate(self.consumption_labels):
+            label.set_position((i, consumption[i] + max_consumption * 0.02))
+            label.set_text(f'{consumption[i]:.1f} kWh')
+        self.ax_consumption.set_ylim(0, max(500, max_consumption))
+
+
+class TimeSeriesChart:
+    """
+    Interval consumption and market price over time, downsampled to the plot width.
+
+    Both curves come from SeriesPyramid views: whenever the visible x-range changes (date
+    selection, toolbar zoom or pan), the level matching the axes' pixel width is sliced and the
+    mean line and min/max envelope are updated in place.
+
+    Parameters
+    ----------
+    figure : matplotlib.figure.Figure
+        Figure holding the chart.
+    ax_consumption : matplotlib.axes.Axes
+        Axes for the consumption curve.
+    ax_price : matplotlib.axes.Axes
+        Axes for the price curve, sharing the x-axis with ax_consumption.
+    canvas : FigureCanvasBase
+        Canvas of the figure.
+    """
+
+    def __init__(self, figure, ax_consumption, ax_price, canvas):
+        """
+        Initialize a TimeSeriesChart.
+
+        See class docstring for parameter details.
+        """
+        self.figure = figure
+        self.ax_consumption = ax_consumption
+        self.ax_price = ax_price
+        self.canvas = canvas
+        self.series = []
+        self.level = None
+        self._xlim = None
+        self.canvas.mpl_connect('resize_event', self._on_resize)
+
+    def set_data(self, consumption_pyramid, price_pyramid):
+        """
+        Show new data and zoom out to its full range.
+
+        Parameters
+        ----------
+        consumption_pyramid : SeriesPyramid
+            Consumption per interval in kWh.
+        price_pyramid : SeriesPyramid
+            Market price per interval in EUR/MWh.
+        """
+        self.ax_consumption.clear()
+        self.ax_price.clear()
+        self.series = []
+        for ax, pyramid, color, label in ((self.ax_consumption, consumption_pyramid, '#e74c3c', 'Consumption (kWh)'),
+                                          (self.ax_price, price_pyramid, '#3498db', 'Price (EUR/MWh)')):
+            envelope = ax.fill_between([], [], [], color=color, alpha=0.25, linewidth=0, label='Min/Max')
+            line, = ax.plot([], [], color=color, linewidth=1, label='Mean')
+            ax.set_ylabel(label, fontsize=11, fontweight='bold', color=color)
+            ax.grid(linestyle='--', alpha=0.3)
+            self.series.append((ax, pyramid, line, envelope))
+        self.ax_consumption.legend(loc='upper left', fontsize=9)
+        self.title = self.ax_consumption.set_title(
+            'Interval Time Series',
+            fontsize=13,
+            fontweight='bold',
+            pad=15
+        )
+        locator = mdates.AutoDateLocator()
+        self.ax_price.xaxis.set_major_locator(locator)
+        self.ax_price.xaxis.set_major_formatter(mdates.ConciseDateFormatter(locator))
+        self.ax_consumption.tick_params(labelbottom=False)
+        self.figure.tight_layout()
+
+        # clear() drops axes callbacks; shared x-axes notify every member, one callback covers both
+        self._xlim = None
+        self.ax_consumption.callbacks.connect('xlim_changed', self._on_xlim_changed)
+
+        starts = [p.start for p in (consumption_pyramid, price_pyramid) if p.start is not None]
+        ends = [p.end for p in (consumption_pyramid, price_pyramid) if p.end is not None]
+        if starts:
+            self.show_range(min(starts), max(ends))
+        else:
+            self.canvas.draw_idle()
+
+    def show_range(self, start, end):
+        """Zoom to the naive local window [start, end]."""
+        if not self.series:
+            return
+        start, end = pd.Timestamp(start), pd.Timestamp(end)
+        if end <= start:
+            end = start + pd.Timedelta(days=1)
+        self.ax_consumption.set_xlim(start, end)
+
+    def _on_xlim_changed(self, ax):
+        """Re-slice the pyramids for the new x-range."""
+        xlim = tuple(ax.get_xlim())
+        if not self.series or xlim == self._xlim:
+            return
+        self._xlim = xlim
+        self.refresh()
+        self.canvas.draw_idle()
+
+    def _on_resize(self, event):
+        """Match the new pixel width."""
+        if self.series:
+            self.refresh()
+
+    def refresh(self):
+        """Update both curves to the current x-range and pixel width."""
+        left, right = (pd.Timestamp(mdates.num2date(x).replace(tzinfo=None)) for x in self.ax_consumption.get_xlim())
+        max_points = max(int(self.ax_consumption.bbox.width), 1)
+        for ax, pyramid, line, envelope in self.series:
+            view = pyramid.view(left, right, max_points)
+            line.set_data(view.start, view.mean)
+            envelope.set_data(view.start, view.minimum, view.maximum)
+            envelope.set_visible(view.level != LEVELS[0])
+            low, high = np.nanmin(view.minimum, initial=np.inf), np.nanmax(view.maximum, initial=-np.inf)
+            if np.isfinite(low) and np.isfinite(high):
+                margin = (high - low) * 0.05 or 1.0
+                ax.set_ylim(low - margin, high + margin)
+            self.level = view.level
+        self.title.set_text(f'Interval Time Series ({self.level} resolution)')
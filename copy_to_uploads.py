@@ -1,6 +1,8 @@
 import shutil
 import os
 
+from ingestion import consumption_store, price_store, ingest_consumption, ingest_prices
+
 UPLOAD_DIR = "uploads"
 CONSUMPTION_TARGET = os.path.join(UPLOAD_DIR, "last_consumption.xlsx")
 PRICE_TARGET = os.path.join(UPLOAD_DIR, "last_prices.csv")
@@ -11,16 +13,28 @@ PRICE_SOURCE = r"C:\Users\krems\Downloads\EXAAD1P_2024-12-31T23_00_00Z_2025-12-3
 
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 
+
+def ingest_and_copy(source, target, store, ingest, label):
+    """Ingest new intervals of source into store and copy it only if it brought new data."""
+    if not os.path.exists(source):
+        print(f"{label} file not found: {source}")
+        return
+    result = ingest(store, source)
+    if result.skipped:
+        print(f"{label} file already ingested: {source}")
+    else:
+        print(f"{label}: {result.appended} new intervals, {result.revised} revised")
+    if result.changed or not os.path.exists(target):
+        shutil.copy2(source, target)
+        print(f"Copied {label.lower()} file to {target}")
+    else:
+        print(f"No new {label.lower()} data, kept {target}")
+
+
 # Copy consumption file
-if os.path.exists(CONSUMPTION_SOURCE):
-    shutil.copy2(CONSUMPTION_SOURCE, CONSUMPTION_TARGET)
-    print(f"Copied consumption file to {CONSUMPTION_TARGET}")
-else:
-    print(f"Consumption file not found: {CONSUMPTION_SOURCE}")
+ingest_and_copy(CONSUMPTION_SOURCE, CONSUMPTION_TARGET,
+                consumption_store(CONSUMPTION_SOURCE), ingest_consumption, "Consumption")
 
 # Copy price file
-if os.path.exists(PRICE_SOURCE):
-    shutil.copy2(PRICE_SOURCE, PRICE_TARGET)
-    print(f"Copied price file to {PRICE_TARGET}")
-else:
-    print(f"Price file not found: {PRICE_SOURCE}")
+ingest_and_copy(PRICE_SOURCE, PRICE_TARGET,
+                price_store(PRICE_SOURCE), ingest_prices, "Price")
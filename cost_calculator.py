@@ -9,9 +9,166 @@ Data sources:
 - Consumption: https://mein.oekostrom.at/a-p/
 """
 
+import hashlib
+from dataclasses import dataclass
+
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 
+from instrumentation import span, traced
+from merge_engine import MergeStats, merge_prices, to_epoch_ns, wall_time
+from price_bands import DEFAULT_SHARE, PriceBandSummary, daily_price_bands, summarize_bands
+from rollup import RollupCube, WindowTotals
+from tariff import PROVIDER_ENERGY, PROVIDER_FIXED, CompiledTariff, Tariff, calendar_fields, provider_tariff
+from time_index import TimeIndex
+
+# Merged frames of recent calculators, keyed by input fingerprint
+MERGE_CACHE_SIZE = 4
+_MERGE_CACHE: dict[str, tuple[pd.DataFrame, MergeStats]] = {}
+
+# Cached results per calculator (one per fee setting and date window)
+RESULT_CACHE_SIZE = 64
+
+# Time-of-use tariffs compared per block, bounding the temporary (tariffs x intervals) rate matrix
+TARIFF_BLOCK = 32
+
+
+def clear_merge_cache():
+    """Forget all memoized merges, e.g. after input files were reloaded."""
+    _MERGE_CACHE.clear()
+
+
+@dataclass
+class CostResult:
+    """
+    Per-interval and per-month cost components of one calculation.
+
+    Per-interval arrays are rows of one contiguous float64 buffer aligned with the merged data;
+    monthly arrays hold one entry per month in `months`.
+
+    Attributes
+    ----------
+    consumption : np.ndarray
+        Consumption per interval in kWh.
+    market_cost : np.ndarray
+        Market cost per interval in EUR.
+    variable_fee : np.ndarray
+        Energy charges of the tariff (provider fee, grid fees, levies) per interval in EUR.
+    total_cost : np.ndarray
+        Market cost plus variable fee per interval in EUR.
+    months : pd.PeriodIndex
+        Months covered by the data, in order.
+    month_starts : np.ndarray
+        Index of the first interval of each month.
+    monthly_consumption, monthly_market, monthly_variable, monthly_fixed, monthly_total : np.ndarray
+        Monthly sums in kWh and EUR; monthly_total includes the fixed fee.
+    """
+
+    consumption: np.ndarray
+    market_cost: np.ndarray
+    variable_fee: np.ndarray
+    total_cost: np.ndarray
+    months: pd.PeriodIndex
+    month_starts: np.ndarray
+    monthly_consumption: np.ndarray
+    monthly_market: np.ndarray
+    monthly_variable: np.ndarray
+    monthly_fixed: np.ndarray
+    monthly_total: np.ndarray
+
+    def monthly_frame(self) -> pd.DataFrame:
+        """
+        Return the monthly sums as a DataFrame indexed by month.
+
+        Returns
+        -------
+        pd.DataFrame
+            Columns consumption, market_cost, variable_fee, fixed_fee, total_cost and
+            avg_price (EUR/kWh).
+        """
+        with np.errstate(divide='ignore', invalid='ignore'):
+            avg_price = self.monthly_total / self.monthly_consumption
+        return pd.DataFrame({
+            'consumption': self.monthly_consumption,
+            'market_cost': self.monthly_market,
+            'variable_fee': self.monthly_variable,
+            'fixed_fee': self.monthly_fixed,
+            'total_cost': self.monthly_total,
+            'avg_price': avg_price,
+        }, index=self.months)
+
+
+@dataclass
+class TariffComparison:
+    """
+    Monthly costs of several tariffs over the same intervals.
+
+    Monthly arrays have shape (tariffs, months).
+
+    Attributes
+    ----------
+    tariffs : list of str
+        Tariff names, in row order.
+    months : pd.PeriodIndex
+        Months covered by the window, in order.
+    monthly_consumption : np.ndarray
+        Consumption per month in kWh (same for all tariffs).
+    monthly_market, monthly_variable, monthly_fixed, monthly_total : np.ndarray
+        Market cost, energy charges, monthly charges and their sum per tariff and month in EUR.
+    """
+
+    tariffs: list[str]
+    months: pd.PeriodIndex
+    monthly_consumption: np.ndarray
+    monthly_market: np.ndarray
+    monthly_variable: np.ndarray
+    monthly_fixed: np.ndarray
+    monthly_total: np.ndarray
+
+    @property
+    def cheapest_by_month(self) -> list[str]:
+        """Name of the cheapest tariff in each month."""
+        return [self.tariffs[i] for i in np.argmin(self.monthly_total, axis=0)]
+
+    @property
+    def cheapest(self) -> str:
+        """Name of the tariff with the lowest total over all months."""
+        return self.tariffs[int(np.argmin(self.monthly_total.sum(axis=1)))]
+
+    def monthly_frame(self) -> pd.DataFrame:
+        """
+        Return the monthly total cost per tariff as a DataFrame indexed by month.
+
+        Returns
+        -------
+        pd.DataFrame
+            One column per tariff (EUR) plus 'cheapest' with the name of the cheapest tariff.
+        """
+        frame = pd.DataFrame(self.monthly_total.T, index=self.months, columns=self.tariffs)
+        frame['cheapest'] = self.cheapest_by_month
+        return frame
+
+    def totals(self) -> pd.DataFrame:
+        """
+        Return totals per tariff over all months.
+
+        Returns
+        -------
+        pd.DataFrame
+            Columns market_cost, variable_fee, fixed_fee, total_cost and avg_price (EUR/kWh),
+            indexed by tariff, cheapest first.
+        """
+        frame = pd.DataFrame({
+            'market_cost': self.monthly_market.sum(axis=1),
+            'variable_fee': self.monthly_variable.sum(axis=1),
+            'fixed_fee': self.monthly_fixed.sum(axis=1),
+            'total_cost': self.monthly_total.sum(axis=1),
+        }, index=pd.Index(self.tariffs, name='tariff'))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            frame['avg_price'] = frame['total_cost'] / self.monthly_consumption.sum()
+        return frame.sort_values('total_cost', kind='stable')
+
 
 class PowerCostCalculator:
     """
@@ -35,6 +192,14 @@ class PowerCostCalculator:
         Monthly fixed provider fee in EUR. Default: 2.16.
     variable_fee_per_kwh : float, optional
         Variable fee per kWh from provider in EUR. Default: 0.018.
+    fill : {'forward', 'backward', None}, optional
+        How consumption intervals without a covering price get one: last earlier price, next
+        later price, or dropped. Default: 'forward'.
+    fill_limit : pd.Timedelta, optional
+        Maximum distance to a fill price. Default: unlimited.
+    tariff : Tariff, optional
+        Full tariff (grid fees, time-of-use windows, VAT). Default: provider_tariff() with
+        fixed_fee and variable_fee_per_kwh; when given, those two arguments are ignored.
     """
 
     def __init__(
@@ -46,60 +211,414 @@ class PowerCostCalculator:
         timestamp_col: str = 'timestamp',
         fixed_fee: float = 2.16,
         variable_fee_per_kwh: float = 0.018,
+        fill: str | None = 'forward',
+        fill_limit: pd.Timedelta | None = None,
+        tariff: Tariff | None = None,
     ):
         """
         Initialize a PowerCostCalculator.
 
-        See class docstring for parameter details.
+        See class docstring for parameter details. The input frames are used as given and are
+        never modified, so already-parsed data can be passed without copying.
         """
-        self.consumption_df = consumption_df.copy()
-        self.price_df = price_df.copy()
+        self.consumption_df = consumption_df
+        self.price_df = price_df
         self.price_col = price_col
         self.consumption_col = consumption_col
         self.timestamp_col = timestamp_col
-        self.fixed_fee = fixed_fee
-        self.variable_fee_per_kwh = variable_fee_per_kwh
+        self._tariff = tariff if tariff is not None else provider_tariff(fixed_fee, variable_fee_per_kwh)
+        self._compiled: CompiledTariff | None = None
+        self.fill = fill
+        self.fill_limit = fill_limit
         self.merged_df: pd.DataFrame = pd.DataFrame()
+        self.merge_stats: MergeStats | None = None
+        self.time_index = TimeIndex(pd.DatetimeIndex([]))
+        self._wall = np.empty(0, dtype='datetime64[ns]')
+        self._month_keys = np.empty(0, dtype='datetime64[M]')
+        self._results: dict[tuple[int, int], CostResult] = {}
+        self._prefix: np.ndarray | None = None
+        self._rollup: RollupCube | None = None
+        self._month_index = np.empty(0, dtype='int64')
+
+    @property
+    def tariff(self) -> Tariff:
+        """Tariff the costs are computed with. Setting it keeps the merged data."""
+        return self._tariff
+
+    @tariff.setter
+    def tariff(self, value: Tariff):
+        self._tariff = value
+        self._compiled = None
+        self._results.clear()
+        self._prefix = None
+        self._rollup = None
+
+    @property
+    def fixed_fee(self) -> float:
+        """Monthly fixed provider fee in EUR. Setting it keeps the merged data."""
+        return self._tariff.monthly_amount(PROVIDER_FIXED)
+
+    @fixed_fee.setter
+    def fixed_fee(self, value: float):
+        self.tariff = self._tariff.with_monthly_charge(PROVIDER_FIXED, value)
+
+    @property
+    def variable_fee_per_kwh(self) -> float:
+        """Variable provider fee in EUR/kWh. Setting it keeps the merged data."""
+        return self._tariff.energy_rate(PROVIDER_ENERGY)
+
+    @variable_fee_per_kwh.setter
+    def variable_fee_per_kwh(self, value: float):
+        self.tariff = self._tariff.with_energy_charge(PROVIDER_ENERGY, value)
+
+    def compiled_tariff(self) -> CompiledTariff:
+        """Return the tariff's rates for the merged intervals, compiled once per merge and tariff."""
+        if self.merged_df.empty:
+            self.merge_data()
+        if self._compiled is None:
+            with span('tariff.compile'):
+                self._compiled = self._tariff.compile(self._wall)
+        return self._compiled
+
+    def fingerprint(self) -> str:
+        """
+        Fingerprint the merge inputs.
+
+        Hashes the timestamp, consumption and price columns together with the column names and
+        fill settings, so calculators built from equal data share one merge.
+
+        Returns
+        -------
+        str
+            Hex digest identifying the merge inputs.
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(f'{self.timestamp_col}|{self.consumption_col}|{self.price_col}|'
+                      f'{self.fill}|{self.fill_limit}'.encode())
+        for df, col in ((self.consumption_df, self.timestamp_col),
+                        (self.consumption_df, self.consumption_col),
+                        (self.price_df, self.timestamp_col),
+                        (self.price_df, self.price_col)):
+            if pd.api.types.is_datetime64_any_dtype(df[col]):
+                values = to_epoch_ns(df[col])
+            else:
+                values = df[col].to_numpy()
+            if values.dtype.kind == 'O':
+                values = values.astype(str)
+            digest.update(str(values.dtype).encode())
+            digest.update(np.ascontiguousarray(values).view('uint8').data)
+        return digest.hexdigest()
+
+    def invalidate(self):
+        """
+        Drop the merged data and all cached results.
+
+        Call after modifying consumption_df or price_df in place; the next calculation re-merges.
+        """
+        self.merged_df = pd.DataFrame()
+        self._compiled = None
+        self._results.clear()
+        self._prefix = None
+        self._rollup = None
 
+    @traced('calculator.merge_data')
     def merge_data(self):
         """
         Merge consumption and price on timestamp.
 
-        Ensures timestamps are datetime and performs inner join on timestamp.
+        Aligns prices to the time-sorted consumption intervals with the sorted-index merge engine
+        (15-minute snapping, hourly price broadcasting, configurable fill) and records the match,
+        fill and drop counts in merge_stats. Merges are memoized by input fingerprint, so equal
+        inputs are only merged once per session.
 
         Returns
         -------
         None
         """
-        self.consumption_df[self.timestamp_col] = pd.to_datetime(
-            self.consumption_df[self.timestamp_col])
-        self.price_df[self.timestamp_col] = pd.to_datetime(
-            self.price_df[self.timestamp_col])
-        self.merged_df = pd.merge(
-            self.consumption_df,
-            self.price_df[[self.timestamp_col, self.price_col]],
-            on=self.timestamp_col,
-            how='inner'
+        with span('calculator.fingerprint'):
+            key = self.fingerprint()
+        entry = _MERGE_CACHE.pop(key, None)
+        if entry is None:
+            with span('merge_engine.merge_prices'):
+                entry = merge_prices(
+                    self.consumption_df,
+                    self.price_df,
+                    self.price_col,
+                    timestamp_col=self.timestamp_col,
+                    fill=self.fill,
+                    fill_limit=self.fill_limit,
+                )
+        # Most recently used entries last
+        _MERGE_CACHE[key] = entry
+        while len(_MERGE_CACHE) > MERGE_CACHE_SIZE:
+            del _MERGE_CACHE[next(iter(_MERGE_CACHE))]
+
+        merged, self.merge_stats = entry
+        self.merged_df = merged
+        # UTC instants for windowing, local wall-time months for grouping
+        self.time_index = TimeIndex(merged[self.timestamp_col])
+        self._wall = wall_time(merged[self.timestamp_col])
+        self._month_keys = self._wall.astype('datetime64[M]')
+        self._compiled = None
+        self._results.clear()
+        self._prefix = None
+        self._rollup = None
+
+    @traced('calculator.compute')
+    def compute(self, start=None, end=None) -> CostResult:
+        """
+        Compute all cost components in one vectorized pass over the merged data.
+
+        Per-interval costs are written into one preallocated (3 x n) float64 buffer and the monthly
+        sums come from a single np.add.reduceat over the month boundaries. The tariff enters as a
+        market factor, a per-interval energy rate and a monthly fee (see Tariff.compile). Results
+        are cached per window; changing the tariff or the window never re-merges.
+
+        Parameters
+        ----------
+        start : datetime-like, optional
+            Start of the window (inclusive). Default: first interval.
+        end : datetime-like, optional
+            End of the window (exclusive). Default: after the last interval.
+
+        Returns
+        -------
+        CostResult
+            Per-interval and monthly cost components.
+        """
+        compiled = self.compiled_tariff()
+        lo, hi = self.time_index.row_range(start, end)
+        result = self._results.get((lo, hi))
+        if result is not None:
+            return result
+        df = self.merged_df
+        n = hi - lo
+
+        consumption = np.ascontiguousarray(df[self.consumption_col].to_numpy(dtype='float64')[lo:hi])
+        price = df[self.price_col].to_numpy(dtype='float64')[lo:hi]
+
+        # Rows: market cost, variable fee, total cost
+        costs = np.empty((3, n), dtype='float64')
+        np.multiply(consumption, price, out=costs[0])
+        costs[0] *= compiled.market_factor / 1000
+        np.multiply(consumption, compiled.energy_rate[lo:hi], out=costs[1])
+        np.add(costs[0], costs[1], out=costs[2])
+
+        month_starts, months = self._month_bounds(lo, hi)
+        if n:
+            monthly = np.add.reduceat(np.vstack((consumption, costs)), month_starts, axis=1)
+        else:
+            monthly = np.empty((4, 0), dtype='float64')
+        monthly_fixed = np.full(len(month_starts), compiled.monthly_fee)
+
+        result = CostResult(
+            consumption=consumption,
+            market_cost=costs[0],
+            variable_fee=costs[1],
+            total_cost=costs[2],
+            months=months,
+            month_starts=month_starts,
+            monthly_consumption=monthly[0],
+            monthly_market=monthly[1],
+            monthly_variable=monthly[2],
+            monthly_fixed=monthly_fixed,
+            monthly_total=monthly[3] + monthly_fixed,
         )
+        if len(self._results) >= RESULT_CACHE_SIZE:
+            self._results.clear()
+        self._results[(lo, hi)] = result
+        return result
 
-    def calculate_costs(self) -> pd.DataFrame:
+    def _month_bounds(self, lo: int, hi: int) -> tuple[np.ndarray, pd.PeriodIndex]:
+        """Return the first row of each month within rows lo:hi (relative to lo) and the months."""
+        month_keys = self._month_keys[lo:hi]
+        if hi > lo:
+            month_starts = np.concatenate(([0], np.flatnonzero(month_keys[1:] != month_keys[:-1]) + 1))
+        else:
+            month_starts = np.empty(0, dtype='int64')
+        return month_starts, pd.PeriodIndex(month_keys[month_starts], freq='M')
+
+    @traced('calculator.compare_tariffs')
+    def compare_tariffs(self, tariffs: list[Tariff], start=None, end=None) -> TariffComparison:
         """
-        Calculate market, provider variable, and total costs for each row.
+        Compute monthly costs of many tariffs against the merged data in one pass.
+
+        Monthly consumption and spot market cost are summed once; each tariff then only scales
+        them by its market factor and monthly fee. Tariffs with time-of-use charges are compiled
+        into a (tariffs x intervals) rate matrix, in blocks, that is multiplied with the
+        consumption row and reduced per month. The calculator's own tariff and cached results
+        are not touched.
+
+        Parameters
+        ----------
+        tariffs : list of Tariff
+            Candidate tariffs.
+        start : datetime-like, optional
+            Start of the window (inclusive). Default: first interval.
+        end : datetime-like, optional
+            End of the window (exclusive). Default: after the last interval.
 
         Returns
         -------
-        pd.DataFrame
-            Merged dataframe with columns: market_cost, variable_fee, total_cost.
+        TariffComparison
+            Monthly cost components per tariff.
         """
         if self.merged_df.empty:
             self.merge_data()
+        lo, hi = self.time_index.row_range(start, end)
         df = self.merged_df
-        df['market_cost'] = df[self.consumption_col] * \
-            (df[self.price_col] / 1000)
-        df['variable_fee'] = df[self.consumption_col] * self.variable_fee_per_kwh
-        df['total_cost'] = df['market_cost'] + df['variable_fee']
-        return df
+        consumption = df[self.consumption_col].to_numpy(dtype='float64')[lo:hi]
+        price = df[self.price_col].to_numpy(dtype='float64')[lo:hi]
+        month_starts, months = self._month_bounds(lo, hi)
+
+        k, n_months = len(tariffs), len(month_starts)
+        monthly_variable = np.zeros((k, n_months))
+        if n_months:
+            monthly_consumption, monthly_spot = np.add.reduceat(
+                np.vstack((consumption, consumption * price / 1000)), month_starts, axis=1)
+        else:
+            monthly_consumption = monthly_spot = np.zeros(0)
+
+        # Scalar parts, and the constant energy rate of tariffs without time windows, from the
+        # first interval alone; those energy charges just scale the monthly consumption
+        wall = self._wall[lo:hi]
+        scalar = [t.compile(wall[:1]) for t in tariffs]
+        market_factor = np.array([c.market_factor for c in scalar])
+        monthly_fee = np.array([c.monthly_fee for c in scalar])
+        for i, tariff in enumerate(tariffs):
+            if not tariff.time_of_use and n_months:
+                monthly_variable[i] = scalar[i].energy_rate[0] * monthly_consumption
+
+        # Time-of-use tariffs: rate matrix times consumption, reduced per month
+        windowed = [i for i, tariff in enumerate(tariffs) if tariff.time_of_use]
+        if windowed and n_months:
+            calendar = calendar_fields(wall)
+            for b in range(0, len(windowed), TARIFF_BLOCK):
+                rows = windowed[b:b + TARIFF_BLOCK]
+                rates = np.vstack([tariffs[i].compile(wall, calendar).energy_rate for i in rows])
+                rates *= consumption
+                monthly_variable[rows] = np.add.reduceat(rates, month_starts, axis=1)
+
+        monthly_market = market_factor[:, None] * monthly_spot
+        monthly_fixed = np.broadcast_to(monthly_fee[:, None], (k, n_months)).copy()
+        return TariffComparison(
+            tariffs=[t.name for t in tariffs],
+            months=months,
+            monthly_consumption=monthly_consumption,
+            monthly_market=monthly_market,
+            monthly_variable=monthly_variable,
+            monthly_fixed=monthly_fixed,
+            monthly_total=monthly_market + monthly_variable + monthly_fixed,
+        )
+
+    @traced('calculator.price_bands')
+    def price_bands(self, share: float = DEFAULT_SHARE, start=None, end=None) -> PriceBandSummary:
+        """
+        Split consumption and cost into the cheap, normal and expensive quarter-hours of each day.
+
+        Bands are ranked by the market price within each local calendar day (see
+        price_bands.daily_price_bands); costs are the market cost plus energy charges of the
+        current tariff.
+
+        Parameters
+        ----------
+        share : float, optional
+            Fraction of each day's intervals in the cheap and in the expensive band. Default: 0.25.
+        start : datetime-like, optional
+            Start of the window (inclusive). Default: first interval.
+        end : datetime-like, optional
+            End of the window (exclusive). Default: after the last interval.
+
+        Returns
+        -------
+        PriceBandSummary
+            Intervals, kWh and EUR per band.
+        """
+        result = self.compute(start, end)
+        lo, hi = self.time_index.row_range(start, end)
+        price = self.merged_df[self.price_col].to_numpy(dtype='float64')[lo:hi]
+        bands = daily_price_bands(self._wall[lo:hi], price, share)
+        return summarize_bands(bands, result.consumption, result.total_cost, share)
+
+    @traced('calculator.window_totals')
+    def window_totals(self, start=None, end=None) -> WindowTotals:
+        """
+        Return cost totals of a time window in O(1) from prefix sums.
+
+        Cumulative sums of consumption, market cost and variable fee over all merged intervals and
+        a running month number per interval are built once per merge and fee setting; any window
+        is then two lookups. The fixed fee is charged once per calendar month the window touches.
+
+        Parameters
+        ----------
+        start : datetime-like, optional
+            Start of the window (inclusive). Default: first interval.
+        end : datetime-like, optional
+            End of the window (exclusive). Default: after the last interval.
+
+        Returns
+        -------
+        WindowTotals
+            Totals and month count of the window.
+        """
+        if self._prefix is None:
+            full = self.compute()
+            n = len(full.consumption)
+            self._prefix = np.zeros((3, n + 1), dtype='float64')
+            np.cumsum(np.vstack((full.consumption, full.market_cost, full.variable_fee)),
+                      axis=1, out=self._prefix[:, 1:])
+            self._month_index = np.zeros(n, dtype='int64')
+            np.cumsum(self._month_keys[1:] != self._month_keys[:-1], out=self._month_index[1:])
+
+        lo, hi = self.time_index.row_range(start, end)
+        consumption, market_cost, variable_fee = self._prefix[:, hi] - self._prefix[:, lo]
+        months = int(self._month_index[hi - 1] - self._month_index[lo]) + 1 if hi > lo else 0
+        return WindowTotals(
+            intervals=hi - lo,
+            months=months,
+            consumption=float(consumption),
+            market_cost=float(market_cost),
+            variable_fee=float(variable_fee),
+            fixed_fee=months * self.compiled_tariff().monthly_fee,
+        )
+
+    @traced('calculator.rollup')
+    def rollup(self) -> RollupCube:
+        """
+        Return day, ISO week, month and year sums, built once per merge and tariff.
+
+        Reports and charts read their aggregates from the cube instead of grouping interval rows;
+        only windows that do not start and end on local day boundaries need window_totals().
+
+        Returns
+        -------
+        RollupCube
+            Consumption, market cost, variable fee and interval counts per period.
+        """
+        if self._rollup is None:
+            full = self.compute()
+            self._rollup = RollupCube(self._wall, full.consumption, full.market_cost, full.variable_fee,
+                                      self.compiled_tariff().monthly_fee)
+        return self._rollup
+
+    @traced('calculator.calculate_costs')
+    def calculate_costs(self) -> pd.DataFrame:
+        """
+        Calculate market, provider variable, and total costs for each row.
+
+        Returns
+        -------
+        pd.DataFrame
+            Copy of the merged dataframe with columns: market_cost, variable_fee, total_cost.
+        """
+        result = self.compute()
+        return self.merged_df.assign(
+            market_cost=result.market_cost,
+            variable_fee=result.variable_fee,
+            total_cost=result.total_cost,
+        )
 
+    @traced('calculator.monthly_total')
     def monthly_total(self) -> pd.Series:
         """
         Calculate total monthly power cost including provider fees.
@@ -109,24 +628,20 @@ class PowerCostCalculator:
         pd.Series
             Total cost per month (including fixed fee), indexed by month.
         """
-        df = self.calculate_costs()
-        df['month'] = df[self.timestamp_col].dt.to_period('M')
-        monthly = df.groupby('month')['total_cost'].sum()
-        monthly += self.fixed_fee
-        return monthly
+        monthly = self.rollup().frame('month')
+        return pd.Series(monthly['total_cost'].to_numpy(), index=monthly.index.rename('month'), name='total_cost')
 
     def print_monthly_costs(self):
         """
         Print monthly electricity costs (EUR) including provider fees.
         """
-        monthly_cost = self.monthly_total()
-        monthly_avg_price = monthly_cost / \
-            self.merged_df.groupby('month')[self.consumption_col].sum()
+        monthly = self.rollup().frame('month')
         print('Monatliche Stromkosten inkl. Gebühren:')
-        for month, cost in monthly_cost.items():
-            print(f'{month}: {cost:.2f} EUR | average cost: {
-                  monthly_avg_price[month]:.3f} c/kWh')
+        for month, row in monthly.iterrows():
+            print(f'{month}: {row.total_cost:.2f} EUR | average cost: {
+                  row.avg_price:.3f} c/kWh')
 
+    @traced('calculator.plot_monthly_costs')
     def plot_monthly_costs(self):
         """
         Plot monthly costs as stacked bars: market, provider fixed and variable.
@@ -135,12 +650,11 @@ class PowerCostCalculator:
         -------
         None
         """
-        df = self.calculate_costs()
-        df['month'] = df[self.timestamp_col].dt.to_period('M')
-        monthly_market = df.groupby('month')['market_cost'].sum()
-        monthly_variable = df.groupby('month')['variable_fee'].sum()
-        months = monthly_market.index.astype(str)
-        monthly_fixed = pd.Series([self.fixed_fee]*len(months), index=months)
+        monthly = self.rollup().frame('month')
+        monthly_market = monthly['market_cost'].to_numpy()
+        monthly_variable = monthly['variable_fee'].to_numpy()
+        months = monthly.index.astype(str)
+        monthly_fixed = monthly['fixed_fee'].to_numpy()
         plt.figure(figsize=(10, 6))
         plt.bar(months, monthly_market, label='Marktpreis', color='skyblue')
         plt.bar(months, monthly_variable, bottom=monthly_market,
@@ -156,9 +670,9 @@ class PowerCostCalculator:
         plt.title('Monatliche Stromkosten: Markt, Anbieter Fix & Variabel')
         plt.legend()
         plt.tight_layout()
-        monthly_costs = self.monthly_total()
-        for i, v in enumerate(monthly_costs.values):
-            plt.text(i, v + max(monthly_costs.values) * 0.02 + 0.5,
+        monthly_costs = monthly['total_cost'].to_numpy()
+        for i, v in enumerate(monthly_costs):
+            plt.text(i, v + max(monthly_costs) * 0.02 + 0.5,
                      f"{v:.2f} EUR", ha="center", fontweight="bold")
-        plt.ylim(0, max(monthly_costs.values) * 1.15)
+        plt.ylim(0, max(monthly_costs) * 1.15)
         plt.tight_layout()
@@ -0,0 +1,540 @@
+"""
+Data loading module.
+
+Reads the ökostrom consumption export (XLSX) and the APG day-ahead price export (CSV) into
+DataFrames with a parsed 'timestamp' column, and keeps a content-hash-keyed binary cache of the
+parsed columns so unchanged files are never re-parsed.
+
+Both sources are normalized to the same instants at parse time. Both exports carry Vienna wall
+time (CET/CEST): consumption 'Timestamp' values are that wall time as epoch seconds (they equal
+'Datum' read as UTC, not the true instant), price 'Zeit von' values are text. 'timestamp' is
+always timezone-aware in Europe/Vienna; it is stored as UTC int64 nanoseconds.
+
+Data sources:
+- Market prices: https://markt.apg.at/transparenz/uebertragung/day-ahead-preise/
+- Consumption: https://mein.oekostrom.at/a-p/
+"""
+
+import hashlib
+import os
+import zipfile
+from xml.etree import ElementTree
+
+import numpy as np
+import pandas as pd
+
+from instrumentation import span, traced
+from merge_engine import to_epoch_ns
+
+CACHE_DIR = '.power_cache'
+CACHE_VERSION = 2
+TIMEZONE = 'Europe/Vienna'
+
+UTF8_BOM = b'\xef\xbb\xbf'
+CSV_CHUNK_ROWS = 100_000
+# 'dd.mm.yyyy HH:MM:SS;dd.mm.yyyy HH:MM:SS;' plus line break
+MIN_PRICE_ROW_BYTES = 41
+
+XLSX_NS = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+XLSX_REL_NS = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+
+CONSUMPTION_COL = 'Verbrauch'
+PRICE_COL = 'Preis MC Auktion [EUR/MWh]'
+
+
+def file_digest(path: str) -> str:
+    """
+    Compute the SHA-256 hex digest of a file's content.
+
+    Parameters
+    ----------
+    path : str
+        Path of the file to hash.
+
+    Returns
+    -------
+    str
+        Hex digest of the file content.
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _cache_path(kind: str, digest: str, cache_dir: str) -> str:
+    """Return the cache file path for a parsed file of the given kind."""
+    return os.path.join(cache_dir, f'{kind}_v{CACHE_VERSION}_{digest}.npz')
+
+
+def _read_cache(path: str) -> pd.DataFrame | None:
+    """Load a cached frame, returning None if the entry is missing or unreadable."""
+    if not os.path.exists(path):
+        return None
+    try:
+        with np.load(path, allow_pickle=False) as data:
+            columns = [str(name) for name in data['columns']]
+            df = pd.DataFrame({name: data[f'col_{i}'] for i, name in enumerate(columns)})
+    except Exception as e:
+        print(f"Could not read cache {path}: {e}")
+        return None
+    df['timestamp'] = from_epoch_ns(df['timestamp'].to_numpy(dtype='int64'))
+    return df
+
+
+def _write_cache(path: str, df: pd.DataFrame):
+    """Store the frame's columns as a NumPy archive, replacing any previous entry atomically."""
+    columns = list(df.columns)
+    arrays = {}
+    for i, name in enumerate(columns):
+        values = df[name]
+        if name == 'timestamp':
+            arrays[f'col_{i}'] = to_epoch_ns(values)
+        else:
+            arrays[f'col_{i}'] = values.to_numpy()
+    try:
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, columns=np.array(columns), **arrays)
+        os.replace(tmp_path, path)
+    except Exception as e:
+        print(f"Could not write cache {path}: {e}")
+
+
+def from_epoch_ns(epoch_ns: np.ndarray) -> pd.Series:
+    """Convert UTC int64 epoch nanoseconds to a Europe/Vienna timezone-aware Series."""
+    return pd.Series(pd.to_datetime(epoch_ns, unit='ns', utc=True).tz_convert(TIMEZONE))
+
+
+@traced('data_loader.localize_wall_time')
+def localize_wall_time(
+    start: pd.Series,
+    end: pd.Series | None = None,
+    repeat_flags: np.ndarray | None = None,
+) -> pd.Series:
+    """
+    Localize naive Vienna wall times of consecutive periods, resolving the repeated autumn hour.
+
+    When clocks go back (03:00 CEST -> 02:00 CET) the wall times 02:00-02:59 occur twice. The
+    period during which the clock goes back is the one whose end wall time is not after its start
+    (e.g. '02:45 -> 02:00', or '02:00 -> 02:00' for hourly periods); repeated wall times within
+    the hour up to and including that period are CEST, later ones CET. The whole resolution is
+    array arithmetic, no per-row Python work.
+
+    Parameters
+    ----------
+    start : pd.Series
+        Naive period start wall times ('Zeit von'), in file order.
+    end : pd.Series, optional
+        Naive period end wall times ('Zeit bis'). Without it, the first occurrence of a repeated
+        wall time is taken as CEST.
+    repeat_flags : np.ndarray, optional
+        Explicit per-row flags overriding the inferred ones: 1 = CEST, 0 = CET, -1 = infer.
+
+    Returns
+    -------
+    pd.Series
+        Timezone-aware period starts in Europe/Vienna.
+    """
+    n = len(start)
+    wall = start.to_numpy(dtype='datetime64[ns]').view('int64')
+    if end is not None:
+        wall_end = end.to_numpy(dtype='datetime64[ns]').view('int64')
+        # Hourly files go back within one row (02:00 -> 02:00), quarter-hourly ones 02:45 -> 02:00
+        back = np.flatnonzero(wall_end <= wall)
+        if len(back):
+            nxt = np.minimum(np.searchsorted(back, np.arange(n)), len(back) - 1)
+            hour = pd.Timedelta(hours=1).value
+            is_dst = (np.arange(n) <= back[nxt]) & (wall[back[nxt]] - wall < hour)
+        else:
+            is_dst = np.ones(n, dtype=bool)
+    else:
+        is_dst = ~start.duplicated(keep='first').to_numpy()
+    if repeat_flags is not None:
+        is_dst = np.where(repeat_flags >= 0, repeat_flags == 1, is_dst)
+    localized = start.dt.tz_localize(TIMEZONE, ambiguous=is_dst, nonexistent='shift_forward')
+    return localized.reset_index(drop=True)
+
+
+def _xlsx_first_sheet(archive: zipfile.ZipFile) -> str:
+    """Return the archive path of the workbook's first worksheet."""
+    try:
+        workbook = ElementTree.fromstring(archive.read('xl/workbook.xml'))
+        sheet = workbook.find(f'{XLSX_NS}sheets/{XLSX_NS}sheet')
+        rel_id = sheet.get(f'{{{XLSX_REL_NS}}}id')
+        rels = ElementTree.fromstring(archive.read('xl/_rels/workbook.xml.rels'))
+        for rel in rels:
+            if rel.get('Id') == rel_id:
+                target = rel.get('Target').lstrip('/')
+                return target if target.startswith('xl/') else f'xl/{target}'
+    except (KeyError, AttributeError, ElementTree.ParseError):
+        pass
+    return 'xl/worksheets/sheet1.xml'
+
+
+def _xlsx_shared_strings(archive: zipfile.ZipFile) -> np.ndarray:
+    """Read the shared string table as an array of str."""
+    if 'xl/sharedStrings.xml' not in archive.namelist():
+        return np.empty(0, dtype=object)
+    strings = []
+    with archive.open('xl/sharedStrings.xml') as f:
+        for _, elem in ElementTree.iterparse(f):
+            if elem.tag == f'{XLSX_NS}si':
+                strings.append(''.join(t.text or '' for t in elem.iter(f'{XLSX_NS}t')))
+                elem.clear()
+    return np.array(strings, dtype=object)
+
+
+@traced('data_loader.read_xlsx_columns')
+def read_xlsx_columns(path: str, columns: list[str]) -> dict[str, np.ndarray]:
+    """
+    Stream selected columns of the first worksheet of an XLSX file as raw text.
+
+    The sheet XML is parsed incrementally with iterparse and every processed row is discarded, so
+    memory stays proportional to the selected columns. Cells of other columns are skipped without
+    being converted. Shared-string cells are kept as string-table indices and resolved in one
+    vectorized lookup at the end.
+
+    Parameters
+    ----------
+    path : str
+        Path to the XLSX file.
+    columns : list of str
+        Header names (first row) of the columns to read.
+
+    Returns
+    -------
+    dict of str to np.ndarray
+        Object arrays of cell text per requested column, one entry per data row (None if empty).
+
+    Raises
+    ------
+    ValueError
+        If a requested column is missing from the header row.
+    """
+    with zipfile.ZipFile(path) as archive:
+        strings = _xlsx_shared_strings(archive)
+        with archive.open(_xlsx_first_sheet(archive)) as f:
+            wanted: dict[str, str] = {}  # column letter -> header name
+            shared: dict[str, np.ndarray] = {}
+            texts: dict[str, np.ndarray] = {}
+            n_rows = capacity = 0
+            sheet_data = None
+            for event, elem in ElementTree.iterparse(f, events=('start', 'end')):
+                if event == 'start':
+                    if elem.tag == f'{XLSX_NS}sheetData':
+                        sheet_data = elem
+                    continue
+                if elem.tag == f'{XLSX_NS}dimension':
+                    last_ref = elem.get('ref', '').split(':')[-1]
+                    capacity = int(last_ref.lstrip('ABCDEFGHIJKLMNOPQRSTUVWXYZ') or 0)
+                elif elem.tag == f'{XLSX_NS}row':
+                    row = int(elem.get('r')) - 2 if elem.get('r') else n_rows
+                    if not wanted:
+                        # Header row: map requested names to column letters
+                        for cell in elem:
+                            name = _xlsx_cell_text(cell, strings)
+                            if name in columns:
+                                wanted[cell.get('r').rstrip('0123456789')] = name
+                        missing = set(columns) - set(wanted.values())
+                        if missing:
+                            raise ValueError(f"Columns {sorted(missing)} not found in {path}")
+                        size = max(capacity - 1, 1024)
+                        shared = {name: np.full(size, -1, dtype=np.int64) for name in columns}
+                        texts = {name: np.full(size, None, dtype=object) for name in columns}
+                    else:
+                        if row >= len(next(iter(shared.values()))):
+                            grow = 2 * (row + 1)
+                            for name in columns:
+                                shared[name] = np.concatenate(
+                                    [shared[name], np.full(grow - len(shared[name]), -1, dtype=np.int64)])
+                                texts[name] = np.concatenate(
+                                    [texts[name], np.full(grow - len(texts[name]), None, dtype=object)])
+                        for cell in elem:
+                            name = wanted.get(cell.get('r', '').rstrip('0123456789'))
+                            if name is None:
+                                continue
+                            value = cell.find(f'{XLSX_NS}v')
+                            if cell.get('t') == 's' and value is not None:
+                                shared[name][row] = int(value.text)
+                            else:
+                                texts[name][row] = _xlsx_cell_text(cell, strings)
+                        n_rows = row + 1
+                    if sheet_data is not None:
+                        sheet_data.clear()
+
+    result = {}
+    for name in columns:
+        values = texts[name][:n_rows]
+        idx = shared[name][:n_rows]
+        is_shared = idx >= 0
+        values[is_shared] = strings[idx[is_shared]]
+        result[name] = values
+    return result
+
+
+def _xlsx_cell_text(cell, strings: np.ndarray) -> str | None:
+    """Return the text of a single cell element."""
+    kind = cell.get('t')
+    if kind == 'inlineStr':
+        return ''.join(t.text or '' for t in cell.iter(f'{XLSX_NS}t'))
+    value = cell.find(f'{XLSX_NS}v')
+    if value is None or value.text is None:
+        return None
+    if kind == 's':
+        return strings[int(value.text)]
+    return value.text
+
+
+def _decimal_comma_to_float(values: np.ndarray) -> np.ndarray:
+    """Convert decimal-comma text to float64, converting each distinct string only once."""
+    unique, inverse = np.unique(values.astype(str), return_inverse=True)
+    converted = pd.to_numeric(
+        pd.Series(unique).str.replace(',', '.', regex=False), errors='coerce').to_numpy(dtype=np.float64)
+    result = converted[inverse]
+    result[pd.isna(values)] = np.nan
+    return result
+
+
+@traced('data_loader.parse_consumption')
+def parse_consumption(path: str, since: pd.Timestamp | None = None) -> pd.DataFrame:
+    """
+    Parse an ökostrom consumption export without using the cache.
+
+    Only the 'Datum', 'Timestamp' and 'Verbrauch' columns are streamed out of the sheet XML;
+    openpyxl is not used. Decimal-comma consumption values are converted per distinct string.
+
+    'Timestamp' is the Vienna wall time of 'Datum' encoded as epoch seconds, so it is localized
+    like the price wall times (the first pass of the repeated autumn hour is CEST). Every row is
+    checked against 'Datum'.
+
+    Parameters
+    ----------
+    path : str
+        Path to the consumption Excel file.
+    since : pd.Timestamp, optional
+        Only convert and return intervals starting at or after this time.
+
+    Returns
+    -------
+    pd.DataFrame
+        Columns 'Timestamp' (wall time as epoch seconds), 'timestamp' (Europe/Vienna) and
+        'Verbrauch' (kWh).
+
+    Raises
+    ------
+    ValueError
+        If a 'Timestamp' does not match the 'Datum' of its row.
+    """
+    raw = read_xlsx_columns(path, ['Datum', 'Timestamp', CONSUMPTION_COL])
+    seconds = _decimal_comma_to_float(raw['Timestamp'])
+    valid = ~np.isnan(seconds)
+    if since is not None:
+        since_wall = since.tz_convert(TIMEZONE).tz_localize(None) if since.tzinfo is not None else since
+        valid &= seconds >= since_wall.value // 10**9
+    seconds = seconds[valid].astype(np.int64)
+    _check_datum(path, raw['Datum'][valid], seconds)
+    consumption = _decimal_comma_to_float(raw[CONSUMPTION_COL][valid])
+    with span('data_loader.to_datetime', rows=len(seconds)):
+        timestamps = localize_wall_time(pd.Series(pd.to_datetime(seconds, unit='s')))
+    df = pd.DataFrame({
+        'Timestamp': seconds,
+        'timestamp': timestamps,
+        CONSUMPTION_COL: consumption,
+    })
+    return df.dropna(subset=[CONSUMPTION_COL]).reset_index(drop=True)
+
+
+def _check_datum(path: str, datum: np.ndarray, seconds: np.ndarray):
+    """
+    Check that 'Timestamp' epoch seconds and 'Datum' ('dd.mm.yyyy HH:MM') give the same wall time.
+
+    Raises
+    ------
+    ValueError
+        On the first row where they differ or 'Datum' is not a date.
+    """
+    fields = np.char.add(np.asarray(datum, dtype='S16'), b':00')
+    wall, _, ok = _decode_wall_times(fields)
+    mismatch = np.flatnonzero(~ok | (wall != seconds * 10**9))
+    if len(mismatch):
+        i = mismatch[0]
+        raise ValueError(
+            f"'Timestamp' does not match 'Datum' in {len(mismatch)} rows of {path}, first: "
+            f"{datum[i]!r} vs {pd.Timestamp(seconds[i], unit='s')}")
+
+
+def _decode_wall_times(fields: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Decode fixed-width 'dd.mm.yyyy HH:MM:SS' byte strings by slicing digits into integer arrays.
+
+    Parameters
+    ----------
+    fields : np.ndarray
+        Array of dtype 'S19'.
+
+    Returns
+    -------
+    tuple of np.ndarray
+        Naive wall times as int64 nanoseconds, repeat-hour flags (1 for '2A', 0 for '2B', -1
+        otherwise) and a validity mask.
+    """
+    raw = np.ascontiguousarray(fields, dtype='S19').view(np.uint8).reshape(-1, 19)
+    digits = raw.astype(np.int64) - ord('0')
+    marker = raw[:, 12]
+    is_a = marker == ord('A')
+    is_b = marker == ord('B')
+
+    digit_pos = [0, 1, 3, 4, 6, 7, 8, 9, 11, 14, 15, 17, 18]
+    valid = np.all((digits[:, digit_pos] >= 0) & (digits[:, digit_pos] <= 9), axis=1)
+    valid &= is_a | is_b | ((digits[:, 12] >= 0) & (digits[:, 12] <= 9))
+
+    day = digits[:, 0] * 10 + digits[:, 1]
+    month = digits[:, 3] * 10 + digits[:, 4]
+    year = digits[:, 6] * 1000 + digits[:, 7] * 100 + digits[:, 8] * 10 + digits[:, 9]
+    hour = np.where(is_a | is_b, digits[:, 11], digits[:, 11] * 10 + digits[:, 12])
+    minute = digits[:, 14] * 10 + digits[:, 15]
+    second = digits[:, 17] * 10 + digits[:, 18]
+    valid &= (month >= 1) & (month <= 12) & (day >= 1) & (day <= 31)
+
+    # Calendar date to days since epoch via numpy's datetime64 arithmetic
+    month_index = np.where(valid, (year - 1970) * 12 + month - 1, 0)
+    days = (month_index.astype('datetime64[M]').astype('datetime64[D]').astype(np.int64)
+            + np.where(valid, day - 1, 0))
+    seconds = days * 86400 + hour * 3600 + minute * 60 + second
+    flags = np.select([is_a, is_b], [1, 0], -1).astype(np.int8)
+    return seconds * 10**9, flags, valid
+
+
+@traced('data_loader.parse_prices')
+def parse_prices(
+    path: str,
+    since: pd.Timestamp | None = None,
+    chunk_rows: int = CSV_CHUNK_ROWS,
+) -> pd.DataFrame:
+    """
+    Parse an APG day-ahead price export without using the cache.
+
+    Any number of leading byte order marks is skipped (EXAAD1P files carry two). The file is read
+    in chunks of chunk_rows rows into arrays preallocated from the file size; the fixed-width
+    'Zeit von'/'Zeit bis' fields are decoded by slicing their digits and prices are read with the
+    C parser's decimal-comma support.
+
+    Parameters
+    ----------
+    path : str
+        Path to the price CSV file.
+    since : pd.Timestamp, optional
+        Only return intervals starting at or after this time.
+    chunk_rows : int, optional
+        Rows per streamed chunk. Default: 100000.
+
+    Returns
+    -------
+    pd.DataFrame
+        Column 'timestamp' ('Zeit von' in Europe/Vienna) plus every price column in EUR/MWh.
+    """
+    with open(path, 'rb') as f:
+        head = f.read(16)
+        offset = 0
+        while head.startswith(UTF8_BOM, offset):
+            offset += len(UTF8_BOM)
+        f.seek(offset)
+        header = f.readline().decode('utf-8').strip().split(';')
+        time_idx = [i for i, col in enumerate(header) if 'Zeit von' in col][0]
+        end_idx = [i for i, col in enumerate(header) if 'Zeit bis' in col]
+        price_idx = [i for i, col in enumerate(header) if 'EUR/MWh' in col]
+        time_idx_all = [time_idx] + end_idx
+
+        # Upper bound on rows: every data line holds two 19-byte times and separators
+        capacity = (os.fstat(f.fileno()).st_size - f.tell()) // MIN_PRICE_ROW_BYTES + 1
+        start = np.empty(capacity, dtype=np.int64)
+        end = np.empty(capacity, dtype=np.int64)
+        flags = np.empty(capacity, dtype=np.int8)
+        prices = np.empty((len(price_idx), capacity), dtype=np.float64)
+        n = 0
+
+        reader = pd.read_csv(
+            f, sep=';', decimal=',', header=None,
+            usecols=time_idx_all + price_idx,
+            dtype={i: str for i in time_idx_all} | {i: np.float64 for i in price_idx},
+            chunksize=chunk_rows,
+        )
+        for chunk in reader:
+            times = chunk[time_idx].fillna('').to_numpy(dtype='S19')
+            wall, repeat, valid = _decode_wall_times(times)
+            if end_idx:
+                wall_end, _, valid_end = _decode_wall_times(
+                    chunk[end_idx[0]].fillna('').to_numpy(dtype='S19'))
+                valid &= valid_end
+            k = int(valid.sum())
+            start[n:n + k] = wall[valid]
+            if end_idx:
+                end[n:n + k] = wall_end[valid]
+            flags[n:n + k] = repeat[valid]
+            for j, i in enumerate(price_idx):
+                prices[j, n:n + k] = chunk[i].to_numpy(dtype=np.float64)[valid]
+            n += k
+
+    start_series = pd.Series(start[:n].view('datetime64[ns]'))
+    end_series = pd.Series(end[:n].view('datetime64[ns]')) if end_idx else None
+    result = pd.DataFrame({'timestamp': localize_wall_time(start_series, end_series, flags[:n])})
+    for j, i in enumerate(price_idx):
+        result[header[i]] = prices[j, :n]
+    if since is not None:
+        result = result[(result['timestamp'] >= since).to_numpy()]
+    return result.reset_index(drop=True)
+
+
+def _load_cached(kind: str, path: str, parse, cache_dir: str | None) -> pd.DataFrame:
+    """Return the parsed frame for path, reading it from or storing it into the cache."""
+    if cache_dir is None:
+        return parse(path)
+    cache_file = _cache_path(kind, file_digest(path), cache_dir)
+    df = _read_cache(cache_file)
+    if df is None:
+        df = parse(path)
+        _write_cache(cache_file, df)
+    return df
+
+
+@traced('data_loader.load_consumption')
+def load_consumption(path: str, cache_dir: str | None = CACHE_DIR) -> pd.DataFrame:
+    """
+    Load consumption data from an ökostrom XLSX export.
+
+    Parameters
+    ----------
+    path : str
+        Path to the consumption Excel file.
+    cache_dir : str or None, optional
+        Directory for the parsed-data cache. None disables caching. Default: '.power_cache'.
+
+    Returns
+    -------
+    pd.DataFrame
+        Columns 'Timestamp' (UNIX seconds), 'timestamp' (datetime) and 'Verbrauch' (kWh, float).
+    """
+    return _load_cached('consumption', path, parse_consumption, cache_dir)
+
+
+@traced('data_loader.load_prices')
+def load_prices(path: str, cache_dir: str | None = CACHE_DIR) -> pd.DataFrame:
+    """
+    Load market price data from an APG day-ahead CSV export.
+
+    Parameters
+    ----------
+    path : str
+        Path to the price CSV file.
+    cache_dir : str or None, optional
+        Directory for the parsed-data cache. None disables caching. Default: '.power_cache'.
+
+    Returns
+    -------
+    pd.DataFrame
+        Column 'timestamp' (datetime of 'Zeit von') plus every price column in EUR/MWh as float.
+    """
+    return _load_cached('prices', path, parse_prices, cache_dir)
@@ -0,0 +1,243 @@
+"""
+Level-of-detail downsampling module.
+
+Builds a min/max pyramid of an interval series once (15 min -> hour -> day -> week buckets of
+local wall time, each level aggregated from the one below) so a chart can show any time window
+with at most one bucket per pixel. A view picks the finest level whose buckets in the window fit
+the pixel width and slices it with np.searchsorted, so rendering costs the same for a week and
+for twenty years of data. Minimum and maximum per bucket keep peaks visible at every level.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from merge_engine import wall_time
+
+LEVELS = ('15min', 'hour', 'day', 'week')
+
+
+def _bucket_keys(level: str, wall_times: np.ndarray) -> np.ndarray:
+    """Start of the bucket of every wall time (weeks start on Monday)."""
+    if level == 'hour':
+        return wall_times.astype('datetime64[h]').astype('datetime64[ns]')
+    days = wall_times.astype('datetime64[D]')
+    if level == 'week':
+        # 1970-01-01 was a Thursday
+        days = days - (days.astype(np.int64) + 3) % 7
+    return days.astype('datetime64[ns]')
+
+
+@dataclass
+class PyramidLevel:
+    """
+    One resolution of a SeriesPyramid.
+
+    Attributes
+    ----------
+    name : str
+        Level name from LEVELS.
+    start : np.ndarray
+        Naive local start of every bucket (datetime64[ns]).
+    minimum, maximum, total : np.ndarray
+        Minimum, maximum and sum of the valid values per bucket (NaN/0 for empty buckets).
+    count : np.ndarray
+        Number of valid values per bucket.
+    """
+
+    name: str
+    start: np.ndarray
+    minimum: np.ndarray
+    maximum: np.ndarray
+    total: np.ndarray
+    count: np.ndarray
+
+    def __post_init__(self):
+        # The repeated DST hour steps back in wall time; searches use the running maximum
+        self._search_key = np.maximum.accumulate(self.start) if len(self.start) else self.start
+
+    def __len__(self) -> int:
+        return len(self.start)
+
+    def bucket_range(self, start=None, end=None) -> tuple[int, int]:
+        """
+        Map a wall time window to the buckets needed to draw it.
+
+        Includes the bucket containing start and the first bucket at or after end, so lines
+        run up to both edges of the window.
+
+        Returns
+        -------
+        tuple of int
+            (lo, hi) with lo <= hi.
+        """
+        lo, hi = 0, len(self.start)
+        if start is not None:
+            lo = max(int(np.searchsorted(self._search_key, np.datetime64(start, 'ns'), side='right')) - 1, 0)
+        if end is not None:
+            hi = min(int(np.searchsorted(self._search_key, np.datetime64(end, 'ns'), side='left')) + 1, hi)
+        return lo, max(lo, hi)
+
+    def slice(self, lo: int, hi: int) -> 'PyramidLevel':
+        """Return buckets lo..hi-1 as a level of their own (views, no copies)."""
+        return PyramidLevel(self.name, self.start[lo:hi], self.minimum[lo:hi], self.maximum[lo:hi],
+                            self.total[lo:hi], self.count[lo:hi])
+
+    def coarsen(self, name: str, group_starts: np.ndarray, start: np.ndarray | None = None) -> 'PyramidLevel':
+        """
+        Aggregate consecutive buckets into a coarser level.
+
+        Parameters
+        ----------
+        name : str
+            Name of the new level.
+        group_starts : np.ndarray
+            Index of the first bucket of every group, increasing.
+        start : np.ndarray, optional
+            Start of every group. Default: start of its first bucket.
+        """
+        return PyramidLevel(
+            name=name,
+            start=self.start[group_starts] if start is None else start,
+            minimum=np.fmin.reduceat(self.minimum, group_starts),
+            maximum=np.fmax.reduceat(self.maximum, group_starts),
+            total=np.add.reduceat(self.total, group_starts),
+            count=np.add.reduceat(self.count, group_starts),
+        )
+
+
+@dataclass
+class LevelView:
+    """
+    Downsampled values of a time window, ready to plot.
+
+    Attributes
+    ----------
+    level : str
+        Level the values come from.
+    start : np.ndarray
+        Naive local bucket starts (datetime64[ns]).
+    minimum, maximum, mean : np.ndarray
+        Envelope and mean of each bucket (NaN for buckets without data).
+    """
+
+    level: str
+    start: np.ndarray
+    minimum: np.ndarray
+    maximum: np.ndarray
+    mean: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.start)
+
+
+class SeriesPyramid:
+    """
+    Multi-resolution min/max pyramid of one interval series.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Time-sorted data with timestamp and value columns.
+    value_col : str
+        Name of the value column.
+    timestamp_col : str, optional
+        Name of the timestamp column. Default: 'timestamp'.
+    """
+
+    def __init__(self, df: pd.DataFrame, value_col: str, timestamp_col: str = 'timestamp'):
+        """
+        Initialize a SeriesPyramid and build all levels.
+
+        See class docstring for parameter details.
+        """
+        wall = wall_time(df[timestamp_col])
+        values = df[value_col].to_numpy(dtype=np.float64)
+        keep = ~np.isnat(wall)
+        wall, values = wall[keep], values[keep]
+        valid = ~np.isnan(values)
+
+        level = PyramidLevel(
+            name=LEVELS[0],
+            start=wall,
+            minimum=values,
+            maximum=values,
+            total=np.where(valid, values, 0.0),
+            count=valid.astype(np.int64),
+        )
+        self.levels = [level]
+        for name in LEVELS[1:]:
+            keys = _bucket_keys(name, level.start)
+            if len(keys):
+                group_starts = np.concatenate(([0], np.flatnonzero(keys[1:] != keys[:-1]) + 1))
+            else:
+                group_starts = np.empty(0, dtype=np.int64)
+            level = level.coarsen(name, group_starts, start=keys[group_starts])
+            self.levels.append(level)
+
+    def __len__(self) -> int:
+        return len(self.levels[0])
+
+    @property
+    def start(self) -> np.datetime64 | None:
+        """First wall time, None if empty."""
+        return self.levels[0].start[0] if len(self) else None
+
+    @property
+    def end(self) -> np.datetime64 | None:
+        """Last wall time, None if empty."""
+        return self.levels[0].start[-1] if len(self) else None
+
+    def level(self, name: str) -> PyramidLevel:
+        """Return the level with the given name."""
+        return self.levels[LEVELS.index(name)]
+
+    def view(self, start=None, end=None, max_points: int = 1000) -> LevelView:
+        """
+        Return the values of a wall time window at the finest level that fits max_points.
+
+        If even the coarsest level holds more buckets in the window, they are merged further
+        into max_points groups, so the result never exceeds max_points buckets.
+
+        Parameters
+        ----------
+        start, end : datetime-like, optional
+            Naive local window bounds. Default: first/last interval.
+        max_points : int, optional
+            Maximum number of buckets, typically the plot width in pixels. Default: 1000.
+
+        Returns
+        -------
+        LevelView
+            Bucket starts, envelope and mean.
+
+        Raises
+        ------
+        ValueError
+            If max_points is not positive.
+        """
+        if max_points < 1:
+            raise ValueError(f"max_points must be positive, got {max_points}")
+        start = None if start is None else pd.Timestamp(start).to_datetime64()
+        end = None if end is None else pd.Timestamp(end).to_datetime64()
+
+        for level in self.levels:
+            lo, hi = level.bucket_range(start, end)
+            if hi - lo <= max_points:
+                break
+        else:
+            chunk = -(-(hi - lo) // max_points)
+            level = level.slice(lo, hi).coarsen(level.name, np.arange(0, hi - lo, chunk))
+            lo, hi = 0, len(level)
+
+        count = level.count[lo:hi]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mean = np.where(count > 0, level.total[lo:hi] / count, np.nan)
+        return LevelView(
+            level=level.name,
+            start=level.start[lo:hi],
+            minimum=level.minimum[lo:hi],
+            maximum=level.maximum[lo:hi],
+            mean=mean,
+        )
@@ -0,0 +1,299 @@
+"""
+Incremental ingestion module.
+
+Keeps a persistent, time-indexed store per data series (one per installation for consumption,
+one per market for prices). Every new export from mein.oekostrom.at or markt.apg.at repeats the
+whole year, so a newly selected file is diffed against the stored intervals: intervals past the
+stored maximum are appended, a short overlap window before it is checked and only revised values
+are written, and a file that was already ingested is skipped without parsing.
+"""
+
+import os
+import re
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from data_loader import CACHE_DIR, file_digest, from_epoch_ns, parse_consumption, parse_prices
+from instrumentation import traced
+from merge_engine import to_epoch_ns
+
+OVERLAP_WINDOW = pd.Timedelta(days=2)
+
+# Bumped whenever the stored representation changes (2: UTC timestamps)
+STORE_VERSION = 2
+
+
+@dataclass
+class IngestResult:
+    """
+    Outcome of ingesting one file into an IntervalStore.
+
+    Attributes
+    ----------
+    source : str
+        Path of the ingested file.
+    appended : int
+        Number of intervals not previously stored.
+    revised : int
+        Number of stored intervals whose values changed in the new file.
+    unchanged : int
+        Number of overlapping intervals with identical values.
+    skipped : bool
+        True if the file content was already ingested and was not parsed again.
+    """
+
+    source: str
+    appended: int = 0
+    revised: int = 0
+    unchanged: int = 0
+    skipped: bool = False
+
+    @property
+    def changed(self) -> bool:
+        """True if the store content changed."""
+        return self.appended > 0 or self.revised > 0
+
+
+class IntervalStore:
+    """
+    Persistent store of interval data sorted by timestamp.
+
+    Holds a sorted int64 'timestamp' array (UTC ns since epoch) plus one array per value column and
+    the content digests of all ingested files. Saved as a NumPy archive after every change.
+
+    Parameters
+    ----------
+    path : str
+        Location of the store archive. Loaded if it exists.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialize an IntervalStore, loading it from path if present.
+
+        See class docstring for parameter details.
+        """
+        self.path = path
+        self.timestamps = np.empty(0, dtype='int64')
+        self.columns: dict[str, np.ndarray] = {}
+        self.sources: set[str] = set()
+        if os.path.exists(path):
+            self._load()
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    @property
+    def max_timestamp(self) -> pd.Timestamp | None:
+        """Latest stored interval start, or None if the store is empty."""
+        if len(self.timestamps) == 0:
+            return None
+        return from_epoch_ns(self.timestamps[-1:]).iloc[0]
+
+    def _load(self):
+        """Read the store archive from disk."""
+        try:
+            with np.load(self.path, allow_pickle=False) as data:
+                names = [str(name) for name in data['columns']]
+                self.timestamps = data['timestamp']
+                self.columns = {name: data[f'col_{i}'] for i, name in enumerate(names)}
+                self.sources = {str(s) for s in data['sources']}
+        except Exception as e:
+            print(f"Could not load store {self.path}: {e}")
+            self.timestamps = np.empty(0, dtype='int64')
+            self.columns = {}
+            self.sources = set()
+
+    def save(self):
+        """Write the store archive to disk atomically."""
+        names = list(self.columns)
+        arrays = {f'col_{i}': self.columns[name] for i, name in enumerate(names)}
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            np.savez(
+                f,
+                timestamp=self.timestamps,
+                columns=np.array(names, dtype=str),
+                sources=np.array(sorted(self.sources), dtype=str),
+                **arrays
+            )
+        os.replace(tmp_path, self.path)
+
+    @traced('ingestion.to_frame')
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Return the stored intervals as a DataFrame.
+
+        Returns
+        -------
+        pd.DataFrame
+            Column 'timestamp' (Europe/Vienna) followed by the stored value columns.
+        """
+        df = pd.DataFrame({'timestamp': from_epoch_ns(self.timestamps)})
+        for name, values in self.columns.items():
+            df[name] = values
+        return df
+
+    def append(self, df: pd.DataFrame, source: str = '') -> IngestResult:
+        """
+        Merge a parsed frame into the store.
+
+        Intervals after the stored maximum are appended, overlapping intervals are compared and
+        revised values overwrite stored ones. Rows whose value columns are all missing (e.g. price
+        placeholders for days not yet auctioned) are ignored.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            Frame with a 'timestamp' column and the store's value columns.
+        source : str, optional
+            Name of the file the frame was parsed from, used in the result.
+
+        Returns
+        -------
+        IngestResult
+            Counts of appended, revised and unchanged intervals.
+
+        Raises
+        ------
+        ValueError
+            If the frame's value columns differ from the stored ones.
+        """
+        names = [col for col in df.columns if col != 'timestamp']
+        if self.columns and set(names) != set(self.columns):
+            raise ValueError(
+                f"Columns {sorted(names)} do not match stored columns {sorted(self.columns)}")
+
+        ts = to_epoch_ns(df['timestamp'])
+        values = {name: df[name].to_numpy() for name in names}
+
+        # Sort, drop duplicate timestamps (last wins) and empty placeholder rows
+        order = np.argsort(ts, kind='stable')
+        ts = ts[order]
+        values = {name: v[order] for name, v in values.items()}
+        keep = np.append(ts[1:] != ts[:-1], True) if len(ts) else np.empty(0, dtype=bool)
+        float_cols = [v for v in values.values() if v.dtype.kind == 'f']
+        if float_cols:
+            keep &= ~np.all(np.isnan(np.column_stack(float_cols)), axis=1)
+        ts = ts[keep]
+        values = {name: v[keep] for name, v in values.items()}
+
+        result = IngestResult(source=source)
+        if len(self.timestamps) == 0:
+            self.timestamps = ts
+            self.columns = values
+            result.appended = len(ts)
+            return result
+
+        # Locate incoming intervals in the stored index
+        pos = np.searchsorted(self.timestamps, ts)
+        in_range = pos < len(self.timestamps)
+        exists = np.zeros(len(ts), dtype=bool)
+        exists[in_range] = self.timestamps[pos[in_range]] == ts[in_range]
+
+        # Overlap check: overwrite stored values that the new export revises
+        overlap_pos = pos[exists]
+        revised = np.zeros(len(overlap_pos), dtype=bool)
+        for name, new in values.items():
+            old = self.columns[name][overlap_pos]
+            if new.dtype.kind == 'f' or old.dtype.kind == 'f':
+                revised |= ~np.isclose(old, new[exists], equal_nan=True)
+            else:
+                revised |= old != new[exists]
+        if revised.any():
+            for name, new in values.items():
+                self.columns[name][overlap_pos[revised]] = new[exists][revised]
+        result.revised = int(revised.sum())
+        result.unchanged = int(len(overlap_pos) - result.revised)
+
+        # Append new intervals; only re-sort when they do not all lie after the stored maximum
+        new_ts = ts[~exists]
+        result.appended = len(new_ts)
+        if len(new_ts):
+            merged_ts = np.concatenate([self.timestamps, new_ts])
+            merged = {name: np.concatenate([self.columns[name], values[name][~exists]])
+                      for name in self.columns}
+            if new_ts[0] <= self.timestamps[-1]:
+                order = np.argsort(merged_ts, kind='stable')
+                merged_ts = merged_ts[order]
+                merged = {name: v[order] for name, v in merged.items()}
+            self.timestamps = merged_ts
+            self.columns = merged
+        return result
+
+    @traced('ingestion.ingest')
+    def ingest(self, path: str, parse, overlap: pd.Timedelta = OVERLAP_WINDOW) -> IngestResult:
+        """
+        Ingest a file, parsing it only if its content has not been ingested before.
+
+        Only intervals from overlap before the stored maximum onwards are converted, so the cost
+        is proportional to the new data plus the checked overlap.
+
+        Parameters
+        ----------
+        path : str
+            Path of the export file.
+        parse : callable
+            Function parse(path, since) returning the parsed DataFrame for path.
+        overlap : pd.Timedelta, optional
+            Window before the stored maximum that is re-checked for revisions. Default: 2 days.
+
+        Returns
+        -------
+        IngestResult
+            Outcome of the ingestion. The store is saved if it changed.
+        """
+        digest = file_digest(path)
+        if digest in self.sources:
+            return IngestResult(source=path, skipped=True)
+        since = self.max_timestamp - overlap if len(self.timestamps) else None
+        result = self.append(parse(path, since), source=path)
+        self.sources.add(digest)
+        self.save()
+        return result
+
+
+def series_key(path: str) -> str:
+    """
+    Derive the store name for an export file.
+
+    Consumption exports are keyed by installation ('verbrauch_anlage_919667'), price exports by
+    their product code ('EXAAD1P'). Browser duplicate suffixes such as ' (1)' are ignored.
+
+    Parameters
+    ----------
+    path : str
+        Path of the export file.
+
+    Returns
+    -------
+    str
+        Store name for the file's data series.
+    """
+    stem = os.path.splitext(os.path.basename(path))[0]
+    stem = re.sub(r'\s*\(\d+\)$', '', stem)
+    match = re.match(r'verbrauch_anlage_\d+', stem) or re.match(r'[A-Z0-9]+(?=_)', stem)
+    return match.group(0) if match else stem
+
+
+def consumption_store(path: str, store_dir: str = CACHE_DIR) -> IntervalStore:
+    """Open the consumption store for the installation of the given export file."""
+    return IntervalStore(os.path.join(store_dir, f'store_v{STORE_VERSION}_consumption_{series_key(path)}.npz'))
+
+
+def price_store(path: str, store_dir: str = CACHE_DIR) -> IntervalStore:
+    """Open the price store for the market product of the given export file."""
+    return IntervalStore(os.path.join(store_dir, f'store_v{STORE_VERSION}_prices_{series_key(path)}.npz'))
+
+
+def ingest_consumption(store: IntervalStore, path: str) -> IngestResult:
+    """Ingest an ökostrom consumption export into store."""
+    return store.ingest(path, parse_consumption)
+
+
+def ingest_prices(store: IntervalStore, path: str) -> IngestResult:
+    """Ingest an APG price export into store."""
+    return store.ingest(path, parse_prices)
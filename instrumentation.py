@@ -0,0 +1,378 @@
+"""
+Instrumentation module.
+
+Spans measure wall time, CPU time of the running thread and, optionally, the tracemalloc peak of
+one stage of work (parsing, merging, aggregation, drawing). They nest per thread and are collected
+for the whole session, so the GUI can show where the time of a load or an analysis went and the
+spans can be exported as a Chrome trace (chrome://tracing, Perfetto).
+
+Instrumentation is disabled by default. Then span() returns one shared no-op context manager and
+traced functions call straight through, so instrumented code pays a single flag check per call.
+Enable it with enable() or the POWER_TRACE environment variable ('1' for timings, 'memory' to
+also trace allocations, which slows allocation-heavy code down considerably).
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+from collections import deque
+from dataclasses import dataclass, field
+
+# Spans kept per session; older ones are dropped first
+MAX_RECORDS = 100_000
+
+_enabled = False
+_memory = False
+_records: deque = deque(maxlen=MAX_RECORDS)
+_lock = threading.Lock()
+_local = threading.local()
+_origin_ns = time.perf_counter_ns()
+
+
+@dataclass
+class SpanRecord:
+    """
+    One finished span.
+
+    Attributes
+    ----------
+    name : str
+        Stage name, e.g. 'calculator.merge_data'.
+    start_ns : int
+        Start in nanoseconds since the session origin.
+    wall : float
+        Elapsed wall time in seconds.
+    cpu : float
+        CPU time of the span's thread in seconds.
+    memory_peak : int or None
+        Peak of traced memory above the level at the start, in bytes (None without memory tracing).
+    depth : int
+        Nesting level within its thread (0 for outermost spans).
+    thread_id : int
+        Identifier of the thread the span ran on.
+    thread_name : str
+        Name of that thread.
+    args : dict
+        Extra values given to span(), shown in the trace viewer.
+    """
+
+    name: str
+    start_ns: int
+    wall: float
+    cpu: float
+    memory_peak: int | None
+    depth: int
+    thread_id: int
+    thread_name: str
+    args: dict = field(default_factory=dict)
+
+
+@dataclass
+class SpanStats:
+    """
+    Totals of all spans with one name.
+
+    Attributes
+    ----------
+    name : str
+        Stage name.
+    count : int
+        Number of spans.
+    wall, cpu : float
+        Summed wall and CPU time in seconds.
+    self_wall : float
+        Summed wall time not spent in nested spans, in seconds.
+    wall_max : float
+        Longest single span in seconds.
+    memory_peak : int or None
+        Largest memory peak in bytes (None without memory tracing).
+    """
+
+    name: str
+    count: int
+    wall: float
+    cpu: float
+    self_wall: float
+    wall_max: float
+    memory_peak: int | None
+
+    @property
+    def wall_mean(self) -> float:
+        """Mean wall time per span in seconds."""
+        return self.wall / self.count if self.count else 0.0
+
+
+class _NullSpan:
+    """Span used while instrumentation is disabled."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    """Active span; records a SpanRecord on exit."""
+
+    __slots__ = ('name', 'args', 'memory', '_start_ns', '_start_cpu', '_start_memory', '_peak', '_depth')
+
+    def __init__(self, name: str, args: dict):
+        self.name = name
+        self.args = args
+        self.memory = _memory and tracemalloc.is_tracing()
+
+    def __enter__(self):
+        stack = getattr(_local, 'stack', None)
+        if stack is None:
+            stack = _local.stack = []
+        if self.memory:
+            current, peak = tracemalloc.get_traced_memory()
+            # The peak counter is global: fold the parent's peak so far into it before resetting
+            if stack and stack[-1].memory:
+                stack[-1]._peak = max(stack[-1]._peak, peak)
+            tracemalloc.reset_peak()
+            self._start_memory = self._peak = current
+        self._depth = len(stack)
+        stack.append(self)
+        self._start_cpu = time.thread_time()
+        self._start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end_ns = time.perf_counter_ns()
+        cpu = time.thread_time() - self._start_cpu
+        stack = _local.stack
+        stack.pop()
+        memory_peak = None
+        if self.memory:
+            peak = max(self._peak, tracemalloc.get_traced_memory()[1])
+            memory_peak = max(peak - self._start_memory, 0)
+            if stack and stack[-1].memory:
+                stack[-1]._peak = max(stack[-1]._peak, peak)
+        thread = threading.current_thread()
+        record = SpanRecord(
+            name=self.name,
+            start_ns=self._start_ns - _origin_ns,
+            wall=(end_ns - self._start_ns) / 1e9,
+            cpu=cpu,
+            memory_peak=memory_peak,
+            depth=self._depth,
+            thread_id=thread.ident,
+            thread_name=thread.name,
+            args=self.args,
+        )
+        with _lock:
+            _records.append(record)
+        return False
+
+
+def span(name: str, **args):
+    """
+    Context manager measuring one stage.
+
+    Parameters
+    ----------
+    name : str
+        Stage name; dotted prefixes ('calculator.', 'plot.') group stages in the trace viewer.
+    **args
+        Extra values recorded with the span, e.g. row counts.
+
+    Returns
+    -------
+    context manager
+        A no-op while instrumentation is disabled.
+    """
+    if not _enabled:
+        return _NULL_SPAN
+    return _Span(name, args)
+
+
+def traced(name: str | None = None):
+    """
+    Decorator running every call of a function in a span.
+
+    Parameters
+    ----------
+    name : str, optional
+        Stage name. Default: the function's qualified name.
+    """
+    def decorate(fn):
+        span_name = name or fn.__qualname__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            with _Span(span_name, {}):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def trace_canvas(canvas, name: str):
+    """
+    Run every full redraw of a matplotlib canvas in a span.
+
+    Wraps the canvas' draw() on the instance, so deferred draw_idle() renders are measured too.
+
+    Parameters
+    ----------
+    canvas : FigureCanvasBase
+        Canvas to instrument.
+    name : str
+        Stage name of its draws, e.g. 'draw.profile'.
+    """
+    canvas.draw = traced(name)(canvas.draw)
+
+
+def enable(memory: bool = False):
+    """
+    Start recording spans.
+
+    Parameters
+    ----------
+    memory : bool, optional
+        Also record tracemalloc peaks (starts tracemalloc if needed). Default: False.
+    """
+    global _enabled, _memory
+    if memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    elif not memory and _memory and tracemalloc.is_tracing():
+        tracemalloc.stop()
+    _memory = memory
+    _enabled = True
+
+
+def disable():
+    """Stop recording spans; recorded spans are kept."""
+    global _enabled, _memory
+    if _memory and tracemalloc.is_tracing():
+        tracemalloc.stop()
+    _enabled = False
+    _memory = False
+
+
+def is_enabled() -> bool:
+    """True while spans are recorded."""
+    return _enabled
+
+
+def memory_enabled() -> bool:
+    """True while memory peaks are recorded."""
+    return _enabled and _memory
+
+
+def clear():
+    """Forget all recorded spans and restart the session clock."""
+    global _origin_ns
+    with _lock:
+        _records.clear()
+        _origin_ns = time.perf_counter_ns()
+
+
+def records() -> list[SpanRecord]:
+    """Return the recorded spans in order of completion."""
+    with _lock:
+        return list(_records)
+
+
+def summary() -> list[SpanStats]:
+    """
+    Return the recorded spans totalled by name.
+
+    Returns
+    -------
+    list of SpanStats
+        One entry per name, by total wall time, longest first.
+    """
+    stats: dict[str, SpanStats] = {}
+    # Spans finish after their children: wall time of finished children per thread and depth
+    children: dict[int, dict[int, float]] = {}
+    for record in records():
+        nested = children.setdefault(record.thread_id, {})
+        child_wall = nested.pop(record.depth + 1, 0.0)
+        nested[record.depth] = nested.get(record.depth, 0.0) + record.wall
+
+        entry = stats.get(record.name)
+        if entry is None:
+            entry = stats[record.name] = SpanStats(record.name, 0, 0.0, 0.0, 0.0, 0.0, None)
+        entry.count += 1
+        entry.wall += record.wall
+        entry.cpu += record.cpu
+        entry.self_wall += max(record.wall - child_wall, 0.0)
+        entry.wall_max = max(entry.wall_max, record.wall)
+        if record.memory_peak is not None:
+            entry.memory_peak = max(entry.memory_peak or 0, record.memory_peak)
+    return sorted(stats.values(), key=lambda entry: entry.wall, reverse=True)
+
+
+def summary_text(top: int = 3) -> str:
+    """
+    Return a one-line session summary for a status bar.
+
+    Outermost spans give the session's busy time; the stages listed are those with the most
+    time of their own (outside nested spans), as they say where that time went.
+
+    Parameters
+    ----------
+    top : int, optional
+        Number of stages listed. Default: 3.
+    """
+    spans = records()
+    if not spans:
+        return 'Instrumentation: no spans recorded'
+    busy = sum(record.wall for record in spans if record.depth == 0)
+    cpu = sum(record.cpu for record in spans if record.depth == 0)
+    stages = sorted(summary(), key=lambda entry: entry.self_wall, reverse=True)
+    listed = ', '.join(f'{entry.name} {entry.self_wall:.2f} s' for entry in stages[:top])
+    return f'Session: {busy:.2f} s wall, {cpu:.2f} s CPU in {len(spans)} spans | top: {listed}'
+
+
+def chrome_trace() -> dict:
+    """
+    Return the recorded spans in Chrome trace event format.
+
+    Every span is a complete ('X') event with microsecond timestamps; CPU time and memory peak
+    are attached as arguments, and thread names as metadata events.
+    """
+    pid = os.getpid()
+    events = []
+    threads = {}
+    for record in records():
+        threads[record.thread_id] = record.thread_name
+        args = {'cpu_ms': round(record.cpu * 1e3, 3), **{k: str(v) for k, v in record.args.items()}}
+        if record.memory_peak is not None:
+            args['memory_peak_kb'] = round(record.memory_peak / 1024, 1)
+        events.append({
+            'name': record.name,
+            'cat': record.name.split('.', 1)[0],
+            'ph': 'X',
+            'ts': record.start_ns / 1e3,
+            'dur': record.wall * 1e6,
+            'pid': pid,
+            'tid': record.thread_id,
+            'args': args,
+        })
+    events.extend({'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid, 'args': {'name': name}}
+                  for tid, name in threads.items())
+    return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+
+def export_chrome_trace(path: str):
+    """Write the recorded spans as a Chrome trace JSON file (see chrome_trace())."""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(chrome_trace(), f)
+
+
+# POWER_TRACE=1 records timings from the start, POWER_TRACE=memory also memory peaks
+if os.environ.get('POWER_TRACE', '').strip().lower() not in ('', '0', 'false', 'no', 'off'):
+    enable(memory=os.environ['POWER_TRACE'].strip().lower() == 'memory')
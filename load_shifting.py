@@ -0,0 +1,217 @@
+"""
+Load-shifting simulator.
+
+Estimates the savings of moving flexible load (heat pump, EV, dishwasher) from expensive into
+cheap quarter-hours of the same day. Within one day, the optimal reallocation of a shiftable
+energy budget is greedy: the most expensive consumption moves to the cheapest allowed intervals
+while the price difference stays positive. With sources sorted by falling and targets by rising
+price, the moved energy is a walk along two cumulative capacity curves, so every day is solved
+by sorting, cumulative sums and one searchsorted - for all days at once on a (days x slots)
+matrix.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from merge_engine import INTERVAL, wall_time
+from tariff import TimeWindow, calendar_fields
+
+INTERVAL_HOURS = INTERVAL / pd.Timedelta(hours=1)
+
+
+@dataclass
+class ShiftResult:
+    """
+    Outcome of a load-shifting simulation.
+
+    Attributes
+    ----------
+    days : np.ndarray
+        Local calendar days (datetime64[D]).
+    daily_shifted, daily_savings : np.ndarray
+        Energy moved in kWh and money saved in EUR per day.
+    months : pd.PeriodIndex
+        Months covered, in order.
+    monthly_shifted, monthly_savings : np.ndarray
+        Energy moved in kWh and money saved in EUR per month.
+    monthly_cost : np.ndarray
+        Cost per month without shifting in EUR (all tariff components).
+    """
+
+    days: np.ndarray
+    daily_shifted: np.ndarray
+    daily_savings: np.ndarray
+    months: pd.PeriodIndex
+    monthly_shifted: np.ndarray
+    monthly_savings: np.ndarray
+    monthly_cost: np.ndarray
+
+    @property
+    def total_savings(self) -> float:
+        """Savings over all days in EUR."""
+        return float(self.daily_savings.sum())
+
+    def monthly_frame(self) -> pd.DataFrame:
+        """
+        Return the monthly results as a DataFrame indexed by month.
+
+        Returns
+        -------
+        pd.DataFrame
+            Columns shifted (kWh), savings, cost_before and cost_after (EUR).
+        """
+        return pd.DataFrame({
+            'shifted': self.monthly_shifted,
+            'savings': self.monthly_savings,
+            'cost_before': self.monthly_cost,
+            'cost_after': self.monthly_cost - self.monthly_savings,
+        }, index=self.months)
+
+
+class LoadShiftSimulator:
+    """
+    Same-day load shifting on the merged data of a PowerCostCalculator.
+
+    The per-day price and consumption matrices and their sort orders are built once; each
+    simulate() call only applies the budget and constraints, so parameters can be changed
+    interactively.
+
+    Parameters
+    ----------
+    calculator : PowerCostCalculator
+        Calculator whose merged data and tariff give consumption and the price per kWh
+        (market price times the tariff's market factor plus its energy charges).
+    start : datetime-like, optional
+        Start of the window (inclusive). Default: first interval.
+    end : datetime-like, optional
+        End of the window (exclusive). Default: after the last interval.
+    """
+
+    def __init__(self, calculator, start=None, end=None):
+        """
+        Initialize a LoadShiftSimulator.
+
+        See class docstring for parameter details.
+        """
+        result = calculator.compute(start, end)
+        compiled = calculator.compiled_tariff()
+        lo, hi = calculator.time_index.row_range(start, end)
+        df = calculator.merged_df.iloc[lo:hi]
+        wall = wall_time(df[calculator.timestamp_col])
+        price = df[calculator.price_col].to_numpy(dtype='float64')
+        rate = compiled.market_factor * price / 1000 + compiled.energy_rate[lo:hi]  # EUR/kWh
+        consumption = result.consumption
+        self.monthly_cost = result.monthly_total
+        self.months = result.months
+
+        # Position of every interval in a (days x slots) matrix; DST days have 92 or 100 slots
+        days = wall.astype('datetime64[D]')
+        n = len(days)
+        if n:
+            new_day = np.concatenate(([True], days[1:] != days[:-1]))
+            day_id = np.cumsum(new_day) - 1
+            day_start = np.flatnonzero(new_day)
+            pos = np.arange(n) - day_start[day_id]
+            self.days = days[day_start]
+            n_slots = int(pos.max()) + 1
+        else:
+            day_id = pos = np.empty(0, dtype='int64')
+            self.days = np.empty(0, dtype='datetime64[D]')
+            n_slots = 0
+        n_days = len(self.days)
+        self._day_id, self._pos = day_id, pos
+        self._calendar = calendar_fields(wall)
+        self._day_month = np.searchsorted(
+            self.months.to_timestamp().to_numpy().astype('datetime64[M]'),
+            self.days.astype('datetime64[M]'))
+
+        rate_matrix = np.full((n_days, n_slots), np.nan)
+        rate_matrix[day_id, pos] = rate
+        consumption_matrix = np.zeros((n_days, n_slots))
+        consumption_matrix[day_id, pos] = np.maximum(consumption, 0)
+
+        # Sources by falling, targets by rising rate; padding sorts last in both
+        self._source_order = np.argsort(np.where(np.isnan(rate_matrix), np.inf, -rate_matrix),
+                                        axis=1, kind='stable')
+        self._target_order = np.argsort(np.where(np.isnan(rate_matrix), np.inf, rate_matrix),
+                                        axis=1, kind='stable')
+        rows = np.arange(n_days)[:, None]
+        self._source_rate = rate_matrix[rows, self._source_order]
+        self._target_rate = rate_matrix[rows, self._target_order]
+        self._source_capacity = np.cumsum(consumption_matrix[rows, self._source_order], axis=1)
+
+    def simulate(self, daily_budget_kwh: float, max_kw: float,
+                 windows: tuple[TimeWindow, ...] = ()) -> ShiftResult:
+        """
+        Move up to daily_budget_kwh per day into the cheapest allowed intervals of the same day.
+
+        Parameters
+        ----------
+        daily_budget_kwh : float
+            Shiftable energy per day in kWh.
+        max_kw : float
+            Maximum extra power of the shifted load in any interval in kW.
+        windows : tuple of TimeWindow, optional
+            Local clock windows the load may be moved into. Default: any time of day.
+
+        Returns
+        -------
+        ShiftResult
+            Energy moved and savings per day and month.
+
+        Raises
+        ------
+        ValueError
+            If the budget is negative or max_kw is not positive.
+        """
+        if daily_budget_kwh < 0 or max_kw <= 0:
+            raise ValueError("daily_budget_kwh must be >= 0 and max_kw > 0")
+        n_days, n_slots = self._source_rate.shape
+        rows = np.arange(n_days)[:, None]
+
+        # Extra energy each interval can take
+        allowed = np.ones(len(self._pos), dtype=bool)
+        if windows:
+            allowed[:] = False
+            for window in windows:
+                allowed |= window.mask(*self._calendar)
+        target_matrix = np.zeros((n_days, n_slots))
+        target_matrix[self._day_id, self._pos] = np.where(allowed, max_kw * INTERVAL_HOURS, 0.0)
+        target_capacity = np.cumsum(target_matrix[rows, self._target_order], axis=1)
+
+        # Segments between all capacity breakpoints, cut at the budget
+        bounds = np.sort(np.hstack((self._source_capacity, target_capacity)), axis=1)
+        bounds = np.minimum(np.hstack((np.zeros((n_days, 1)), bounds)), daily_budget_kwh)
+        length = np.diff(bounds, axis=1)
+        middle = (bounds[:, :-1] + bounds[:, 1:]) / 2
+
+        # Per-row searchsorted as one global search over row-offset capacities
+        span = max(float(self._source_capacity.max(initial=0)), float(target_capacity.max(initial=0)),
+                   daily_budget_kwh) + 1
+        offset = np.arange(n_days)[:, None] * span
+        source = np.searchsorted((self._source_capacity + offset).ravel(), (middle + offset).ravel())
+        target = np.searchsorted((target_capacity + offset).ravel(), (middle + offset).ravel())
+        source = source.reshape(middle.shape) - rows * n_slots
+        target = target.reshape(middle.shape) - rows * n_slots
+
+        # Segments beyond either capacity, or without a price gain, move nothing
+        valid = (source < n_slots) & (target < n_slots) & (length > 0)
+        gain = np.zeros(middle.shape)
+        gain[valid] = (self._source_rate[rows, np.minimum(source, n_slots - 1)]
+                       - self._target_rate[rows, np.minimum(target, n_slots - 1)])[valid]
+        moved = np.where(valid & (gain > 0), length, 0.0)
+        daily_shifted = moved.sum(axis=1)
+        daily_savings = (moved * gain).sum(axis=1)
+
+        n_months = len(self.months)
+        return ShiftResult(
+            days=self.days,
+            daily_shifted=daily_shifted,
+            daily_savings=daily_savings,
+            months=self.months,
+            monthly_shifted=np.bincount(self._day_month, weights=daily_shifted, minlength=n_months),
+            monthly_savings=np.bincount(self._day_month, weights=daily_savings, minlength=n_months),
+            monthly_cost=self.monthly_cost,
+        )
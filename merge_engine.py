@@ -0,0 +1,290 @@
+"""
+Merge engine module.
+
+Aligns market prices to consumption intervals over sorted int64 epoch arrays. Consumption
+timestamps are snapped to the 15-minute grid, each interval takes the price whose period covers
+it (so hourly prices are broadcast to their four quarter-hours, also in series that switch between
+hourly and 15-minute prices), and intervals without a covering price are forward- or
+backward-filled or dropped. Match, fill and drop counts are reported like
+the web app's mergeData.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+INTERVAL = pd.Timedelta(minutes=15)
+
+# Longest period a single price covers (hourly day-ahead prices)
+MAX_PRICE_PERIOD = pd.Timedelta(hours=1)
+
+FILL_METHODS = ('forward', 'backward', None)
+
+
+@dataclass
+class MergeStats:
+    """
+    Counts reported by a merge.
+
+    Attributes
+    ----------
+    consumption_records : int
+        Number of consumption intervals considered.
+    price_records : int
+        Number of price intervals with a valid price.
+    exact : int
+        Intervals covered by a price period.
+    filled : int
+        Intervals that took a forward- or backward-filled price.
+    dropped : int
+        Intervals without any usable price.
+    """
+
+    consumption_records: int = 0
+    price_records: int = 0
+    exact: int = 0
+    filled: int = 0
+    dropped: int = 0
+
+    @property
+    def merged(self) -> int:
+        """Number of intervals in the merged result."""
+        return self.exact + self.filled
+
+
+@dataclass
+class Alignment:
+    """
+    Result of aligning prices to consumption intervals.
+
+    Attributes
+    ----------
+    rows : np.ndarray
+        Indices of the kept consumption intervals, in time order.
+    price : np.ndarray
+        Price of each kept interval (float64, aligned with rows).
+    filled : np.ndarray
+        True where the price was filled rather than covered by a price period.
+    stats : MergeStats
+        Match, fill and drop counts.
+    """
+
+    rows: np.ndarray
+    price: np.ndarray
+    filled: np.ndarray
+    stats: MergeStats
+
+
+def to_epoch_ns(values) -> np.ndarray:
+    """
+    Convert datetime-like values to an int64 array of UTC nanoseconds since epoch.
+
+    Parameters
+    ----------
+    values : array-like
+        Datetime values (Series, DatetimeIndex or datetime64 array). Timezone-aware values are
+        converted by instant, naive values are taken as UTC.
+
+    Returns
+    -------
+    np.ndarray
+        int64 epoch nanoseconds; NaT becomes the minimum int64.
+    """
+    return pd.DatetimeIndex(pd.to_datetime(values)).as_unit('ns').asi8
+
+
+def wall_time(values) -> np.ndarray:
+    """
+    Return the local wall time of datetime-like values as naive datetime64[ns].
+
+    Used for calendar grouping (days, months) of timezone-aware data; naive values are returned
+    unchanged.
+    """
+    index = pd.DatetimeIndex(pd.to_datetime(values))
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    return index.as_unit('ns').to_numpy()
+
+
+def snap(epoch_ns: np.ndarray, interval: pd.Timedelta = INTERVAL) -> np.ndarray:
+    """Round epoch nanoseconds to the nearest multiple of interval."""
+    step = interval.value
+    return (epoch_ns + step // 2) // step * step
+
+
+def price_periods(
+    price_ns: np.ndarray,
+    default: pd.Timedelta = INTERVAL,
+    max_period: pd.Timedelta = MAX_PRICE_PERIOD,
+) -> np.ndarray:
+    """
+    Infer the period length of every price of a sorted price series in nanoseconds.
+
+    Each price lasts until the next one starts, at most max_period, so a series may switch between
+    hourly and 15-minute prices and a gap is not covered for more than one period. The last price
+    keeps the period of the one before it.
+
+    Parameters
+    ----------
+    price_ns : np.ndarray
+        Sorted price period starts as int64 epoch nanoseconds.
+    default : pd.Timedelta, optional
+        Period of a single price. Default: 15 minutes.
+    max_period : pd.Timedelta, optional
+        Longest period of one price. Default: 1 hour.
+
+    Returns
+    -------
+    np.ndarray
+        int64 period lengths aligned with price_ns.
+    """
+    if len(price_ns) < 2:
+        return np.full(len(price_ns), default.value, dtype='int64')
+    gaps = np.diff(price_ns)
+    return np.minimum(np.append(gaps, gaps[-1]), max_period.value)
+
+
+def align(
+    consumption_ns: np.ndarray,
+    price_ns: np.ndarray,
+    prices: np.ndarray,
+    fill: str | None = 'forward',
+    fill_limit: pd.Timedelta | None = None,
+    interval: pd.Timedelta = INTERVAL,
+) -> Alignment:
+    """
+    Align a price series to consumption intervals.
+
+    Both timestamp arrays are expected sorted (they are sorted here if not). Each snapped
+    consumption interval is matched with np.searchsorted to the last price starting at or before
+    it; it is covered if it lies within that price's period (see price_periods()). Uncovered intervals are filled
+    according to `fill`, or dropped.
+
+    Parameters
+    ----------
+    consumption_ns : np.ndarray
+        Consumption interval starts as int64 epoch nanoseconds.
+    price_ns : np.ndarray
+        Price period starts as int64 epoch nanoseconds.
+    prices : np.ndarray
+        Prices aligned with price_ns; NaN entries are ignored.
+    fill : {'forward', 'backward', None}, optional
+        Use the last earlier or the next later price for uncovered intervals, or drop them.
+        Default: 'forward'.
+    fill_limit : pd.Timedelta, optional
+        Maximum distance to a fill price. Default: unlimited.
+    interval : pd.Timedelta, optional
+        Consumption grid used for snapping. Default: 15 minutes.
+
+    Returns
+    -------
+    Alignment
+        Kept consumption rows, their prices, fill flags and merge statistics.
+
+    Raises
+    ------
+    ValueError
+        If fill is not one of FILL_METHODS.
+    """
+    if fill not in FILL_METHODS:
+        raise ValueError(f"fill must be one of {FILL_METHODS}, got {fill!r}")
+    consumption_ns = np.asarray(consumption_ns, dtype='int64')
+    price_ns = np.asarray(price_ns, dtype='int64')
+    prices = np.asarray(prices, dtype='float64')
+
+    valid = ~np.isnan(prices)
+    price_ns, prices = price_ns[valid], prices[valid]
+    if len(price_ns) and np.any(price_ns[1:] < price_ns[:-1]):
+        order = np.argsort(price_ns, kind='stable')
+        price_ns, prices = price_ns[order], prices[order]
+
+    rows = np.arange(len(consumption_ns))
+    if len(consumption_ns) and np.any(consumption_ns[1:] < consumption_ns[:-1]):
+        rows = np.argsort(consumption_ns, kind='stable')
+    t = snap(consumption_ns[rows], interval)
+
+    stats = MergeStats(consumption_records=len(t), price_records=len(price_ns))
+    if len(price_ns) == 0:
+        stats.dropped = len(t)
+        empty = np.empty(0, dtype='int64')
+        return Alignment(empty, np.empty(0), np.empty(0, dtype=bool), stats)
+
+    # Last price period starting at or before each interval
+    idx = np.searchsorted(price_ns, t, side='right') - 1
+    has_prev = idx >= 0
+    prev = np.maximum(idx, 0)
+    covered = has_prev & (t - price_ns[prev] < price_periods(price_ns)[prev])
+
+    source = np.where(covered, prev, -1)
+    if fill == 'forward':
+        distance = t - price_ns[prev]
+        usable = ~covered & has_prev
+        if fill_limit is not None:
+            usable &= distance <= fill_limit.value
+        source = np.where(usable, prev, source)
+    elif fill == 'backward':
+        nxt = np.minimum(idx + 1, len(price_ns) - 1)
+        distance = price_ns[nxt] - t
+        usable = ~covered & (idx + 1 < len(price_ns))
+        if fill_limit is not None:
+            usable &= distance <= fill_limit.value
+        source = np.where(usable, nxt, source)
+
+    keep = source >= 0
+    stats.exact = int(covered.sum())
+    stats.filled = int(keep.sum()) - stats.exact
+    stats.dropped = len(t) - int(keep.sum())
+    return Alignment(
+        rows=rows[keep],
+        price=prices[source[keep]],
+        filled=~covered[keep],
+        stats=stats,
+    )
+
+
+def merge_prices(
+    consumption_df: pd.DataFrame,
+    price_df: pd.DataFrame,
+    price_col: str,
+    timestamp_col: str = 'timestamp',
+    fill: str | None = 'forward',
+    fill_limit: pd.Timedelta | None = None,
+) -> tuple[pd.DataFrame, MergeStats]:
+    """
+    Merge a price column onto consumption intervals with align().
+
+    Parameters
+    ----------
+    consumption_df : pd.DataFrame
+        Consumption data with timestamp column.
+    price_df : pd.DataFrame
+        Price data with timestamp column and price_col.
+    price_col : str
+        Name of the price column (EUR/MWh).
+    timestamp_col : str, optional
+        Name of the timestamp column in both frames. Default: 'timestamp'.
+    fill : {'forward', 'backward', None}, optional
+        Fill method for intervals without a covering price. Default: 'forward'.
+    fill_limit : pd.Timedelta, optional
+        Maximum distance to a fill price. Default: unlimited.
+
+    Returns
+    -------
+    tuple of (pd.DataFrame, MergeStats)
+        Time-sorted consumption rows with price_col and a boolean 'price_filled' column, and the
+        merge statistics.
+    """
+    alignment = align(
+        to_epoch_ns(consumption_df[timestamp_col]),
+        to_epoch_ns(price_df[timestamp_col]),
+        price_df[price_col].to_numpy(dtype='float64'),
+        fill=fill,
+        fill_limit=fill_limit,
+    )
+    merged = consumption_df.iloc[alignment.rows].reset_index(drop=True)
+    if not pd.api.types.is_datetime64_any_dtype(merged[timestamp_col]):
+        merged[timestamp_col] = pd.to_datetime(merged[timestamp_col])
+    merged[price_col] = alignment.price
+    merged['price_filled'] = alignment.filled
+    return merged, alignment.stats
@@ -3,10 +3,14 @@ const state = {
   consumptionData: [],
   priceData: [],
   mergedData: [],
+  // Per-day sums of mergedData, built once per merge (see buildDailyRollup)
+  rollup: [],
   startDate: null,
   endDate: null,
   minDate: null,
   maxDate: null,
+  // true while results come from the Python analysis service instead of browser-side parsing
+  service: false,
   charts: {
     consumption: null,
     monthlyCost: null
@@ -198,8 +202,11 @@ function parseGermanDateTime(dateStr) {
   const minute = parseInt(timeParts[1]);
   const second = parseInt(timeParts[2] || 0);
 
-  // Get Vienna timezone offset for this specific date/time
-  const viennaOffsetHours = getViennaOffset(year, month, day, hour);
+  // Get Vienna timezone offset for this specific date/time.
+  // APG marks the repeated autumn hour as "2A" (CEST) and "2B" (CET).
+  const viennaOffsetHours = /B$/.test(timeParts[0])
+    ? 1
+    : getViennaOffset(year, month + 1, day, hour); // getViennaOffset expects months 1-12
 
   // Create date in Vienna time, then convert to UTC
   // Vienna time = UTC + offset
@@ -317,6 +324,38 @@ function processPriceData(rawData) {
   return processed;
 }
 
+// Binary search: index of the last element in sorted `arr` that is <= value (-1 if none)
+function lastIndexAtOrBefore(arr, value) {
+  let lo = 0;
+  let hi = arr.length;
+  while (lo < hi) {
+    const mid = (lo + hi) >>> 1;
+    if (arr[mid] <= value) {
+      lo = mid + 1;
+    } else {
+      hi = mid;
+    }
+  }
+  return lo - 1;
+}
+
+// Period of each price: until the next price starts, at most one hour, so files may switch
+// between hourly and 15-minute prices. The last price keeps the period of the one before it.
+function inferPeriods(sortedTs, fallback) {
+  const ONE_HOUR = 60 * 60 * 1000;
+  const periods = new Array(sortedTs.length).fill(fallback);
+  for (let i = 0; i + 1 < sortedTs.length; i++) {
+    periods[i] = Math.min(sortedTs[i + 1] - sortedTs[i], ONE_HOUR);
+  }
+  if (sortedTs.length > 1) {
+    periods[sortedTs.length - 1] = periods[sortedTs.length - 2];
+  }
+  return periods;
+}
+
+// Same algorithm as merge_engine.align in the Python tools: snap consumption to the
+// 15-minute grid, take the price whose period covers it (hourly prices are broadcast to
+// their quarter-hours) and forward-fill from the last earlier price otherwise.
 function mergeData(consumption, prices) {
   const FIFTEEN_MINUTES = 15 * 60 * 1000; // 900000 ms
 
@@ -340,46 +379,40 @@ function mergeData(consumption, prices) {
     console.log('Time difference:', Math.abs(c.date.getTime() - p.date.getTime()) / 1000, 'seconds');
   }
 
-  // Sort both datasets by timestamp
+  // Sort both datasets by timestamp, ignoring prices that are not yet published
   const sortedConsumption = [...consumption].sort((a, b) => a.date.getTime() - b.date.getTime());
-  const sortedPrices = [...prices].sort((a, b) => a.date.getTime() - b.date.getTime());
-
-  // Create a map of price data by rounded timestamp
-  const priceMap = new Map();
-  for (let price of sortedPrices) {
-    const roundedTs = Math.round(price.date.getTime() / FIFTEEN_MINUTES) * FIFTEEN_MINUTES;
-    priceMap.set(roundedTs, price.price);
-  }
+  const sortedPrices = prices
+    .filter(p => p.price !== null && p.price !== undefined && !isNaN(p.price))
+    .sort((a, b) => a.date.getTime() - b.date.getTime());
 
-  // Get last known price for forward filling
-  const lastKnownPrice = sortedPrices.length > 0
-    ? sortedPrices[sortedPrices.length - 1].price
-    : null;
+  const priceTs = sortedPrices.map(p => p.date.getTime());
+  const periods = inferPeriods(priceTs, FIFTEEN_MINUTES);
 
   let exactMatches = 0;
   let forwardFilledCount = 0;
   let droppedCount = 0;
+  let lastKnownPrice = null;
 
   // Process each consumption record
   const merged = [];
   for (let c of sortedConsumption) {
     const roundedTs = Math.round(c.date.getTime() / FIFTEEN_MINUTES) * FIFTEEN_MINUTES;
-    let matchedPrice = priceMap.get(roundedTs);
-    let priceSource = 'exact';
+    const idx = lastIndexAtOrBefore(priceTs, roundedTs);
 
-    // If no exact match, use last known price
-    if (matchedPrice === undefined) {
-      if (lastKnownPrice !== null) {
-        matchedPrice = lastKnownPrice;
-        priceSource = 'forward-filled';
-        forwardFilledCount++;
-      } else {
-        // No price available at all - skip this record
-        droppedCount++;
-        continue;
-      }
-    } else {
+    if (idx < 0) {
+      // No earlier price available - skip this record
+      droppedCount++;
+      continue;
+    }
+
+    const matchedPrice = sortedPrices[idx].price;
+    let priceSource = 'exact';
+    if (roundedTs - priceTs[idx] < periods[idx]) {
       exactMatches++;
+    } else {
+      priceSource = 'forward-filled';
+      forwardFilledCount++;
+      lastKnownPrice = matchedPrice;
     }
 
     const marketCost = c.consumption * (matchedPrice / 1000);
@@ -470,27 +503,65 @@ function groupByTime(data) {
   return grouped;
 }
 
-function aggregateByMonth(mergedData) {
+/**
+ * Sum consumption, market cost and record counts per local day, once per merge.
+ * Each day remembers its row range in mergedData for windows that start or end within it.
+ */
+function buildDailyRollup(mergedData) {
+  const days = [];
+  let current = null;
+
+  mergedData.forEach((record, index) => {
+    const year = record.date.getFullYear();
+    const month = record.date.getMonth();
+    const day = record.date.getDate();
+    if (!current || current.year !== year || current.month !== month || current.dayOfMonth !== day) {
+      current = {
+        year: year,
+        month: month,
+        dayOfMonth: day,
+        monthKey: `${year}-${String(month + 1).padStart(2, '0')}`,
+        start: new Date(year, month, day),
+        end: new Date(year, month, day + 1),
+        first: index,
+        last: index,
+        consumption: 0,
+        marketCost: 0,
+        recordCount: 0,
+        forwardFilledCount: 0
+      };
+      days.push(current);
+    }
+    current.last = index;
+    current.consumption += record.consumption;
+    current.marketCost += record.consumption * (record.price / 1000);
+    current.recordCount += 1;
+    if (record.priceSource === 'forward-filled') {
+      current.forwardFilledCount += 1;
+    }
+  });
+
+  console.log('Daily rollup:', days.length, 'days from', mergedData.length, 'records');
+  return days;
+}
+
+function aggregateByMonth(rollup) {
   console.log('=== MONTHLY AGGREGATION START ===');
-  console.log('Processing', mergedData.length, 'records');
+  console.log('Processing', rollup.length, 'days');
   console.log('Grid fees:', `Base=${gridConfig.baseFee} €/month, Work=${gridConfig.workFee} €/kWh`);
 
-  if (!mergedData || mergedData.length === 0) {
+  if (!rollup || rollup.length === 0) {
     console.warn('No merged data to aggregate');
     return [];
   }
 
   const monthlyData = {};
 
-  for (let record of mergedData) {
-    // Create YYYY-MM key
-    const year = record.date.getFullYear();
-    const month = String(record.date.getMonth() + 1).padStart(2, '0');
-    const monthKey = `${year}-${month}`;
-
-    if (!monthlyData[monthKey]) {
-      monthlyData[monthKey] = {
-        month: monthKey,
+  // Fees are linear in consumption, so they are applied to the day sums
+  for (let day of rollup) {
+    if (!monthlyData[day.monthKey]) {
+      monthlyData[day.monthKey] = {
+        month: day.monthKey,
         consumption: 0,
         marketCost: 0,
         variableFee: 0,
@@ -500,20 +571,13 @@ function aggregateByMonth(mergedData) {
       };
     }
 
-    // Calculate costs
-    const marketCost = record.consumption * (record.price / 1000);
-    const variableFee = record.consumption * VARIABLE_FEE_PER_KWH;
-    const gridWorkCost = record.consumption * gridConfig.workFee;
-
-    monthlyData[monthKey].consumption += record.consumption;
-    monthlyData[monthKey].marketCost += marketCost;
-    monthlyData[monthKey].variableFee += variableFee;
-    monthlyData[monthKey].gridWorkCost += gridWorkCost;
-    monthlyData[monthKey].recordCount += 1;
-
-    if (record.priceSource === 'forward-filled') {
-      monthlyData[monthKey].forwardFilledCount += 1;
-    }
+    const data = monthlyData[day.monthKey];
+    data.consumption += day.consumption;
+    data.marketCost += day.marketCost;
+    data.variableFee += day.consumption * VARIABLE_FEE_PER_KWH;
+    data.gridWorkCost += day.consumption * gridConfig.workFee;
+    data.recordCount += day.recordCount;
+    data.forwardFilledCount += day.forwardFilledCount;
   }
 
   // Convert to sorted array
@@ -551,8 +615,41 @@ function aggregateByMonth(mergedData) {
   return result;
 }
 
-function calculateStatistics(data) {
-  if (!data || data.length === 0) {
+/**
+ * Totals of the records between startDate and endDate (inclusive): whole days come from the
+ * daily rollup, only days cut by a range boundary are summed from their records.
+ */
+function rangeTotals(rollup, mergedData, startDate, endDate) {
+  const totals = { consumption: 0, marketCost: 0, recordCount: 0, firstDate: null, lastDate: null };
+
+  for (let day of rollup) {
+    if (day.end <= startDate || day.start > endDate) {
+      continue;
+    }
+    if (day.start >= startDate && day.end - 1 <= endDate) {
+      totals.consumption += day.consumption;
+      totals.marketCost += day.marketCost;
+      totals.recordCount += day.recordCount;
+      totals.firstDate = totals.firstDate || day.start;
+      totals.lastDate = day.start;
+      continue;
+    }
+    for (let i = day.first; i <= day.last; i++) {
+      const record = mergedData[i];
+      if (record.date >= startDate && record.date <= endDate) {
+        totals.consumption += record.consumption;
+        totals.marketCost += record.consumption * (record.price / 1000);
+        totals.recordCount += 1;
+        totals.firstDate = totals.firstDate || record.date;
+        totals.lastDate = record.date;
+      }
+    }
+  }
+  return totals;
+}
+
+function calculateStatistics(totals) {
+  if (!totals || totals.recordCount === 0) {
     return {
       totalConsumption: 0,
       totalCost: 0,
@@ -562,15 +659,14 @@ function calculateStatistics(data) {
     };
   }
 
-  const totalConsumption = data.reduce((sum, row) => sum + row.consumption, 0);
-  const totalMarketCost = data.reduce((sum, row) => sum + (row.consumption * (row.price / 1000)), 0);
+  const totalConsumption = totals.consumption;
+  const totalMarketCost = totals.marketCost;
   const totalVariableFee = totalConsumption * VARIABLE_FEE_PER_KWH;
   const totalGridWorkCost = totalConsumption * gridConfig.workFee;
 
   // Calculate number of months in the date range
-  const dates = data.map(d => d.date);
-  const minDate = new Date(Math.min(...dates));
-  const maxDate = new Date(Math.max(...dates));
+  const minDate = totals.firstDate;
+  const maxDate = totals.lastDate;
   const months = Math.max(1, (maxDate.getFullYear() - minDate.getFullYear()) * 12 +
                  (maxDate.getMonth() - minDate.getMonth()) + 1);
 
@@ -596,13 +692,6 @@ function calculateStatistics(data) {
 
 // Chart Functions
 function createConsumptionChart(filteredData, allData) {
-  const ctx = document.getElementById('consumption-chart').getContext('2d');
-
-  // Destroy existing chart
-  if (state.charts.consumption) {
-    state.charts.consumption.destroy();
-  }
-
   console.log('=== CONSUMPTION PROFILE: UTC-BASED AGGREGATION ===');
 
   // Group data by UTC time (handles DST correctly)
@@ -627,6 +716,18 @@ function createConsumptionChart(filteredData, allData) {
   const scaleFactor = selectedMax > 0 ? selectedMax / overallMax : 1;
   const normalizedOverall = overallData.map(v => v * scaleFactor);
 
+  renderConsumptionChart(labels, selectedData, normalizedOverall,
+    'Consumption Profile: Selected Period vs Overall (UTC Time)');
+}
+
+function renderConsumptionChart(labels, selectedData, normalizedOverall, title) {
+  const ctx = document.getElementById('consumption-chart').getContext('2d');
+
+  // Destroy existing chart
+  if (state.charts.consumption) {
+    state.charts.consumption.destroy();
+  }
+
   // Filter labels to show every 2 hours
   const displayLabels = labels.map((label, index) => {
     const hour = parseInt(label.split(':')[0]);
@@ -664,7 +765,7 @@ function createConsumptionChart(filteredData, allData) {
       plugins: {
         title: {
           display: true,
-          text: 'Consumption Profile: Selected Period vs Overall (UTC Time)',
+          text: title,
           font: { size: 14, weight: 'bold' }
         },
         legend: {
@@ -705,7 +806,12 @@ function createConsumptionChart(filteredData, allData) {
   });
 }
 
-function createMonthlyCostChart(data) {
+function createMonthlyCostChart(rollup) {
+  // Aggregate data by month - returns array of month objects
+  renderMonthlyCostChart(aggregateByMonth(rollup));
+}
+
+function renderMonthlyCostChart(monthlyData) {
   const ctx = document.getElementById('monthly-cost-chart').getContext('2d');
 
   // Destroy existing chart
@@ -713,9 +819,6 @@ function createMonthlyCostChart(data) {
     state.charts.monthlyCost.destroy();
   }
 
-  // Aggregate data by month - returns array of month objects
-  const monthlyData = aggregateByMonth(data);
-
   if (monthlyData.length === 0) {
     console.warn('No monthly data to chart');
     return;
@@ -876,9 +979,11 @@ function createMonthlyCostChart(data) {
   });
 }
 
-function updateStatistics(data) {
-  const stats = calculateStatistics(data);
+function updateStatistics(startDate, endDate) {
+  renderStatistics(calculateStatistics(rangeTotals(state.rollup, state.mergedData, startDate, endDate)));
+}
 
+function renderStatistics(stats) {
   document.getElementById('stat-total-consumption').textContent = `${stats.totalConsumption} kWh`;
   document.getElementById('stat-total-cost').textContent = `€${stats.totalCost}`;
   document.getElementById('stat-avg-monthly-consumption').textContent = `${stats.avgMonthlyConsumption} kWh/month`;
@@ -886,6 +991,111 @@ function updateStatistics(data) {
   document.getElementById('stat-avg-price').textContent = `${stats.avgPrice} ¢/kWh`;
 }
 
+// Analysis Service Functions
+// The Python analysis service (analysis_service.py, proxied by server.js) computes all results
+// from the saved files; the browser only fetches compact JSON instead of parsing the raw files.
+
+const ANALYSIS_API = '/api/analysis';
+
+async function fetchAnalysis(endpoint, params = {}) {
+  const query = new URLSearchParams(params).toString();
+  const response = await fetch(`${ANALYSIS_API}/${endpoint}${query ? '?' + query : ''}`);
+  if (!response.ok) {
+    throw new Error(`Analysis service: HTTP ${response.status}`);
+  }
+  return response.json();
+}
+
+function gridFeeParams() {
+  return { grid_base_fee: gridConfig.baseFee, grid_work_fee: gridConfig.workFee };
+}
+
+function parseLocalDate(isoDate) {
+  const [year, month, day] = isoDate.split('-').map(Number);
+  return new Date(year, month - 1, day);
+}
+
+/**
+ * Set the available date range and select start of the last month to end of data
+ */
+function initDateRange(minDate, maxDate) {
+  state.minDate = minDate;
+  state.maxDate = maxDate;
+
+  const firstOfMonth = new Date(state.maxDate.getFullYear(), state.maxDate.getMonth(), 1);
+  state.startDate = firstOfMonth > state.minDate ? firstOfMonth : state.minDate;
+  state.endDate = state.maxDate;
+
+  document.getElementById('start-date').min = formatDateForInput(state.minDate);
+  document.getElementById('start-date').max = formatDateForInput(state.maxDate);
+  document.getElementById('start-date').value = formatDateForInput(state.startDate);
+
+  document.getElementById('end-date').min = formatDateForInput(state.minDate);
+  document.getElementById('end-date').max = formatDateForInput(state.maxDate);
+  document.getElementById('end-date').value = formatDateForInput(state.endDate);
+}
+
+/**
+ * Show the analysis of the saved files computed by the analysis service.
+ * Returns false if the service is not running or has no complete data.
+ */
+async function loadServiceAnalysis() {
+  try {
+    const summary = await fetchAnalysis('summary');
+    console.log('Analysis service data:', summary);
+
+    const maxDate = parseLocalDate(summary.max_date);
+    maxDate.setHours(23, 59, 59, 999);
+    initDateRange(parseLocalDate(summary.min_date), maxDate);
+    state.service = true;
+
+    await updateAnalysisFromService();
+    return true;
+  } catch (error) {
+    console.log('Analysis service not used:', error.message);
+    state.service = false;
+    return false;
+  }
+}
+
+async function updateAnalysisFromService() {
+  setStatus('Updating analysis...', 'processing');
+
+  const range = {
+    start: formatDateForInput(state.startDate),
+    end: formatDateForInput(state.endDate)
+  };
+  const [profile, monthly, stats] = await Promise.all([
+    fetchAnalysis('profile', range),
+    fetchAnalysis('monthly', gridFeeParams()),
+    fetchAnalysis('statistics', { ...range, ...gridFeeParams() })
+  ]);
+
+  renderConsumptionChart(profile.labels, profile.selected, profile.overall,
+    'Consumption Profile: Selected Period vs Overall (Local Time)');
+
+  renderMonthlyCostChart(monthly.months.map((month, i) => ({
+    month: month,
+    consumption: monthly.consumption[i],
+    marketCost: monthly.market_cost[i],
+    variableFee: monthly.variable_fee[i],
+    fixedFee: monthly.fixed_fee[i],
+    gridWorkCost: monthly.grid_work_cost[i],
+    gridBaseCost: monthly.grid_base_cost[i],
+    totalCost: monthly.total_cost[i]
+  })));
+
+  renderStatistics({
+    totalConsumption: stats.total_consumption.toFixed(2),
+    totalCost: stats.total_cost.toFixed(2),
+    avgMonthlyConsumption: stats.avg_monthly_consumption.toFixed(2),
+    avgMonthlyCost: stats.avg_monthly_cost.toFixed(2),
+    avgPrice: stats.avg_market_price.toFixed(3)
+  });
+
+  setStatus('Analysis updated', 'success');
+}
+
 // Server-Side Persistence Functions
 
 /**
@@ -901,6 +1111,24 @@ async function loadSavedFiles() {
       setStatus('Loading previously uploaded files...', 'processing');
       console.log('Found saved files:', result);
 
+      displayFileName(
+        document.getElementById('consumption-filename'),
+        document.getElementById('consumption-drop-zone'),
+        result.consumption.filename
+      );
+      displayFileName(
+        document.getElementById('price-filename'),
+        document.getElementById('price-drop-zone'),
+        result.price.filename
+      );
+
+      // Results computed by the analysis service: no raw file download needed
+      if (await loadServiceAnalysis()) {
+        setStatus(`✅ Loaded analysis of saved files: ${result.consumption.filename} and ${result.price.filename}`, 'success');
+        return;
+      }
+
+      // Fallback: download the raw files and process them in the browser
       // Load consumption file
       const consumptionResponse = await fetch('/api/download/consumption');
       const consumptionBlob = await consumptionResponse.blob();
@@ -915,21 +1143,9 @@ async function loadSavedFiles() {
         type: priceBlob.type
       });
 
-      // Update drop zones with file names
-      displayFileName(
-        document.getElementById('consumption-filename'),
-        document.getElementById('consumption-drop-zone'),
-        result.consumption.filename
-      );
-      displayFileName(
-        document.getElementById('price-filename'),
-        document.getElementById('price-drop-zone'),
-        result.price.filename
-      );
-
-      // Process the files
-      handleConsumptionFile(consumptionFile);
-      handlePriceFile(priceFile);
+      // Process the files (already saved on the server)
+      parseConsumptionFile(consumptionFile);
+      parsePriceFile(priceFile);
 
       setStatus(`✅ Loaded saved files: ${result.consumption.filename} and ${result.price.filename}`, 'success');
       console.log('Successfully loaded saved files from server');
@@ -991,10 +1207,12 @@ async function clearSavedFiles() {
       state.consumptionData = [];
       state.priceData = [];
       state.mergedData = [];
+      state.rollup = [];
       state.startDate = null;
       state.endDate = null;
       state.minDate = null;
       state.maxDate = null;
+      state.service = false;
 
       // Clear file inputs
       document.getElementById('consumption-file').value = '';
@@ -1344,7 +1562,37 @@ function showStatus(message, type) {
 }
 
 // File Upload Handlers
-function handleConsumptionFile(file) {
+async function handleConsumptionFile(file) {
+  await handleUpload(file, 'consumption', parseConsumptionFile);
+}
+
+async function handlePriceFile(file) {
+  await handleUpload(file, 'price', parsePriceFile);
+}
+
+/**
+ * Save a file on the server and show the service's analysis; parse it in the browser only if
+ * the analysis service is not available
+ */
+async function handleUpload(file, type, parseLocally) {
+  displayFileName(
+    document.getElementById(`${type}-filename`),
+    document.getElementById(`${type}-drop-zone`),
+    file.name
+  );
+
+  const saved = await saveFileToServer(file, type);
+  if (saved && await loadServiceAnalysis()) {
+    console.log(`${type} file analysed by the analysis service`);
+    return;
+  }
+  if (!saved) {
+    console.warn(`Could not save ${type} file to server, processing locally`);
+  }
+  parseLocally(file);
+}
+
+function parseConsumptionFile(file) {
   const reader = new FileReader();
   const filename = file.name;
   const extension = filename.split('.').pop().toLowerCase();
@@ -1383,15 +1631,6 @@ function handleConsumptionFile(file) {
         filename
       );
 
-      // Save to server (non-blocking)
-      saveFileToServer(file, 'consumption').then(saved => {
-        if (saved) {
-          console.log('Consumption file saved to server');
-        } else {
-          console.warn('Could not save consumption file to server, but processing locally');
-        }
-      });
-
       // Try to merge if both files are loaded
       tryMergeAndUpdate();
     } catch (error) {
@@ -1406,7 +1645,7 @@ function handleConsumptionFile(file) {
   }
 }
 
-function handlePriceFile(file) {
+function parsePriceFile(file) {
   const reader = new FileReader();
   const filename = file.name;
 
@@ -1433,15 +1672,6 @@ function handlePriceFile(file) {
         filename
       );
 
-      // Save to server (non-blocking)
-      saveFileToServer(file, 'price').then(saved => {
-        if (saved) {
-          console.log('Price file saved to server');
-        } else {
-          console.warn('Could not save price file to server, but processing locally');
-        }
-      });
-
       // Try to merge if both files are loaded
       tryMergeAndUpdate();
     } catch (error) {
@@ -1475,29 +1705,18 @@ function tryMergeAndUpdate() {
 
     console.log('=== MERGE COMPLETED ===');
     console.log('Merged records:', state.mergedData.length);
+    state.rollup = buildDailyRollup(state.mergedData);
 
-    // Calculate date range
-    const dates = state.mergedData.map(d => d.date);
-    state.minDate = new Date(Math.min(...dates));
-    state.maxDate = new Date(Math.max(...dates));
-
-    // Set default date range (start of month to end of data)
-    const firstOfMonth = new Date(state.maxDate.getFullYear(), state.maxDate.getMonth(), 1);
-    state.startDate = firstOfMonth > state.minDate ? firstOfMonth : state.minDate;
-    state.endDate = state.maxDate;
-
-    // Update date inputs
-    document.getElementById('start-date').min = formatDateForInput(state.minDate);
-    document.getElementById('start-date').max = formatDateForInput(state.maxDate);
-    document.getElementById('start-date').value = formatDateForInput(state.startDate);
+    // Browser-side data replaces results of the analysis service
+    state.service = false;
 
-    document.getElementById('end-date').min = formatDateForInput(state.minDate);
-    document.getElementById('end-date').max = formatDateForInput(state.maxDate);
-    document.getElementById('end-date').value = formatDateForInput(state.endDate);
+    // Calculate date range and set default (start of month to end of data)
+    const dates = state.mergedData.map(d => d.date);
+    initDateRange(new Date(Math.min(...dates)), new Date(Math.max(...dates)));
 
     // Log processing summary
     console.log('=== PROCESSING SUMMARY ===');
-    const tempMonthly = aggregateByMonth(state.mergedData);
+    const tempMonthly = aggregateByMonth(state.rollup);
     tempMonthly.forEach(month => {
       console.log(`${month.month}:`,
         `Consumption=${month.consumption.toFixed(1)}kWh`,
@@ -1514,6 +1733,14 @@ function tryMergeAndUpdate() {
 }
 
 function updateAnalysis() {
+  if (state.service) {
+    updateAnalysisFromService().catch(error => {
+      console.error('Analysis service error:', error);
+      setStatus(`Error updating analysis: ${error.message}`, 'error');
+    });
+    return;
+  }
+
   if (state.mergedData.length === 0) {
     setStatus('No data available', 'error');
     return;
@@ -1531,10 +1758,10 @@ function updateAnalysis() {
 
   // Update charts
   createConsumptionChart(filteredData, state.mergedData);
-  createMonthlyCostChart(state.mergedData); // Always use all data for monthly costs
+  createMonthlyCostChart(state.rollup); // Always use all data for monthly costs
 
   // Update statistics
-  updateStatistics(filteredData);
+  updateStatistics(state.startDate, state.endDate);
 
   setStatus('Analysis updated', 'success');
 }
@@ -1731,7 +1958,7 @@ document.addEventListener('DOMContentLoaded', function() {
   if (updateBtn) {
     updateBtn.addEventListener('click', function() {
       console.log('Update button clicked');
-      if (state.mergedData.length > 0) {
+      if (state.service || state.mergedData.length > 0) {
         updateAnalysis();
       } else {
         setStatus('❌ Please upload data files first', 'error');
@@ -3,10 +3,14 @@ const multer = require('multer');
 const path = require('path');
 const fs = require('fs');
 const cors = require('cors');
+const http = require('http');
 
 const app = express();
 const PORT = process.env.PORT || 3000;
 
+// Python analysis service (analysis_service.py) answering /api/analysis/*
+const ANALYSIS_URL = process.env.ANALYSIS_URL || 'http://127.0.0.1:8050';
+
 // Enable CORS for development
 app.use(cors());
 app.use(express.json());
@@ -141,6 +145,26 @@ app.post('/api/clear', (req, res) => {
   }
 });
 
+// Forward analysis requests to the Python analysis service
+app.get('/api/analysis/*', (req, res) => {
+  const headers = {};
+  ['accept-encoding', 'if-none-match'].forEach(name => {
+    if (req.headers[name]) {
+      headers[name] = req.headers[name];
+    }
+  });
+
+  const proxyReq = http.get(new URL(req.originalUrl, ANALYSIS_URL), { headers }, proxyRes => {
+    res.writeHead(proxyRes.statusCode, proxyRes.headers);
+    proxyRes.pipe(res);
+  });
+
+  proxyReq.on('error', error => {
+    console.warn('Analysis service not reachable:', error.message);
+    res.status(502).json({ success: false, error: 'Analysis service not available' });
+  });
+});
+
 // Health check endpoint
 app.get('/api/health', (req, res) => {
   res.json({ status: 'ok', timestamp: new Date().toISOString() });
@@ -163,6 +187,7 @@ app.listen(PORT, '0.0.0.0', () => {
 ║   - GET  /api/download/price                              ║
 ║   - POST /api/clear                                       ║
 ║   - GET  /api/health                                      ║
+║   - GET  /api/analysis/* (analysis service)               ║
 ╚═══════════════════════════════════════════════════════════╝
   `);
   
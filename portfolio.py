@@ -0,0 +1,276 @@
+"""
+Portfolio cost module.
+
+Computes costs for many meters (installations) that share one market price series. The price
+series is aligned once to the union of all meters' intervals, the meters are stacked into a
+(meters x intervals) consumption matrix, and all meters are costed with one broadcast multiply and
+one per-month reduction. The work grows with the amount of data, not with meters times merges.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from merge_engine import MergeStats, align, to_epoch_ns, wall_time
+from tariff import Tariff, provider_tariff
+
+# Meters costed per block, bounding the temporary (meters x intervals) product
+METER_BLOCK = 256
+
+
+@dataclass
+class PortfolioResult:
+    """
+    Monthly cost components per meter.
+
+    Monthly arrays have shape (meters, months).
+
+    Attributes
+    ----------
+    meters : list of str
+        Meter names, in row order.
+    months : pd.PeriodIndex
+        Months covered by any meter, in order.
+    monthly_consumption, monthly_market, monthly_variable, monthly_fixed, monthly_total : np.ndarray
+        Monthly sums in kWh and EUR; the monthly charges are applied for months in which a meter
+        has data, and monthly_total includes them.
+    active : np.ndarray
+        True where a meter has data in a month.
+    filled, dropped : np.ndarray
+        Per meter, the readings priced with a filled price and the readings left out for lack of
+        any usable price.
+    stats : MergeStats
+        Counts of the single price alignment over the union of all intervals.
+    """
+
+    meters: list[str]
+    months: pd.PeriodIndex
+    monthly_consumption: np.ndarray
+    monthly_market: np.ndarray
+    monthly_variable: np.ndarray
+    monthly_fixed: np.ndarray
+    monthly_total: np.ndarray
+    active: np.ndarray
+    filled: np.ndarray
+    dropped: np.ndarray
+    stats: MergeStats
+
+    def monthly_frame(self, meter: str | None = None) -> pd.DataFrame:
+        """
+        Return monthly sums of one meter, or of the whole portfolio, as a DataFrame.
+
+        Parameters
+        ----------
+        meter : str, optional
+            Meter name. Default: sum over all meters.
+
+        Returns
+        -------
+        pd.DataFrame
+            Same columns as CostResult.monthly_frame(), indexed by month.
+        """
+        if meter is None:
+            rows = slice(None)
+        else:
+            rows = self.meters.index(meter)
+        columns = {
+            'consumption': self.monthly_consumption,
+            'market_cost': self.monthly_market,
+            'variable_fee': self.monthly_variable,
+            'fixed_fee': self.monthly_fixed,
+            'total_cost': self.monthly_total,
+        }
+        frame = pd.DataFrame({name: np.atleast_2d(values[rows]).sum(axis=0) for name, values in columns.items()},
+                             index=self.months)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            frame['avg_price'] = frame['total_cost'] / frame['consumption']
+        return frame
+
+    def meter_totals(self) -> pd.DataFrame:
+        """
+        Return totals per meter over all months.
+
+        Returns
+        -------
+        pd.DataFrame
+            Columns consumption, market_cost, variable_fee, fixed_fee, total_cost and avg_price
+            (EUR/kWh), indexed by meter.
+        """
+        frame = pd.DataFrame({
+            'consumption': self.monthly_consumption.sum(axis=1),
+            'market_cost': self.monthly_market.sum(axis=1),
+            'variable_fee': self.monthly_variable.sum(axis=1),
+            'fixed_fee': self.monthly_fixed.sum(axis=1),
+            'total_cost': self.monthly_total.sum(axis=1),
+        }, index=pd.Index(self.meters, name='meter'))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            frame['avg_price'] = frame['total_cost'] / frame['consumption']
+        return frame
+
+
+class PortfolioCalculator:
+    """
+    Calculate costs of many meters against one shared price series.
+
+    Parameters
+    ----------
+    price_df : pd.DataFrame
+        Market price data with timestamp column.
+    price_col : str, optional
+        Name of column in price_df containing prices in EUR/MWh. Default: 'Preis MC Auktion [EUR/MWh]'.
+    timestamp_col : str, optional
+        Name of the timestamp column of the price and consumption frames. Default: 'timestamp'.
+    fixed_fee : float, optional
+        Monthly fixed provider fee per meter in EUR. Default: 2.16.
+    variable_fee_per_kwh : float, optional
+        Variable fee per kWh from provider in EUR. Default: 0.018.
+    fill : {'forward', 'backward', None}, optional
+        How intervals without a covering price get one, as in PowerCostCalculator.
+        Default: 'forward'.
+    fill_limit : pd.Timedelta, optional
+        Maximum distance to a fill price. Default: unlimited.
+    tariff : Tariff, optional
+        Tariff applied to every meter. Default: provider_tariff() with fixed_fee and
+        variable_fee_per_kwh.
+    """
+
+    def __init__(
+        self,
+        price_df: pd.DataFrame,
+        price_col: str = 'Preis MC Auktion [EUR/MWh]',
+        timestamp_col: str = 'timestamp',
+        fixed_fee: float = 2.16,
+        variable_fee_per_kwh: float = 0.018,
+        fill: str | None = 'forward',
+        fill_limit: pd.Timedelta | None = None,
+        tariff: Tariff | None = None,
+    ):
+        """
+        Initialize a PortfolioCalculator.
+
+        See class docstring for parameter details.
+        """
+        self.price_df = price_df
+        self.price_col = price_col
+        self.timestamp_col = timestamp_col
+        self.tariff = tariff if tariff is not None else provider_tariff(fixed_fee, variable_fee_per_kwh)
+        self.fill = fill
+        self.fill_limit = fill_limit
+        self.meters: dict[str, tuple[np.ndarray, np.ndarray]] = {}
+        self._tz = getattr(price_df[timestamp_col].dtype, 'tz', None)
+
+    def add_meter(self, name: str, consumption_df: pd.DataFrame, consumption_col: str = 'Verbrauch'):
+        """
+        Add (or replace) a meter.
+
+        Only the UTC epoch timestamps and the consumption values are kept.
+
+        Parameters
+        ----------
+        name : str
+            Meter name, e.g. the installation key.
+        consumption_df : pd.DataFrame
+            Consumption data with timestamp column.
+        consumption_col : str, optional
+            Name of the consumption column (kWh). Default: 'Verbrauch'.
+        """
+        self.meters[name] = (
+            to_epoch_ns(consumption_df[self.timestamp_col]),
+            consumption_df[consumption_col].to_numpy(dtype='float64'),
+        )
+        if self._tz is None:
+            self._tz = getattr(consumption_df[self.timestamp_col].dtype, 'tz', None)
+
+    def consumption_matrix(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Stack all meters onto the union of their interval starts.
+
+        Returns
+        -------
+        tuple of np.ndarray
+            Sorted union grid (int64 epoch ns) and the (meters x grid) consumption matrix; NaN
+            where a meter has no reading.
+        """
+        grid = np.unique(np.concatenate([ts for ts, _ in self.meters.values()])) if self.meters \
+            else np.empty(0, dtype='int64')
+        matrix = np.full((len(self.meters), len(grid)), np.nan)
+        for row, (ts, values) in enumerate(self.meters.values()):
+            matrix[row, np.searchsorted(grid, ts)] = values
+        return grid, matrix
+
+    def compute(self) -> PortfolioResult:
+        """
+        Compute monthly costs of all meters.
+
+        The price series is aligned once to the union grid; market costs of a block of meters
+        are one broadcast multiply of the consumption matrix with the aligned price row (energy
+        charges likewise with the compiled tariff's rate row), and all monthly sums come from
+        np.add.reduceat over the month boundaries.
+
+        Returns
+        -------
+        PortfolioResult
+            Monthly cost components per meter.
+        """
+        grid, matrix = self.consumption_matrix()
+        alignment = align(
+            grid,
+            to_epoch_ns(self.price_df[self.timestamp_col]),
+            self.price_df[self.price_col].to_numpy(dtype='float64'),
+            fill=self.fill,
+            fill_limit=self.fill_limit,
+        )
+        kept = grid[alignment.rows]
+        price = alignment.price / 1000  # EUR/kWh
+
+        # Month boundaries of the kept grid in local wall time
+        local = pd.DatetimeIndex(kept, tz='UTC')
+        if self._tz is not None:
+            local = local.tz_convert(self._tz)
+        wall = wall_time(local)
+        month_keys = wall.astype('datetime64[M]')
+        compiled = self.tariff.compile(wall)
+        price = price * compiled.market_factor
+        if len(kept):
+            month_starts = np.concatenate(([0], np.flatnonzero(month_keys[1:] != month_keys[:-1]) + 1))
+        else:
+            month_starts = np.empty(0, dtype='int64')
+        months = pd.PeriodIndex(month_keys[month_starts], freq='M')
+
+        n_meters, n_months = len(self.meters), len(month_starts)
+        monthly_consumption = np.zeros((n_meters, n_months))
+        monthly_market = np.zeros((n_meters, n_months))
+        monthly_variable = np.zeros((n_meters, n_months))
+        has_data = np.zeros((n_meters, n_months), dtype=bool)
+        # Fill and drop counts per meter, from the alignment of the union grid
+        readings = (~np.isnan(matrix)).sum(axis=1)
+        priced = np.zeros(n_meters, dtype='int64')
+        filled = np.zeros(n_meters, dtype='int64')
+        if n_months:
+            for lo in range(0, n_meters, METER_BLOCK):
+                block = matrix[lo:lo + METER_BLOCK, alignment.rows]
+                present = ~np.isnan(block)
+                block = np.where(present, block, 0.0)
+                monthly_consumption[lo:lo + METER_BLOCK] = np.add.reduceat(block, month_starts, axis=1)
+                monthly_market[lo:lo + METER_BLOCK] = np.add.reduceat(block * price, month_starts, axis=1)
+                monthly_variable[lo:lo + METER_BLOCK] = np.add.reduceat(block * compiled.energy_rate,
+                                                                        month_starts, axis=1)
+                has_data[lo:lo + METER_BLOCK] = np.logical_or.reduceat(present, month_starts, axis=1)
+                priced[lo:lo + METER_BLOCK] = present.sum(axis=1)
+                filled[lo:lo + METER_BLOCK] = (present & alignment.filled).sum(axis=1)
+
+        monthly_fixed = has_data * compiled.monthly_fee
+        return PortfolioResult(
+            meters=list(self.meters),
+            months=months,
+            monthly_consumption=monthly_consumption,
+            monthly_market=monthly_market,
+            monthly_variable=monthly_variable,
+            monthly_fixed=monthly_fixed,
+            monthly_total=monthly_market + monthly_variable + monthly_fixed,
+            active=has_data,
+            filled=filled,
+            dropped=readings - priced,
+            stats=alignment.stats,
+        )
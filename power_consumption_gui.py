@@ -7,10 +7,23 @@ consumption data with the following features:
 - Remembers last selected files for convenience
 - Date range selection for filtering data (affects consumption profile only)
 - Quick date range buttons: "Start of Month" and "Full Range"
+- Live updates while picking dates or dragging the range slider (debounced)
 - Consumption profile comparison (selected period vs overall)
 - Monthly cost breakdown with fees separation (always shows full data)
 - Monthly consumption displayed alongside costs
 - Average electricity price calculation per month
+- Interval time series of consumption and market price: zoom and pan through the
+  full history, downsampled to the plot width (follows the selected date range)
+- Consumption and cost in each day's cheapest and most expensive quarter-hours
+- Load-shifting simulator: monthly savings of moving flexible load into the
+  cheapest allowed quarter-hours of each day
+- Tariff comparison: monthly cost of candidate tariffs (loaded from JSON) against
+  the configured tariff, with the cheapest tariff per month
+- Loading and analysis run on a background worker thread, so the window stays
+  responsive; a newer date selection cancels a still running analysis
+- Optional stage timings (wall time, CPU time, memory peak) of loading, analysis
+  and drawing: session summary in the status bar, per-stage table in the debug
+  panel and Chrome trace export (enable in the panel or with POWER_TRACE=1)
 
 Dependencies:
 - tkinter (built-in)
@@ -26,13 +39,22 @@ Usage:
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 from tkcalendar import DateEntry
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
 from matplotlib.figure import Figure
 import pandas as pd
-import numpy as np
 from datetime import datetime, timedelta
 from cost_calculator import PowerCostCalculator
+from ingestion import consumption_store, price_store, ingest_consumption, ingest_prices
+from background_worker import BackgroundWorker
+from profile_cube import ProfileCube, SLOT_LABELS
+from time_index import TimeIndex
+from tariff import Tariff, TimeWindow, provider_tariff
+from price_bands import CHEAP, EXPENSIVE
+from load_shifting import LoadShiftSimulator
+from charts import ProfileChart, MonthlyChart, TimeSeriesChart
+from downsampling import SeriesPyramid
+import instrumentation
+from instrumentation import span, traced, trace_canvas
 import os
 import json
 
@@ -42,6 +64,9 @@ class PowerConsumptionGUI:
 
     CONFIG_FILE = 'power_consumption_config.json'
 
+    # Date changes within this delay are coalesced into one analysis
+    DEBOUNCE_MS = 100
+
     def __init__(self, root, consumption_file=None, price_file=None):
         """
         Initialize the GUI application.
@@ -71,23 +96,44 @@ class PowerConsumptionGUI:
         self.consumption_file = consumption_file
         self.price_file = price_file
 
+        # Tariff from the optional 'tariff' config entry, provider fees only otherwise
+        self.tariff = provider_tariff()
+        if saved_config and saved_config.get('tariff'):
+            try:
+                self.tariff = Tariff.from_dict(saved_config['tariff'])
+            except (KeyError, TypeError, ValueError) as e:
+                print(f"Could not load tariff: {e}")
+
+        # Candidate tariffs compared against self.tariff
+        self.compare_tariffs = []
+        if saved_config and saved_config.get('compare_tariffs'):
+            try:
+                self.compare_tariffs = [Tariff.from_dict(t) for t in saved_config['compare_tariffs']]
+            except (KeyError, TypeError, ValueError) as e:
+                print(f"Could not load comparison tariffs: {e}")
+
         # Data storage
         self.df_consumption_full = None
         self.df_price_full = None
         self.cost_calculator = None
+        self.profile_cube = None
+        self.time_index = None
         self.min_date = None
         self.max_date = None
+        self._pending_update = None
+        self._analysed_range = None
+
+        # Parsing, merging and aggregation run off the UI thread
+        self.worker = BackgroundWorker(self.root)
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
 
         # Create GUI components
         self.create_widgets()
 
-        # Load data if files provided and exist
+        # Load data if files provided and exist (analysis starts once loaded)
         if self.consumption_file and self.price_file:
             if os.path.exists(self.consumption_file) and os.path.exists(self.price_file):
                 self.load_data()
-                if self.df_consumption_full is not None:
-                    self.enable_analysis_controls()
-                    self.update_analysis()
             else:
                 # Files from config don't exist anymore
                 self.consumption_file = None
@@ -110,7 +156,9 @@ class PowerConsumptionGUI:
         try:
             config = {
                 'consumption_file': self.consumption_file,
-                'price_file': self.price_file
+                'price_file': self.price_file,
+                'tariff': self.tariff.to_dict(),
+                'compare_tariffs': [t.to_dict() for t in self.compare_tariffs]
             }
             with open(self.CONFIG_FILE, 'w') as f:
                 json.dump(config, f, indent=2)
@@ -157,13 +205,35 @@ class PowerConsumptionGUI:
             self.save_config()  # Save after selection
             self.check_and_load_data()
 
+    def browse_tariff_file(self):
+        """Open file dialog to select a JSON file with tariffs to compare."""
+        filename = filedialog.askopenfilename(
+            title="Select Tariff File",
+            filetypes=[
+                ("JSON files", "*.json"),
+                ("All files", "*.*")
+            ]
+        )
+        if not filename:
+            return
+        try:
+            with open(filename, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            # A single tariff or a list of tariffs
+            if isinstance(data, dict):
+                data = [data]
+            self.compare_tariffs = [Tariff.from_dict(t) for t in data]
+        except (OSError, KeyError, TypeError, ValueError) as e:
+            messagebox.showerror("Error Loading Tariffs", f"Could not read tariffs:\n{str(e)}")
+            return
+        self.save_config()
+        if self.cost_calculator is not None:
+            self.update_analysis(quiet=True)
+
     def check_and_load_data(self):
         """Check if both files are selected and load data."""
         if self.consumption_file and self.price_file:
             self.load_data()
-            if self.df_consumption_full is not None:
-                self.enable_analysis_controls()
-                self.update_analysis()
 
     def get_default_start_date(self):
         """
@@ -181,21 +251,74 @@ class PowerConsumptionGUI:
             # Current month not available, use min_date
             return self.min_date
 
+    def set_date_range(self, start_date, end_date):
+        """Show a date range in the date entries and the range slider."""
+        self.start_date_entry.set_date(start_date)
+        self.end_date_entry.set_date(end_date)
+        self.start_slider.set((start_date - self.min_date).days)
+        self.end_slider.set((end_date - self.min_date).days)
+
     def set_date_range_start_of_month(self):
         """Set date range to start of current month to end of data."""
         if self.min_date and self.max_date:
             default_start = self.get_default_start_date()
-            self.start_date_entry.set_date(default_start)
-            self.end_date_entry.set_date(self.max_date)
+            self.set_date_range(default_start, self.max_date)
             self.update_analysis()
 
     def set_date_range_full(self):
         """Set date range to full available data range."""
         if self.min_date and self.max_date:
-            self.start_date_entry.set_date(self.min_date)
-            self.end_date_entry.set_date(self.max_date)
+            self.set_date_range(self.min_date, self.max_date)
             self.update_analysis()
 
+    def schedule_update(self):
+        """Run a quiet analysis once the date selection has been still for DEBOUNCE_MS."""
+        if self.df_consumption_full is None:
+            return
+        if self._pending_update is not None:
+            self.root.after_cancel(self._pending_update)
+        self._pending_update = self.root.after(self.DEBOUNCE_MS, self._run_scheduled_update)
+
+    def _run_scheduled_update(self):
+        """Debounce timer callback."""
+        self._pending_update = None
+        # Sliders set in code (presets, loading) fire their command too; that range is already analysed
+        selected = (self.start_date_entry.get_date(), self.end_date_entry.get_date())
+        if selected == self._analysed_range:
+            return
+        self.update_analysis(quiet=True)
+
+    def on_date_entry_changed(self, event=None):
+        """Follow a date picked or typed in a DateEntry with the slider and a live update."""
+        if self.min_date is None:
+            return
+        try:
+            start_date = self.start_date_entry.get_date()
+            end_date = self.end_date_entry.get_date()
+        except (ValueError, IndexError):
+            return  # Incomplete input while typing
+        self.start_slider.set((start_date - self.min_date).days)
+        self.end_slider.set((end_date - self.min_date).days)
+        self.schedule_update()
+
+    def on_slider_moved(self, handle):
+        """Follow the range slider with the date entries and a live update."""
+        if self.min_date is None:
+            return
+        start_offset = int(self.start_slider.get())
+        end_offset = int(self.end_slider.get())
+        # Handles cannot cross: the one not being dragged is pushed along
+        if start_offset > end_offset:
+            if handle == 'end':
+                self.start_slider.set(end_offset)
+                start_offset = end_offset
+            else:
+                self.end_slider.set(start_offset)
+                end_offset = start_offset
+        self.start_date_entry.set_date(self.min_date + timedelta(days=start_offset))
+        self.end_date_entry.set_date(self.min_date + timedelta(days=end_offset))
+        self.schedule_update()
+
     def enable_analysis_controls(self):
         """Enable date selection and update button after data is loaded."""
         self.start_date_entry.config(state='normal')
@@ -203,6 +326,7 @@ class PowerConsumptionGUI:
         self.update_button.config(state='normal')
         self.btn_start_of_month.config(state='normal')
         self.btn_full_range.config(state='normal')
+        self.shift_button.config(state='normal')
 
         # Set date range
         self.start_date_entry.config(
@@ -210,56 +334,113 @@ class PowerConsumptionGUI:
         self.end_date_entry.config(
             mindate=self.min_date, maxdate=self.max_date)
 
+        # One slider step per day
+        last_offset = (self.max_date - self.min_date).days
+        for slider in (self.start_slider, self.end_slider):
+            slider.config(state='normal', to=last_offset)
+
         # Set default dates
         default_start = self.get_default_start_date()
-        self.start_date_entry.set_date(default_start)
-        self.end_date_entry.set_date(self.max_date)
-
-    def load_data(self):
-        """Load and preprocess consumption and price data."""
-        try:
-            self.status_label.config(text="Loading data...", fg='#e67e22')
-            self.root.update()
+        self.set_date_range(default_start, self.max_date)
 
-            # Load consumption data
-            self.df_consumption_full = pd.read_excel(self.consumption_file)
-            self.df_consumption_full['timestamp'] = pd.to_datetime(
-                self.df_consumption_full['Timestamp'], unit='s', errors='coerce'
-            )
-            self.df_consumption_full['Verbrauch'] = (
-                self.df_consumption_full['Verbrauch']
-                .astype(str).str.replace(',', '.').astype(float)
-            )
-            self.df_consumption_full = self.df_consumption_full.dropna(
-                subset=['timestamp', 'Verbrauch']
-            )
-
-            # Load price data
-            self.df_price_full = pd.read_csv(
-                self.price_file, sep=';', decimal=','
-            )
-            # Handle BOM in column name
-            time_col = [col for col in self.df_price_full.columns
-                        if 'Zeit von' in col][0]
-            self.df_price_full['timestamp'] = pd.to_datetime(
-                self.df_price_full[time_col],
-                format='%d.%m.%Y %H:%M:%S',
-                errors='coerce'
-            )
+    def on_close(self):
+        """Stop background jobs and close the window."""
+        self.worker.shutdown()
+        self.root.destroy()
 
-            # Get date range
-            self.min_date = self.df_consumption_full['timestamp'].min().date()
-            self.max_date = self.df_consumption_full['timestamp'].max().date()
+    def show_progress(self, message):
+        """Show a progress message from a background job."""
+        self.status_label.config(text=message, fg='#e67e22')
 
-            self.status_label.config(
-                text="✓ Data loaded successfully", fg='#27ae60')
+    def load_data(self):
+        """Load and preprocess consumption and price data in the background."""
+        self.status_label.config(text="Loading data...", fg='#e67e22')
+        # Jobs on the previous data are obsolete
+        self.worker.cancel()
+        self.worker.submit(
+            'load', self.load_data_job, self.consumption_file, self.price_file,
+            on_done=self.on_data_loaded,
+            on_error=self.on_load_error,
+            on_progress=self.show_progress
+        )
 
-        except Exception as e:
-            messagebox.showerror("Error Loading Data",
-                                 f"Failed to load data files:\n{str(e)}")
-            self.status_label.config(text="Error loading data", fg='#e74c3c')
-            self.df_consumption_full = None
-            self.df_price_full = None
+    @staticmethod
+    @traced('gui.load_data_job')
+    def load_data_job(job, consumption_file, price_file):
+        """Ingest both files and build the full frames (runs on the worker thread)."""
+        # Ingest new intervals into the persistent stores (known files are skipped)
+        job.report("Loading consumption data...")
+        store_consumption = consumption_store(consumption_file)
+        result_consumption = ingest_consumption(store_consumption, consumption_file)
+        job.check()
+
+        job.report("Loading price data...")
+        store_price = price_store(price_file)
+        result_price = ingest_prices(store_price, price_file)
+        job.check()
+
+        # Day x time-of-day matrix: range profiles without touching the rows
+        job.report("Building consumption profile...")
+        df_consumption = store_consumption.to_frame()
+        with span('profile_cube.build', rows=len(df_consumption)):
+            profile_cube = ProfileCube(df_consumption)
+
+        # Min/max pyramids: the time series chart never plots more points than pixels
+        job.report("Building time series levels...")
+        df_price = store_price.to_frame()
+        with span('pyramid.build', rows=len(df_consumption) + len(df_price)):
+            consumption_pyramid = SeriesPyramid(df_consumption, 'Verbrauch')
+            price_pyramid = SeriesPyramid(df_price, 'Preis MC Auktion [EUR/MWh]')
+        return {
+            'consumption': df_consumption,
+            'price': df_price,
+            'profile_cube': profile_cube,
+            'pyramids': (consumption_pyramid, price_pyramid),
+            'time_index': TimeIndex(df_consumption['timestamp']),
+            'min_date': df_consumption['timestamp'].min().date(),
+            'max_date': df_consumption['timestamp'].max().date(),
+            'new_intervals': result_consumption.appended + result_price.appended,
+        }
+
+    @traced('gui.on_data_loaded')
+    def on_data_loaded(self, data):
+        """Take over loaded data and start the first analysis."""
+        self.df_consumption_full = data['consumption']
+        self.df_price_full = data['price']
+        self.profile_cube = data['profile_cube']
+        self.time_index = data['time_index']
+        self.min_date = data['min_date']
+        self.max_date = data['max_date']
+
+        # Re-created for the new data; kept across updates so the merge only
+        # runs once per loaded dataset
+        self.cost_calculator = PowerCostCalculator(
+            consumption_df=self.df_consumption_full,
+            price_df=self.df_price_full,
+            price_col='Preis MC Auktion [EUR/MWh]',
+            consumption_col='Verbrauch',
+            timestamp_col='timestamp',
+            tariff=self.tariff
+        )
+        self.timeseries_chart.set_data(*data['pyramids'])
+
+        self.status_label.config(
+            text=f"✓ Data loaded successfully ({data['new_intervals']} new intervals)",
+            fg='#27ae60')
+        self.enable_analysis_controls()
+        self.update_analysis()
+        self.root.after_idle(self.update_timing_summary)
+
+    def on_load_error(self, error):
+        """Report a failed load."""
+        messagebox.showerror("Error Loading Data",
+                             f"Failed to load data files:\n{str(error)}")
+        self.status_label.config(text="Error loading data", fg='#e74c3c')
+        self.df_consumption_full = None
+        self.df_price_full = None
+        self.cost_calculator = None
+        self.profile_cube = None
+        self.time_index = None
 
     def _on_mousewheel(self, event):
         """Handle mouse wheel scrolling."""
@@ -426,6 +607,9 @@ class PowerConsumptionGUI:
             state='disabled'  # Disabled until data is loaded
         )
         self.start_date_entry.grid(row=1, column=1, padx=(0, 20))
+        self.start_date_entry.bind('<<DateEntrySelected>>', self.on_date_entry_changed)
+        self.start_date_entry.bind('<Return>', self.on_date_entry_changed)
+        self.start_date_entry.bind('<FocusOut>', self.on_date_entry_changed)
 
         # End date
         tk.Label(
@@ -445,6 +629,9 @@ class PowerConsumptionGUI:
             state='disabled'  # Disabled until data is loaded
         )
         self.end_date_entry.grid(row=1, column=3, padx=(0, 20))
+        self.end_date_entry.bind('<<DateEntrySelected>>', self.on_date_entry_changed)
+        self.end_date_entry.bind('<Return>', self.on_date_entry_changed)
+        self.end_date_entry.bind('<FocusOut>', self.on_date_entry_changed)
 
         # Quick date range buttons
         self.btn_start_of_month = tk.Button(
@@ -507,6 +694,67 @@ class PowerConsumptionGUI:
         )
         self.status_label.grid(row=1, column=7, padx=10)
 
+        # Range slider: start and end handles in days from the first data day
+        tk.Label(
+            control_frame,
+            text="Range:",
+            font=('Arial', 10),
+            bg='#ecf0f1'
+        ).grid(row=2, column=0, padx=(0, 10), pady=(10, 0))
+
+        slider_frame = tk.Frame(control_frame, bg='#ecf0f1')
+        slider_frame.grid(row=2, column=1, columnspan=6, sticky='we', pady=(10, 0))
+
+        self.start_slider = tk.Scale(
+            slider_frame,
+            from_=0,
+            to=0,
+            orient=tk.HORIZONTAL,
+            showvalue=False,
+            length=300,
+            bg='#ecf0f1',
+            highlightthickness=0,
+            command=lambda value: self.on_slider_moved('start'),
+            state='disabled'  # Disabled until data is loaded
+        )
+        self.start_slider.pack(side=tk.LEFT, padx=(0, 10))
+
+        self.end_slider = tk.Scale(
+            slider_frame,
+            from_=0,
+            to=0,
+            orient=tk.HORIZONTAL,
+            showvalue=False,
+            length=300,
+            bg='#ecf0f1',
+            highlightthickness=0,
+            command=lambda value: self.on_slider_moved('end'),
+            state='disabled'  # Disabled until data is loaded
+        )
+        self.end_slider.pack(side=tk.LEFT)
+
+        # Status bar: session timing summary and debug panel
+        status_bar = tk.Frame(self.root, bg='#dfe6e9')
+        status_bar.pack(fill=tk.X, side=tk.BOTTOM)
+        self.timing_label = tk.Label(
+            status_bar,
+            text="",
+            font=('Arial', 9),
+            bg='#dfe6e9',
+            fg='#2c3e50',
+            anchor='w'
+        )
+        self.timing_label.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=10)
+        tk.Button(
+            status_bar,
+            text="⏱ Timings",
+            font=('Arial', 9),
+            command=self.open_debug_panel,
+            cursor='hand2'
+        ).pack(side=tk.RIGHT, padx=5, pady=2)
+        self.debug_panel = None
+        self.update_timing_summary()
+
         # Main content frame with scrollbar
         main_frame = tk.Frame(self.root)
         main_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
@@ -549,6 +797,30 @@ class PowerConsumptionGUI:
         self.canvas_profile = FigureCanvasTkAgg(
             self.fig_profile, profile_frame)
         self.canvas_profile.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        self.profile_chart = ProfileChart(
+            self.fig_profile, self.ax_profile, self.canvas_profile)
+        trace_canvas(self.canvas_profile, 'draw.profile')
+
+        # Interval time series (consumption and price), zoomable
+        timeseries_frame = tk.LabelFrame(
+            self.scrollable_frame,
+            text="Interval Time Series: Consumption & Market Price (zoom/pan with the toolbar)",
+            font=('Arial', 12, 'bold'),
+            padx=10,
+            pady=10
+        )
+        timeseries_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+
+        self.fig_timeseries = Figure(figsize=(12, 6), dpi=100)
+        self.ax_ts_consumption = self.fig_timeseries.add_subplot(211)
+        self.ax_ts_price = self.fig_timeseries.add_subplot(212, sharex=self.ax_ts_consumption)
+        self.canvas_timeseries = FigureCanvasTkAgg(self.fig_timeseries, timeseries_frame)
+        toolbar = NavigationToolbar2Tk(self.canvas_timeseries, timeseries_frame, pack_toolbar=False)
+        toolbar.pack(side=tk.BOTTOM, fill=tk.X)
+        self.canvas_timeseries.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        self.timeseries_chart = TimeSeriesChart(
+            self.fig_timeseries, self.ax_ts_consumption, self.ax_ts_price, self.canvas_timeseries)
+        trace_canvas(self.canvas_timeseries, 'draw.timeseries')
 
         # Monthly costs and consumption plot
         costs_frame = tk.LabelFrame(
@@ -565,6 +837,9 @@ class PowerConsumptionGUI:
         self.ax_consumption = self.ax_costs.twinx()  # Secondary y-axis for consumption
         self.canvas_costs = FigureCanvasTkAgg(self.fig_costs, costs_frame)
         self.canvas_costs.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        self.monthly_chart = MonthlyChart(
+            self.fig_costs, self.ax_costs, self.ax_consumption, self.canvas_costs)
+        trace_canvas(self.canvas_costs, 'draw.monthly')
 
         # Statistics frame
         stats_frame = tk.Frame(
@@ -589,7 +864,9 @@ class PowerConsumptionGUI:
             ('total_cost', 'Total Cost:'),
             ('avg_monthly_consumption', 'Average Monthly Consumption:'),
             ('avg_monthly_cost', 'Average Monthly Cost:'),
-            ('avg_price', 'Average Price (Overall):')
+            ('avg_price', 'Average Price (Overall):'),
+            ('cheap_band', 'Cheapest 25% Quarter-Hours:'),
+            ('expensive_band', 'Most Expensive 25% Quarter-Hours:')
         ]
 
         for key, label_text in stats_info:
@@ -616,320 +893,446 @@ class PowerConsumptionGUI:
             label.pack(side=tk.LEFT)
             self.stats_labels[key] = label
 
-    def update_analysis(self):
-        """Update all plots and statistics based on selected date range."""
+        # Tariff comparison: monthly total cost per tariff (all data)
+        comparison_frame = tk.LabelFrame(
+            self.scrollable_frame,
+            text="Tariff Comparison (All Available Data)",
+            font=('Arial', 12, 'bold'),
+            padx=10,
+            pady=10
+        )
+        comparison_frame.pack(fill=tk.X, padx=5, pady=5)
+
+        comparison_controls = tk.Frame(comparison_frame)
+        comparison_controls.pack(fill=tk.X, pady=(0, 5))
+        tk.Button(
+            comparison_controls,
+            text="📂 Load Tariffs...",
+            font=('Arial', 10),
+            bg='#3498db',
+            fg='white',
+            activebackground='#2980b9',
+            activeforeground='white',
+            command=self.browse_tariff_file,
+            padx=10,
+            pady=5,
+            cursor='hand2'
+        ).pack(side=tk.LEFT)
+        self.cheapest_label = tk.Label(
+            comparison_controls,
+            text="Load tariffs (JSON) to compare them with the current tariff",
+            font=('Arial', 10, 'bold'),
+            fg='#2c3e50'
+        )
+        self.cheapest_label.pack(side=tk.LEFT, padx=20)
+
+        self.comparison_table = ttk.Treeview(comparison_frame, show='headings', height=8)
+        self.comparison_table.pack(fill=tk.X)
+
+        # Load shifting: same-day reallocation of flexible load (all data)
+        shift_frame = tk.LabelFrame(
+            self.scrollable_frame,
+            text="Load Shifting Simulation (All Available Data)",
+            font=('Arial', 12, 'bold'),
+            padx=10,
+            pady=10
+        )
+        shift_frame.pack(fill=tk.X, padx=5, pady=5)
+
+        shift_controls = tk.Frame(shift_frame)
+        shift_controls.pack(fill=tk.X, pady=(0, 5))
+        self.shift_entries = {}
+        shift_inputs = [
+            ('budget', 'Shiftable kWh/day:', '2.0'),
+            ('max_kw', 'Max kW:', '2.0'),
+            ('window_start', 'Into window from:', '00:00'),
+            ('window_end', 'to:', '24:00')
+        ]
+        for key, label_text, default in shift_inputs:
+            tk.Label(
+                shift_controls,
+                text=label_text,
+                font=('Arial', 10)
+            ).pack(side=tk.LEFT, padx=(0, 5))
+            entry = tk.Entry(shift_controls, width=7, font=('Arial', 10))
+            entry.insert(0, default)
+            entry.pack(side=tk.LEFT, padx=(0, 15))
+            self.shift_entries[key] = entry
+
+        self.shift_button = tk.Button(
+            shift_controls,
+            text="▶ Simulate",
+            font=('Arial', 10),
+            bg='#3498db',
+            fg='white',
+            activebackground='#2980b9',
+            activeforeground='white',
+            command=self.run_load_shift,
+            padx=10,
+            pady=5,
+            cursor='hand2',
+            state='disabled'  # Disabled until data is loaded
+        )
+        self.shift_button.pack(side=tk.LEFT)
+        self.shift_label = tk.Label(
+            shift_frame,
+            text="—",
+            font=('Arial', 10, 'bold'),
+            fg='#2c3e50',
+            anchor='w'
+        )
+        self.shift_label.pack(fill=tk.X)
+
+        shift_columns = ('month', 'shifted', 'savings', 'cost_before', 'cost_after')
+        self.shift_table = ttk.Treeview(shift_frame, columns=shift_columns, show='headings', height=6)
+        for column, heading in zip(shift_columns, ('Month', 'Shifted', 'Savings', 'Cost Before', 'Cost After')):
+            self.shift_table.heading(column, text=heading)
+            self.shift_table.column(column, width=120, anchor='w' if column == 'month' else 'e')
+        self.shift_table.pack(fill=tk.X)
+
+    @traced('gui.update_analysis')
+    def update_analysis(self, quiet=False):
+        """
+        Update all plots and statistics based on selected date range.
+
+        Parameters
+        ----------
+        quiet : bool, optional
+            Report problems in the status bar only instead of message boxes (live updates).
+        """
         if self.df_consumption_full is None or self.df_price_full is None:
-            messagebox.showwarning(
-                "No Data Loaded",
-                "Please select both consumption and price files first."
-            )
+            if not quiet:
+                messagebox.showwarning(
+                    "No Data Loaded",
+                    "Please select both consumption and price files first."
+                )
             return
 
-        try:
-            self.status_label.config(text="Processing...", fg='#e67e22')
-            self.root.update()
+        # Get selected dates for consumption profile
+        start_date = self.start_date_entry.get_date()
+        end_date = self.end_date_entry.get_date()
 
-            # Get selected dates for consumption profile
-            start_date = self.start_date_entry.get_date()
-            end_date = self.end_date_entry.get_date()
-
-            # Validate date range
-            if start_date > end_date:
+        # Validate date range
+        if start_date > end_date:
+            if not quiet:
                 messagebox.showwarning(
                     "Invalid Date Range",
                     "Start date must be before or equal to end date."
                 )
-                self.status_label.config(
-                    text="Error: Invalid date range", fg='#e74c3c')
-                return
+            self.status_label.config(
+                text="Error: Invalid date range", fg='#e74c3c')
+            return
+
+        # The time series shows the selected days right away (constant time per update)
+        self.timeseries_chart.show_range(start_date, pd.Timestamp(end_date) + pd.Timedelta(days=1))
+
+        # A newer selection supersedes a still running analysis; its result is dropped
+        self._analysed_range = (start_date, end_date)
+        self.status_label.config(text="Processing...", fg='#e67e22')
+        self.worker.submit(
+            'analysis', self.analysis_job,
+            self.time_index, self.cost_calculator, self.profile_cube, start_date, end_date,
+            [self.tariff, *self.compare_tariffs],
+            on_done=lambda result: self.on_analysis_done(result, quiet),
+            on_error=lambda error: self.on_analysis_error(error, quiet),
+            on_progress=self.show_progress
+        )
 
-            # Filter data for consumption profile
-            df_selected = self.df_consumption_full[
-                (self.df_consumption_full['timestamp'].dt.date >= start_date) &
-                (self.df_consumption_full['timestamp'].dt.date <= end_date)
-            ].copy()
+    @staticmethod
+    @traced('gui.analysis_job')
+    def analysis_job(job, time_index, calculator, profile_cube, start_date, end_date, tariffs):
+        """
+        Compute everything the plots and statistics need (runs on the worker thread).
 
-            if df_selected.empty:
+        Returns None if the selected range holds no data, otherwise a dict of final arrays.
+        """
+        # Selected days as a row range of the time-sorted data
+        lo, hi = time_index.date_range(start_date, end_date)
+        if lo == hi:
+            return None
+
+        with span('profile_cube.compare'):
+            profile_selected, profile_full_normalized = profile_cube.compare(start_date, end_date)
+        profile = (SLOT_LABELS, profile_selected, profile_full_normalized)
+
+        # Monthly costs use ALL data (not filtered by date selection), read from the rollup cube
+        job.report("Calculating costs...")
+        rollup = calculator.rollup()
+        monthly = rollup.frame('month')
+        job.check()
+
+        # All tariffs in one pass over the merged data
+        comparison = calculator.compare_tariffs(tariffs)
+        job.check()
+
+        # Whole selected days: two lookups in the cube's cumulative day sums
+        with span('rollup.window'):
+            statistics = rollup.window(start_date, end_date)
+        window_start = pd.Timestamp(start_date)
+        window_end = pd.Timestamp(end_date) + pd.DateOffset(days=1)
+
+        # Each day's cheapest / most expensive quarter-hours by market price
+        price_bands = calculator.price_bands(start=window_start, end=window_end)
+        return {
+            'profile': profile,
+            'monthly': monthly,
+            'statistics': statistics,
+            'price_bands': price_bands,
+            'comparison': comparison,
+            'filled': calculator.merge_stats.filled,
+        }
+
+    @traced('gui.on_analysis_done')
+    def on_analysis_done(self, result, quiet=False):
+        """Draw the results of an analysis job."""
+        if result is None:
+            if not quiet:
                 messagebox.showwarning(
                     "No Data",
                     "No data available for the selected date range."
                 )
-                self.status_label.config(text="Error: No data", fg='#e74c3c')
-                return
+            self.status_label.config(text="Error: No data", fg='#e74c3c')
+            return
 
+        try:
             # Update consumption profile plot (uses selected date range)
-            self.plot_consumption_profile(df_selected)
+            self.plot_consumption_profile(*result['profile'])
 
             # Update monthly costs plot (uses ALL data)
-            self.plot_monthly_costs_and_consumption_full()
+            self.plot_monthly_costs_and_consumption_full(result['monthly'])
 
             # Update statistics (uses selected date range)
-            self.update_statistics(df_selected)
-
-            self.status_label.config(text="✓ Analysis updated", fg='#27ae60')
+            self.update_statistics(result['statistics'])
+            self.update_price_bands(result['price_bands'])
 
+            # Update tariff comparison (uses ALL data)
+            self.update_tariff_comparison(result['comparison'])
         except Exception as e:
-            messagebox.showerror("Error", f"An error occurred:\n{str(e)}")
-            self.status_label.config(text="Error occurred", fg='#e74c3c')
-
-    def plot_consumption_profile(self, df_selected):
-        """Plot consumption profile comparison."""
-        # Clear previous plot
-        self.ax_profile.clear()
-
-        # Create time-of-day profile for selected period
-        df_selected['hhmm'] = df_selected['timestamp'].dt.strftime('%H:%M')
-        profile_selected = df_selected.groupby(
-            'hhmm')['Verbrauch'].sum().sort_index()
-
-        # Create time-of-day profile for full dataset
-        df_full = self.df_consumption_full.copy()
-        df_full['hhmm'] = df_full['timestamp'].dt.strftime('%H:%M')
-        profile_full = df_full.groupby('hhmm')['Verbrauch'].sum().sort_index()
-
-        # Normalize full profile to selected period scale
-        scaling_factor = (
-            profile_selected.sum() / profile_full.sum()
-            if profile_full.sum() > 0 else 1
-        )
-        profile_full_normalized = profile_full * scaling_factor
-
-        # Plot
-        x_pos = np.arange(len(profile_selected))
-        self.ax_profile.bar(
-            x_pos,
-            profile_selected.values,
-            color='skyblue',
-            edgecolor='black',
-            alpha=0.7,
-            label='Selected Period'
-        )
-        self.ax_profile.plot(
-            x_pos,
-            profile_full_normalized.values,
-            color='red',
-            linestyle='--',
-            linewidth=2,
-            marker='o',
-            markersize=3,
-            alpha=0.7,
-            label='Overall (normalized)'
-        )
-
-        self.ax_profile.set_xlabel(
-            'Time of Day (HH:MM)', fontsize=11, fontweight='bold')
-        self.ax_profile.set_ylabel(
-            'Consumption (kWh)', fontsize=11, fontweight='bold')
-        self.ax_profile.set_title(
-            'Daily Consumption Profile Comparison',
-            fontsize=13,
-            fontweight='bold',
-            pad=15
-        )
-
-        # Set x-ticks (show every 8th label to avoid crowding)
-        tick_positions = x_pos[::8]
-        tick_labels = profile_selected.index[::8]
-        self.ax_profile.set_xticks(tick_positions)
-        self.ax_profile.set_xticklabels(tick_labels, rotation=45, ha='right')
-
-        self.ax_profile.legend(loc='upper left', fontsize=10)
-        self.ax_profile.grid(axis='y', linestyle='--', alpha=0.3)
-
-        self.fig_profile.tight_layout()
-        self.canvas_profile.draw()
-
-    def plot_monthly_costs_and_consumption_full(self):
-        """Plot monthly cost breakdown and consumption using ALL available data."""
-        # Clear previous plots
-        self.ax_costs.clear()
-        self.ax_consumption.clear()
-
-        # Use ALL data (not filtered by date selection)
-        df_full_consumption = self.df_consumption_full.copy()
-        df_full_price = self.df_price_full.copy()
-
-        # Initialize cost calculator with full data
-        self.cost_calculator = PowerCostCalculator(
-            consumption_df=df_full_consumption,
-            price_df=df_full_price,
-            price_col='Preis MC Auktion [EUR/MWh]',
-            consumption_col='Verbrauch',
-            timestamp_col='timestamp',
-            fixed_fee=2.16,
-            variable_fee_per_kwh=0.018
-        )
-
-        # Calculate costs
-        df_costs = self.cost_calculator.calculate_costs()
-        df_costs['month'] = df_costs['timestamp'].dt.to_period('M')
-
-        # Group by month
-        monthly_market = df_costs.groupby('month')['market_cost'].sum()
-        monthly_variable = df_costs.groupby('month')['variable_fee'].sum()
-        monthly_consumption = df_costs.groupby('month')['Verbrauch'].sum()
-
-        months = monthly_market.index.astype(str)
-        fixed_fee = self.cost_calculator.fixed_fee
-
-        # Calculate average price per month (cents/kWh)
-        monthly_total = monthly_market + monthly_variable + fixed_fee
-        avg_price_per_month = (
-            monthly_total / monthly_consumption) * 100  # to cents/kWh
-
-        # Plot stacked bar chart for COSTS (left axis)
-        x_pos = np.arange(len(months))
-        width = 0.6
-
-        p1 = self.ax_costs.bar(
-            x_pos, monthly_market, width,
-            label='Market Cost', color='#3498db'
-        )
-        p2 = self.ax_costs.bar(
-            x_pos, monthly_variable, width,
-            bottom=monthly_market,
-            label='Variable Fee', color='#e67e22'
-        )
-        p3 = self.ax_costs.bar(
-            x_pos, [fixed_fee] * len(months), width,
-            bottom=monthly_market + monthly_variable,
-            label='Fixed Fee', color='#2ecc71'
-        )
-
-        self.ax_costs.set_xlabel('Month', fontsize=11, fontweight='bold')
-        self.ax_costs.set_ylabel(
-            'Cost (EUR)', fontsize=11, fontweight='bold', color='#3498db')
-        self.ax_costs.set_title(
-            'Monthly Cost Breakdown & Consumption (All Available Data)',
-            fontsize=13,
-            fontweight='bold',
-            pad=15
-        )
-        self.ax_costs.set_xticks(x_pos)
-        self.ax_costs.set_xticklabels(months, rotation=45, ha='right')
-        self.ax_costs.tick_params(axis='y', labelcolor='#3498db')
-        self.ax_costs.grid(axis='y', linestyle='--', alpha=0.3)
-
-        # Add total cost labels on top of bars
-        for i, (market, variable) in enumerate(zip(monthly_market.values,
-                                                   monthly_variable.values)):
-            total = market + variable + fixed_fee
-            avg_price = avg_price_per_month.iloc[i]
-            self.ax_costs.text(
-                i, total + max(monthly_total) * 0.02,
-                f'{total:.2f} EUR\n({avg_price:.2f} c/kWh)',
-                ha='center', va='bottom',
-                fontsize=8, fontweight='bold',
-                color='#2c3e50'
-            )
-
-        self.ax_costs.set_ylim(0, max(monthly_total.values) * 1.25)
-
-        # Plot CONSUMPTION line (right axis)
-        p4 = self.ax_consumption.plot(
-            x_pos,
-            monthly_consumption.values,
-            color='#e74c3c',
-            linestyle='-',
-            linewidth=3,
-            marker='o',
-            markersize=8,
-            label='Consumption',
-            zorder=10
-        )
-
-        self.ax_consumption.set_ylabel(
-            'Consumption (kWh)', fontsize=11, fontweight='bold', color='#e74c3c')
-        self.ax_consumption.yaxis.set_label_position("right")
-
-        self.ax_consumption.tick_params(axis='y', labelcolor='#e74c3c')
-
-        # Add consumption value labels
-        for i, consumption in enumerate(monthly_consumption.values):
-            self.ax_consumption.text(
-                i, consumption + max(monthly_consumption) * 0.02,
-                f'{consumption:.1f} kWh',
-                ha='center', va='bottom',
-                fontsize=8, fontweight='bold',
-                color='#e74c3c'
-            )
-
-        self.ax_consumption.set_ylim(
-            0, max(500, max(monthly_consumption.values)))
-
-        # Combined legend
-        lines1, labels1 = self.ax_costs.get_legend_handles_labels()
-        lines2, labels2 = self.ax_consumption.get_legend_handles_labels()
-        self.ax_costs.legend(lines1 + lines2, labels1 +
-                             labels2, loc='upper left', fontsize=10)
-
-        self.fig_costs.tight_layout()
-        self.canvas_costs.draw()
-
-    def update_statistics(self, df_selected):
-        """Update statistics labels with monthly averages (based on selected period)."""
-        # Calculate statistics
-        total_consumption = df_selected['Verbrauch'].sum()
-
-        # Calculate date range
-        start_date = df_selected['timestamp'].min()
-        end_date = df_selected['timestamp'].max()
-
-        # Calculate number of months
-        num_months = ((end_date.year - start_date.year) * 12 +
-                      end_date.month - start_date.month + 1)
-
-        # Calculate total cost if cost calculator exists
-        # Note: cost_calculator is now based on FULL data from plot_monthly_costs_full
-        # So we need to recalculate for selected period
-        if self.cost_calculator:
-            # Filter price data for selected period
-            df_price_filtered = self.df_price_full[
-                (self.df_price_full['timestamp'].dt.date >= start_date.date()) &
-                (self.df_price_full['timestamp'].dt.date <= end_date.date())
-            ].copy()
-
-            # Create temporary calculator for selected period statistics
-            temp_calculator = PowerCostCalculator(
-                consumption_df=df_selected,
-                price_df=df_price_filtered,
-                price_col='Preis MC Auktion [EUR/MWh]',
-                consumption_col='Verbrauch',
-                timestamp_col='timestamp',
-                fixed_fee=2.16,
-                variable_fee_per_kwh=0.018
-            )
-
-            monthly_total = temp_calculator.monthly_total()
-            total_cost = monthly_total.sum()
-            avg_price = (total_cost / total_consumption) * 100  # cents/kWh
+            self.on_analysis_error(e)
+            return
 
-            # Monthly averages
-            avg_monthly_consumption = total_consumption / num_months if num_months > 0 else 0
-            avg_monthly_cost = total_cost / num_months if num_months > 0 else 0
+        # Report intervals priced by forward fill (consumption newer than prices)
+        if result['filled'] > 0:
+            self.status_label.config(
+                text=f"✓ Analysis updated ({result['filled']} intervals with estimated price)",
+                fg='#e67e22')
         else:
-            total_cost = 0
-            avg_price = 0
-            avg_monthly_consumption = 0
-            avg_monthly_cost = 0
+            self.status_label.config(text="✓ Analysis updated", fg='#27ae60')
+        # After the deferred canvas draws, so they are part of the summary
+        self.root.after_idle(self.update_timing_summary)
+
+    def on_analysis_error(self, error, quiet=False):
+        """Report a failed analysis (live updates only in the status bar)."""
+        if not quiet:
+            messagebox.showerror("Error", f"An error occurred:\n{str(error)}")
+        self.status_label.config(text=f"Error: {error}" if quiet else "Error occurred", fg='#e74c3c')
+
+    @traced('gui.plot_consumption_profile')
+    def plot_consumption_profile(self, labels, profile_selected, profile_full_normalized):
+        """Plot consumption profile comparison from precomputed profile arrays."""
+        # Artists are created once and then updated and blitted in place
+        self.profile_chart.update(labels, profile_selected, profile_full_normalized)
+
+    @traced('gui.plot_monthly_costs_and_consumption_full')
+    def plot_monthly_costs_and_consumption_full(self, monthly):
+        """Plot monthly cost breakdown and consumption using ALL available data."""
+        # Skipped when the monthly values did not change (e.g. only the dates did)
+        self.monthly_chart.update(monthly)
 
-        # Update labels
+    def update_statistics(self, totals):
+        """Update statistics labels with monthly averages (based on selected period)."""
         self.stats_labels['total_consumption'].config(
-            text=f"{total_consumption:.2f} kWh"
+            text=f"{totals.consumption:.2f} kWh"
         )
         self.stats_labels['total_cost'].config(
-            text=f"{total_cost:.2f} EUR"
+            text=f"{totals.total_cost:.2f} EUR"
         )
         self.stats_labels['avg_monthly_consumption'].config(
-            text=f"{avg_monthly_consumption:.2f} kWh/month"
+            text=f"{totals.avg_monthly_consumption:.2f} kWh/month"
         )
         self.stats_labels['avg_monthly_cost'].config(
-            text=f"{avg_monthly_cost:.2f} EUR/month"
+            text=f"{totals.avg_monthly_cost:.2f} EUR/month"
         )
         self.stats_labels['avg_price'].config(
-            text=f"{avg_price:.3f} cents/kWh"
+            text=f"{totals.avg_price * 100:.3f} cents/kWh"
         )
 
+    def run_load_shift(self):
+        """Validate the load-shifting inputs and simulate on the worker thread."""
+        if self.cost_calculator is None:
+            return
+        try:
+            budget = float(self.shift_entries['budget'].get().replace(',', '.'))
+            max_kw = float(self.shift_entries['max_kw'].get().replace(',', '.'))
+            window = TimeWindow(self.shift_entries['window_start'].get().strip(),
+                                self.shift_entries['window_end'].get().strip())
+            if budget < 0 or max_kw <= 0:
+                raise ValueError("budget must be >= 0 and max kW > 0")
+        except ValueError as e:
+            messagebox.showwarning("Invalid Input", f"Please check the load-shifting inputs:\n{str(e)}")
+            return
+
+        self.shift_label.config(text="Simulating...")
+        self.worker.submit(
+            'shift', self.load_shift_job, self.cost_calculator, budget, max_kw, (window,),
+            on_done=self.update_load_shift,
+            on_error=self.on_analysis_error
+        )
+
+    @staticmethod
+    def load_shift_job(job, calculator, budget, max_kw, windows):
+        """Simulate load shifting over all data (runs on the worker thread)."""
+        simulator = LoadShiftSimulator(calculator)
+        job.check()
+        return simulator.simulate(budget, max_kw, windows)
+
+    def update_load_shift(self, result):
+        """Show the monthly load-shifting savings."""
+        table = self.shift_table
+        table.delete(*table.get_children())
+        for month, row in result.monthly_frame().iterrows():
+            table.insert('', tk.END, values=(
+                str(month), f"{row.shifted:.1f} kWh", f"{row.savings:.2f} EUR",
+                f"{row.cost_before:.2f} EUR", f"{row.cost_after:.2f} EUR"))
+        cost = result.monthly_cost.sum()
+        percent = 100 * result.total_savings / cost if cost > 0 else 0
+        self.shift_label.config(
+            text=f"Shifting {result.daily_shifted.sum():.1f} kWh saves {result.total_savings:.2f} EUR "
+                 f"({percent:.1f}% of {cost:.2f} EUR)")
+
+    def update_price_bands(self, summary):
+        """Update the price band statistics (based on selected period)."""
+        shares = summary.consumption_share
+        for key, band in (('cheap_band', CHEAP), ('expensive_band', EXPENSIVE)):
+            self.stats_labels[key].config(
+                text=f"{summary.consumption[band]:.2f} kWh ({shares[band] * 100:.1f}%), "
+                     f"{summary.cost[band]:.2f} EUR"
+            )
+
+    @traced('gui.update_tariff_comparison')
+    def update_tariff_comparison(self, comparison):
+        """Fill the tariff comparison table: one row per month plus a total row."""
+        monthly = comparison.monthly_frame()
+        columns = ['month', *[f'tariff{i}' for i in range(len(comparison.tariffs))], 'cheapest']
+        table = self.comparison_table
+        table.delete(*table.get_children())
+        table.config(columns=columns)
+        table.heading('month', text='Month')
+        table.column('month', width=80, anchor='w')
+        for column, name in zip(columns[1:-1], comparison.tariffs):
+            table.heading(column, text=name)
+            table.column(column, width=130, anchor='e')
+        table.heading('cheapest', text='Cheapest')
+        table.column('cheapest', width=150, anchor='w')
+
+        for month, row in monthly.iterrows():
+            costs = [f"{cost:.2f} EUR" for cost in row.iloc[:-1]]
+            table.insert('', tk.END, values=(str(month), *costs, row['cheapest']))
+        totals = comparison.monthly_total.sum(axis=1)
+        table.insert('', tk.END, values=('Total', *[f"{cost:.2f} EUR" for cost in totals], comparison.cheapest))
+        table.config(height=len(monthly) + 1)
+
+        if len(comparison.tariffs) > 1 and len(monthly):
+            savings = totals[0] - totals.min()
+            if savings > 0:
+                text = (f"Cheapest overall: {comparison.cheapest} "
+                        f"(saves {savings:.2f} EUR vs. {comparison.tariffs[0]})")
+            else:
+                text = f"Current tariff {comparison.tariffs[0]} is the cheapest overall"
+            self.cheapest_label.config(text=text)
+
+    def update_timing_summary(self):
+        """Show the session's stage timings in the status bar and the open debug panel."""
+        if instrumentation.is_enabled() or instrumentation.records():
+            text = instrumentation.summary_text()
+        else:
+            text = "Stage timings off (enable them under ⏱ Timings)"
+        self.timing_label.config(text=text)
+        if self.debug_panel is not None and self.debug_panel.winfo_exists():
+            self.refresh_debug_panel()
+
+    def open_debug_panel(self):
+        """Open the stage timing panel, or raise it if it is already open."""
+        if self.debug_panel is not None and self.debug_panel.winfo_exists():
+            self.debug_panel.lift()
+            return
+        panel = tk.Toplevel(self.root)
+        panel.title("Stage Timings")
+        panel.geometry("1050x450")
+        self.debug_panel = panel
+
+        controls = tk.Frame(panel, padx=10, pady=5)
+        controls.pack(fill=tk.X)
+        self.trace_enabled_var = tk.BooleanVar(value=instrumentation.is_enabled())
+        self.trace_memory_var = tk.BooleanVar(value=instrumentation.memory_enabled())
+        tk.Checkbutton(
+            controls, text="Record timings", variable=self.trace_enabled_var,
+            command=self.toggle_instrumentation
+        ).pack(side=tk.LEFT)
+        tk.Checkbutton(
+            controls, text="Trace memory peaks (slower)", variable=self.trace_memory_var,
+            command=self.toggle_instrumentation
+        ).pack(side=tk.LEFT, padx=10)
+        tk.Button(controls, text="Export Chrome Trace...", command=self.export_trace).pack(side=tk.RIGHT)
+        tk.Button(controls, text="Clear", command=self.clear_timings).pack(side=tk.RIGHT, padx=5)
+        tk.Button(controls, text="Refresh", command=self.refresh_debug_panel).pack(side=tk.RIGHT)
+
+        table_frame = tk.Frame(panel)
+        table_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=(0, 10))
+        columns = ('stage', 'calls', 'total', 'self', 'mean', 'max', 'cpu', 'memory')
+        self.timing_table = ttk.Treeview(table_frame, columns=columns, show='headings')
+        for column, heading in zip(columns, ('Stage', 'Calls', 'Total', 'Self', 'Mean', 'Max', 'CPU', 'Memory Peak')):
+            self.timing_table.heading(column, text=heading)
+            self.timing_table.column(column, width=300 if column == 'stage' else 90,
+                                     anchor='w' if column == 'stage' else 'e')
+        scrollbar = ttk.Scrollbar(table_frame, orient="vertical", command=self.timing_table.yview)
+        self.timing_table.configure(yscrollcommand=scrollbar.set)
+        self.timing_table.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.refresh_debug_panel()
+
+    def refresh_debug_panel(self):
+        """Fill the debug panel with the session's stage totals, slowest first."""
+        table = self.timing_table
+        table.delete(*table.get_children())
+        for stats in instrumentation.summary():
+            memory = f"{stats.memory_peak / 2**20:.1f} MB" if stats.memory_peak is not None else "—"
+            table.insert('', tk.END, values=(
+                stats.name, stats.count, f"{stats.wall * 1000:.1f} ms", f"{stats.self_wall * 1000:.1f} ms",
+                f"{stats.wall_mean * 1000:.1f} ms", f"{stats.wall_max * 1000:.1f} ms",
+                f"{stats.cpu * 1000:.1f} ms", memory))
+
+    def toggle_instrumentation(self):
+        """Apply the debug panel's recording and memory tracing switches."""
+        if self.trace_enabled_var.get():
+            instrumentation.enable(memory=self.trace_memory_var.get())
+        else:
+            instrumentation.disable()
+        self.update_timing_summary()
+
+    def clear_timings(self):
+        """Start a new timing session."""
+        instrumentation.clear()
+        self.update_timing_summary()
+
+    def export_trace(self):
+        """Save the recorded spans as a Chrome trace (open in chrome://tracing or Perfetto)."""
+        path = filedialog.asksaveasfilename(
+            parent=self.debug_panel,
+            title="Export Chrome Trace",
+            defaultextension='.json',
+            initialfile='power_trace.json',
+            filetypes=[("Chrome trace", "*.json"), ("All files", "*.*")]
+        )
+        if not path:
+            return
+        try:
+            instrumentation.export_chrome_trace(path)
+        except OSError as e:
+            messagebox.showerror("Export Failed", f"Could not write trace:\n{e}", parent=self.debug_panel)
+            return
+        self.timing_label.config(text=f"Trace with {len(instrumentation.records())} spans written to {path}")
+
 
 def main():
     """Main entry point for the application."""
@@ -0,0 +1,376 @@
+"""
+Headless batch cost reports.
+
+Computes monthly cost tables for many installations (Anlagen) in one run, without prompts or a
+display. Consumption exports are grouped by installation, every installation is processed in a
+worker process against the shared price series, and the monthly tables are written as CSV,
+Parquet and/or JSON, optionally with a PNG chart rendered by the Agg backend.
+
+With --portfolio, all installations are costed together by PortfolioCalculator (one price
+alignment for all meters) and a portfolio_monthly table with the sums is written as well.
+
+Usage:
+    python power_report.py "downloads/verbrauch_anlage_*.xlsx" --prices "downloads/EXAAD1P_*.csv" \\
+        --output-dir reports --format csv --format json --charts
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+import matplotlib
+
+matplotlib.use('Agg')
+
+import pandas as pd  # noqa: E402
+from matplotlib.backends.backend_agg import FigureCanvasAgg  # noqa: E402
+from matplotlib.figure import Figure  # noqa: E402
+
+from charts import MonthlyChart  # noqa: E402
+from cost_calculator import PowerCostCalculator  # noqa: E402
+from data_loader import CACHE_DIR, CONSUMPTION_COL, PRICE_COL, load_consumption, load_prices  # noqa: E402
+from ingestion import series_key  # noqa: E402
+from portfolio import PortfolioCalculator  # noqa: E402
+from tariff import Tariff, provider_tariff  # noqa: E402
+
+FORMATS = ('csv', 'parquet', 'json')
+
+# Price series of the current worker process, loaded once by _init_worker
+_PRICES: pd.DataFrame | None = None
+
+
+@dataclass
+class ReportResult:
+    """
+    Outcome of reporting one installation.
+
+    Attributes
+    ----------
+    installation : str
+        Installation key, e.g. 'verbrauch_anlage_919667'.
+    files : list of str
+        Files written.
+    months : int
+        Number of months in the report.
+    consumption : float
+        Total consumption in kWh.
+    total_cost : float
+        Total cost including fees in EUR.
+    filled : int
+        Intervals priced with a forward- or backward-filled price (no published price).
+    dropped : int
+        Intervals left out for lack of any usable price.
+    error : str or None
+        Error message if the installation failed.
+    """
+
+    installation: str
+    files: list[str]
+    months: int = 0
+    consumption: float = 0.0
+    total_cost: float = 0.0
+    filled: int = 0
+    dropped: int = 0
+    error: str | None = None
+
+
+def expand_globs(patterns: list[str]) -> list[str]:
+    """Return the sorted, de-duplicated files matching any of the patterns."""
+    files = set()
+    for pattern in patterns:
+        files.update(glob.glob(pattern))
+    return sorted(files)
+
+
+def group_by_installation(files: list[str]) -> dict[str, list[str]]:
+    """Group consumption exports by installation key; within a group files stay sorted."""
+    groups: dict[str, list[str]] = {}
+    for path in files:
+        groups.setdefault(series_key(path), []).append(path)
+    return groups
+
+
+def combine(frames: list[pd.DataFrame]) -> pd.DataFrame:
+    """Concatenate exports of one series; for repeated intervals the later file wins."""
+    if len(frames) == 1:
+        return frames[0]
+    df = pd.concat(frames, ignore_index=True)
+    df = df.drop_duplicates('timestamp', keep='last')
+    return df.sort_values('timestamp', kind='stable').reset_index(drop=True)
+
+
+def load_price_series(price_files: list[str], cache_dir: str | None = CACHE_DIR) -> pd.DataFrame:
+    """Load and combine all price exports (sorted by name, so newer APG exports win)."""
+    frames = [load_prices(path, cache_dir=cache_dir) for path in price_files]
+    prices = combine(frames)
+    return prices[prices[PRICE_COL].notna()].reset_index(drop=True)
+
+
+def _init_worker(price_files: list[str], cache_dir: str | None):
+    """Process pool initializer: load the shared price series once per worker."""
+    global _PRICES
+    _PRICES = load_price_series(price_files, cache_dir)
+
+
+def write_table(monthly: pd.DataFrame, base: str, fmt: str) -> str:
+    """
+    Write a monthly table in one output format.
+
+    Parameters
+    ----------
+    monthly : pd.DataFrame
+        Monthly frame as returned by CostResult.monthly_frame().
+    base : str
+        Output path without extension.
+    fmt : {'csv', 'parquet', 'json'}
+        Output format.
+
+    Returns
+    -------
+    str
+        Path of the written file.
+    """
+    table = monthly.rename_axis('month').reset_index()
+    table['month'] = table['month'].astype(str)
+    path = f'{base}.{fmt}'
+    if fmt == 'csv':
+        table.to_csv(path, index=False)
+    elif fmt == 'parquet':
+        table.to_parquet(path, index=False)
+    else:
+        table.to_json(path, orient='records', indent=2)
+    return path
+
+
+def write_chart(monthly: pd.DataFrame, path: str, title: str):
+    """Render the monthly cost chart to a PNG file with the Agg backend."""
+    figure = Figure(figsize=(12, 6), dpi=100)
+    canvas = FigureCanvasAgg(figure)
+    ax_costs = figure.add_subplot(111)
+    chart = MonthlyChart(figure, ax_costs, ax_costs.twinx(), canvas)
+    chart.update(monthly)
+    ax_costs.set_title(title, fontsize=13, fontweight='bold', pad=15)
+    figure.savefig(path)
+
+
+def write_outputs(monthly: pd.DataFrame, name: str, output_dir: str, formats: list[str], charts: bool,
+                  title: str | None = None) -> list[str]:
+    """Write the monthly tables (and optionally the chart) named after name; return the paths."""
+    base = os.path.join(output_dir, f'{name}_monthly')
+    files = [write_table(monthly, base, fmt) for fmt in formats]
+    if charts:
+        write_chart(monthly, f'{base}.png', title or f'Monthly Cost Breakdown & Consumption ({name})')
+        files.append(f'{base}.png')
+    return files
+
+
+def load_installation(consumption_files: list[str], cache_dir: str | None = CACHE_DIR) -> pd.DataFrame:
+    """Load and combine all consumption exports of one installation."""
+    return combine([load_consumption(path, cache_dir=cache_dir) for path in consumption_files])
+
+
+def _try_load_installation(consumption_files: list[str], cache_dir: str | None):
+    """Pool task: return the combined consumption frame or the error message."""
+    try:
+        return load_installation(consumption_files, cache_dir)
+    except Exception as e:
+        return f'{type(e).__name__}: {e}'
+
+
+def report_installation(installation: str, consumption_files: list[str], output_dir: str,
+                        formats: list[str], charts: bool, tariff: Tariff,
+                        cache_dir: str | None = CACHE_DIR) -> ReportResult:
+    """
+    Compute and write the monthly report of one installation against the worker's price series.
+
+    Errors are returned in the result rather than raised, so one broken export does not stop a
+    batch.
+    """
+    result = ReportResult(installation=installation, files=[])
+    try:
+        consumption = load_installation(consumption_files, cache_dir)
+        calculator = PowerCostCalculator(
+            consumption_df=consumption,
+            price_df=_PRICES,
+            price_col=PRICE_COL,
+            consumption_col=CONSUMPTION_COL,
+            timestamp_col='timestamp',
+            tariff=tariff
+        )
+        monthly = calculator.rollup().frame('month')
+
+        result.files = write_outputs(monthly, installation, output_dir, formats, charts)
+        result.months = len(monthly)
+        result.consumption = float(monthly['consumption'].sum())
+        result.total_cost = float(monthly['total_cost'].sum())
+        result.filled = calculator.merge_stats.filled
+        result.dropped = calculator.merge_stats.dropped
+    except Exception as e:
+        result.error = f'{type(e).__name__}: {e}'
+    return result
+
+
+def report_portfolio(installations: dict[str, list[str]], price_files: list[str], output_dir: str,
+                     formats: list[str], charts: bool, tariff: Tariff,
+                     cache_dir: str | None = CACHE_DIR, jobs: int = 1) -> list[ReportResult]:
+    """
+    Cost all installations together with one price alignment and write their reports.
+
+    Consumption files are loaded in a process pool when jobs > 1; costing happens once in this
+    process. Besides the per-installation tables, 'portfolio_monthly' holds the sums over all
+    installations.
+    """
+    keys = list(installations)
+    if jobs > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            loaded = list(pool.map(_try_load_installation, installations.values(), [cache_dir] * len(keys)))
+    else:
+        loaded = [_try_load_installation(files, cache_dir) for files in installations.values()]
+
+    calculator = PortfolioCalculator(
+        load_price_series(price_files, cache_dir),
+        price_col=PRICE_COL,
+        timestamp_col='timestamp',
+        tariff=tariff
+    )
+    results = []
+    for key, consumption in zip(keys, loaded):
+        if isinstance(consumption, str):
+            results.append(ReportResult(installation=key, files=[], error=consumption))
+        else:
+            calculator.add_meter(key, consumption, consumption_col=CONSUMPTION_COL)
+    if not calculator.meters:
+        return results
+
+    portfolio = calculator.compute()
+    totals = portfolio.meter_totals()
+    for row, key in enumerate(portfolio.meters):
+        monthly = portfolio.monthly_frame(key)
+        monthly = monthly[portfolio.active[row]]  # months with data
+        results.append(ReportResult(
+            installation=key,
+            files=write_outputs(monthly, key, output_dir, formats, charts),
+            months=len(monthly),
+            consumption=float(totals.loc[key, 'consumption']),
+            total_cost=float(totals.loc[key, 'total_cost']),
+            filled=int(portfolio.filled[row]),
+            dropped=int(portfolio.dropped[row]),
+        ))
+    write_outputs(portfolio.monthly_frame(), 'portfolio', output_dir, formats, charts,
+                  title=f'Monthly Cost Breakdown & Consumption (Portfolio, {len(portfolio.meters)} meters)')
+    return results
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Return the command line parser."""
+    parser = argparse.ArgumentParser(
+        prog='power-report',
+        description='Write monthly electricity cost reports for many installations.')
+    parser.add_argument('consumption', nargs='+',
+                        help='Consumption XLSX files or glob patterns (grouped by installation)')
+    parser.add_argument('-p', '--prices', action='append', required=True,
+                        help='Price CSV file or glob pattern (repeatable)')
+    parser.add_argument('-o', '--output-dir', default='reports', help='Output directory (default: reports)')
+    parser.add_argument('-f', '--format', dest='formats', action='append', choices=FORMATS,
+                        help='Table format (repeatable, default: csv)')
+    parser.add_argument('--charts', action='store_true', help='Also write a PNG chart per installation')
+    parser.add_argument('--portfolio', action='store_true',
+                        help='Cost all installations together against one price alignment and write '
+                             'portfolio totals')
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count() or 1,
+                        help='Worker processes (default: number of CPUs)')
+    parser.add_argument('--fixed-fee', type=float, default=2.16, help='Monthly fixed fee in EUR (default: 2.16)')
+    parser.add_argument('--variable-fee', type=float, default=0.018,
+                        help='Variable fee in EUR/kWh (default: 0.018)')
+    parser.add_argument('--tariff', metavar='FILE',
+                        help='Tariff JSON file (grid fees, time-of-use windows, VAT); replaces --fixed-fee '
+                             'and --variable-fee')
+    parser.add_argument('--cache-dir', default=CACHE_DIR,
+                        help=f"Parsed-data cache directory, '' to disable (default: {CACHE_DIR})")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    Run the batch report.
+
+    Returns
+    -------
+    int
+        Exit status: 0 if all installations were reported, 1 otherwise.
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    formats = list(dict.fromkeys(args.formats or ['csv']))
+    cache_dir = args.cache_dir or None
+
+    consumption_files = expand_globs(args.consumption)
+    price_files = expand_globs(args.prices)
+    if not consumption_files:
+        parser.error('no consumption files match')
+    if not price_files:
+        parser.error('no price files match')
+    if 'parquet' in formats:
+        try:
+            pd.io.parquet.get_engine('auto')
+        except ImportError as e:
+            parser.error(f'parquet output needs pyarrow or fastparquet: {e}')
+
+    if args.tariff:
+        try:
+            with open(args.tariff, encoding='utf-8') as f:
+                tariff = Tariff.from_dict(json.load(f))
+        except (OSError, KeyError, TypeError, ValueError) as e:
+            parser.error(f'cannot read tariff {args.tariff}: {e}')
+    else:
+        tariff = provider_tariff(args.fixed_fee, args.variable_fee)
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    installations = group_by_installation(consumption_files)
+    tasks = [(key, files, args.output_dir, formats, args.charts, tariff, cache_dir)
+             for key, files in installations.items()]
+    print(f'{len(installations)} installations, {len(price_files)} price files')
+
+    jobs = max(1, min(args.jobs, len(tasks)))
+    if args.portfolio:
+        results = report_portfolio(installations, price_files, args.output_dir, formats, args.charts,
+                                   tariff, cache_dir, jobs)
+    elif jobs == 1:
+        _init_worker(price_files, cache_dir)
+        results = [report_installation(*task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                                 initargs=(price_files, cache_dir)) as pool:
+            results = list(pool.map(report_installation, *zip(*tasks)))
+
+    summary = []
+    for result in results:
+        if result.error:
+            print(f'{result.installation}: FAILED ({result.error})')
+            continue
+        # Filled intervals are priced from the nearest published price, e.g. beyond the price file
+        notes = ''.join(f', {count} intervals {label}' for count, label in (
+            (result.filled, 'with estimated price'), (result.dropped, 'without price')) if count)
+        print(f'{result.installation}: {result.months} months, {result.consumption:.2f} kWh, '
+              f'{result.total_cost:.2f} EUR{notes}')
+        summary.append({
+            'installation': result.installation,
+            'months': result.months,
+            'consumption': result.consumption,
+            'total_cost': result.total_cost,
+            'filled': result.filled,
+            'dropped': result.dropped,
+        })
+    if summary:
+        summary_path = os.path.join(args.output_dir, 'summary.csv')
+        pd.DataFrame(summary).to_csv(summary_path, index=False)
+        print(f'Summary written to {summary_path}')
+    return 1 if any(result.error for result in results) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
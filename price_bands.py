@@ -0,0 +1,157 @@
+"""
+Price band module.
+
+Classifies quarter-hours by the actual market price of their day instead of fixed clock windows:
+within every local calendar day, the cheapest and the most expensive share of the intervals form
+the 'cheap' and 'expensive' bands, the rest is 'normal'. All days are ranked at once with one
+lexsort, so a year of data takes milliseconds. Consumption and cost per band then come from one
+np.bincount each.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from profile_cube import SLOTS_PER_DAY, slot_of_day
+
+BANDS = ('cheap', 'normal', 'expensive')
+CHEAP, NORMAL, EXPENSIVE = range(len(BANDS))
+
+# Share of each day's intervals in the cheap and in the expensive band
+DEFAULT_SHARE = 0.25
+
+
+def daily_price_bands(wall_times: np.ndarray, price: np.ndarray, share: float = DEFAULT_SHARE) -> np.ndarray:
+    """
+    Assign every interval to the cheap, normal or expensive band of its day.
+
+    Parameters
+    ----------
+    wall_times : np.ndarray
+        Naive local datetime64 interval starts (see merge_engine.wall_time).
+    price : np.ndarray
+        Price per interval (any unit).
+    share : float, optional
+        Fraction (0-0.5) of each day's intervals in the cheap and in the expensive band, rounded
+        to whole intervals. Default: 0.25.
+
+    Returns
+    -------
+    np.ndarray
+        Band per interval (CHEAP, NORMAL or EXPENSIVE) as int8.
+
+    Raises
+    ------
+    ValueError
+        If share is outside 0-0.5.
+    """
+    if not 0 <= share <= 0.5:
+        raise ValueError(f"share must be between 0 and 0.5, got {share}")
+    n = len(price)
+    bands = np.full(n, NORMAL, dtype=np.int8)
+    if n == 0:
+        return bands
+
+    days = np.asarray(wall_times, dtype='datetime64[ns]').astype('datetime64[D]').astype(np.int64)
+    # Sorted by day, then by price: rank within the day is the offset from the day's first row
+    order = np.lexsort((price, days))
+    sorted_days = days[order]
+    day_start = np.concatenate(([0], np.flatnonzero(sorted_days[1:] != sorted_days[:-1]) + 1))
+    day_size = np.diff(np.append(day_start, n))
+    first = np.repeat(day_start, day_size)
+    size = np.repeat(day_size, day_size)
+    rank = np.arange(n) - first
+
+    in_band = np.rint(size * share).astype(np.int64)
+    sorted_bands = np.full(n, NORMAL, dtype=np.int8)
+    sorted_bands[rank < in_band] = CHEAP
+    sorted_bands[rank >= size - in_band] = EXPENSIVE
+    bands[order] = sorted_bands
+    return bands
+
+
+def clock_window_mask(wall_times: np.ndarray, windows: list[tuple[str, str]]) -> np.ndarray:
+    """
+    Return True for intervals whose slot of day lies in any of the given clock windows.
+
+    Parameters
+    ----------
+    wall_times : np.ndarray
+        Naive local datetime64 interval starts.
+    windows : list of tuple of str
+        ('HH:MM', 'HH:MM') slot ranges, both ends inclusive.
+
+    Returns
+    -------
+    np.ndarray
+        Boolean mask.
+    """
+    slot = slot_of_day(np.asarray(wall_times, dtype='datetime64[ns]'))
+    in_window = np.zeros(SLOTS_PER_DAY, dtype=bool)
+    for start, end in windows:
+        first, last = (int(h) * 4 + int(m) // 15 for h, m in (start.split(':'), end.split(':')))
+        in_window[first:last + 1] = True
+    return in_window[slot]
+
+
+@dataclass
+class PriceBandSummary:
+    """
+    Consumption and cost per price band.
+
+    Arrays hold one entry per band in BANDS order.
+
+    Attributes
+    ----------
+    share : float
+        Fraction of each day's intervals in the cheap and in the expensive band.
+    intervals : np.ndarray
+        Number of intervals per band.
+    consumption : np.ndarray
+        Consumption per band in kWh.
+    cost : np.ndarray
+        Market cost plus energy charges per band in EUR (monthly charges are not attributable
+        to intervals).
+    """
+
+    share: float
+    intervals: np.ndarray
+    consumption: np.ndarray
+    cost: np.ndarray
+
+    @property
+    def consumption_share(self) -> np.ndarray:
+        """Fraction of the consumption in each band."""
+        total = self.consumption.sum()
+        return self.consumption / total if total > 0 else np.zeros(len(BANDS))
+
+    def frame(self) -> pd.DataFrame:
+        """
+        Return the summary as a DataFrame indexed by band.
+
+        Returns
+        -------
+        pd.DataFrame
+            Columns intervals, consumption, consumption_share, cost and avg_price (EUR/kWh).
+        """
+        with np.errstate(divide='ignore', invalid='ignore'):
+            avg_price = self.cost / self.consumption
+        return pd.DataFrame({
+            'intervals': self.intervals,
+            'consumption': self.consumption,
+            'consumption_share': self.consumption_share,
+            'cost': self.cost,
+            'avg_price': avg_price,
+        }, index=pd.Index(BANDS, name='band'))
+
+
+def summarize_bands(bands: np.ndarray, consumption: np.ndarray, cost: np.ndarray,
+                    share: float = DEFAULT_SHARE) -> PriceBandSummary:
+    """Sum consumption and cost per band."""
+    return PriceBandSummary(
+        share=share,
+        intervals=np.bincount(bands, minlength=len(BANDS)),
+        consumption=np.bincount(bands, weights=consumption, minlength=len(BANDS)),
+        cost=np.bincount(bands, weights=cost, minlength=len(BANDS)),
+    )
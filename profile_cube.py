@@ -0,0 +1,116 @@
+"""
+Time-of-day profile module.
+
+Precomputes a per-day x 96-slot consumption matrix (15-minute slots of local wall time) with
+cumulative sums along the day axis. The profile of any date range is then the difference of two
+cumulative rows, independent of the number of intervals in the range, and the normalized
+full-range profile is computed once.
+"""
+
+import numpy as np
+import pandas as pd
+
+from merge_engine import INTERVAL, wall_time
+
+SLOTS_PER_DAY = 96
+
+# 'HH:MM' label of every slot
+SLOT_LABELS = np.array([f'{slot // 4:02d}:{slot % 4 * 15:02d}' for slot in range(SLOTS_PER_DAY)])
+
+
+def slot_of_day(wall_times: np.ndarray) -> np.ndarray:
+    """Return the 15-minute slot of the day (0-95) of naive local wall times."""
+    days = wall_times.astype('datetime64[D]')
+    return ((wall_times - days) // INTERVAL.to_timedelta64()).astype(np.int64)
+
+
+class ProfileCube:
+    """
+    Consumption per day and time-of-day slot with cumulative sums over days.
+
+    Days are consecutive local calendar days from the first to the last interval. On DST change
+    days the repeated hour adds to its slots and the skipped hour's slots stay zero, like grouping
+    by wall-clock 'HH:MM'.
+
+    Parameters
+    ----------
+    consumption_df : pd.DataFrame
+        Consumption data with timestamp and consumption columns.
+    consumption_col : str, optional
+        Name of the consumption column (kWh). Default: 'Verbrauch'.
+    timestamp_col : str, optional
+        Name of the timestamp column. Default: 'timestamp'.
+    """
+
+    def __init__(self, consumption_df: pd.DataFrame, consumption_col: str = 'Verbrauch',
+                 timestamp_col: str = 'timestamp'):
+        """
+        Initialize a ProfileCube from consumption data.
+
+        See class docstring for parameter details.
+        """
+        wall = wall_time(consumption_df[timestamp_col])
+        values = consumption_df[consumption_col].to_numpy(dtype=np.float64)
+        valid = ~np.isnat(wall) & ~np.isnan(values)
+        wall, values = wall[valid], values[valid]
+
+        days = wall.astype('datetime64[D]')
+        self.first_day = days.min() if len(days) else np.datetime64('1970-01-01', 'D')
+        n_days = int((days.max() - self.first_day).astype(int)) + 1 if len(days) else 0
+        slot = slot_of_day(wall)
+        index = (days - self.first_day).astype(np.int64) * SLOTS_PER_DAY + slot
+
+        self.daily = np.bincount(index, weights=values, minlength=n_days * SLOTS_PER_DAY).reshape(
+            n_days, SLOTS_PER_DAY)
+        self.cumulative = np.zeros((n_days + 1, SLOTS_PER_DAY))
+        np.cumsum(self.daily, axis=0, out=self.cumulative[1:])
+
+        # Full-range profile as share of total consumption, scaled per selection
+        total = self.cumulative[-1].sum()
+        self._full_share = self.cumulative[-1] / total if total > 0 else np.zeros(SLOTS_PER_DAY)
+
+    @property
+    def n_days(self) -> int:
+        """Number of days covered."""
+        return len(self.daily)
+
+    def _day_index(self, date) -> int:
+        """Row of a date in the cumulative matrix, clipped to the covered days."""
+        offset = (np.datetime64(pd.Timestamp(date).date(), 'D') - self.first_day).astype(np.int64)
+        return int(np.clip(offset, 0, self.n_days))
+
+    def profile(self, start_date=None, end_date=None) -> np.ndarray:
+        """
+        Return consumption per slot summed over a date range.
+
+        Parameters
+        ----------
+        start_date, end_date : date-like, optional
+            First and last local day of the range (inclusive). Default: first/last covered day.
+
+        Returns
+        -------
+        np.ndarray
+            96 slot sums in kWh.
+        """
+        lo = 0 if start_date is None else self._day_index(start_date)
+        hi = self.n_days if end_date is None else self._day_index(pd.Timestamp(end_date) + pd.Timedelta(days=1))
+        if hi <= lo:
+            return np.zeros(SLOTS_PER_DAY)
+        return self.cumulative[hi] - self.cumulative[lo]
+
+    def normalized_full_profile(self, total: float) -> np.ndarray:
+        """Return the full-range profile scaled to sum to total."""
+        return self._full_share * total
+
+    def compare(self, start_date=None, end_date=None) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Return the profile of a date range and the full-range profile normalized to its sum.
+
+        Returns
+        -------
+        tuple of np.ndarray
+            (selected profile, normalized full profile), 96 values each.
+        """
+        selected = self.profile(start_date, end_date)
+        return selected, self.normalized_full_profile(selected.sum())
@@ -0,0 +1,241 @@
+"""
+Rollup cube module.
+
+Materializes consumption, market cost, variable fee and interval counts per local day, ISO week
+(Monday to Sunday), month and year once per data version and tariff. Days are reduced from the
+intervals with one np.add.reduceat, every coarser level from the days, so reports and charts read
+a few hundred rows instead of grouping interval rows again. Day-aligned windows are answered from
+cumulative day sums with two binary searches.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+GRANULARITIES = ('day', 'week', 'month', 'year')
+MEASURES = ('consumption', 'market_cost', 'variable_fee', 'intervals')
+
+# Period frequency per granularity; 'W-SUN' periods run Monday to Sunday like ISO weeks
+PERIOD_FREQ = {'day': 'D', 'week': 'W-SUN', 'month': 'M', 'year': 'Y'}
+
+
+@dataclass
+class WindowTotals:
+    """
+    Cost totals of a time window, read from prefix sums.
+
+    Attributes
+    ----------
+    intervals : int
+        Number of merged intervals in the window.
+    months : int
+        Number of calendar months the window touches.
+    consumption : float
+        Consumption in kWh.
+    market_cost : float
+        Market cost in EUR.
+    variable_fee : float
+        Energy charges of the tariff in EUR.
+    fixed_fee : float
+        Monthly charges of the tariff times the months touched, in EUR.
+    """
+
+    intervals: int
+    months: int
+    consumption: float
+    market_cost: float
+    variable_fee: float
+    fixed_fee: float
+
+    @property
+    def total_cost(self) -> float:
+        """Market cost plus provider fees in EUR."""
+        return self.market_cost + self.variable_fee + self.fixed_fee
+
+    @property
+    def avg_price(self) -> float:
+        """Average price including fees in EUR/kWh (NaN without consumption)."""
+        return self.total_cost / self.consumption if self.consumption else float('nan')
+
+    @property
+    def avg_monthly_consumption(self) -> float:
+        """Consumption per month touched in kWh."""
+        return self.consumption / self.months if self.months else 0.0
+
+    @property
+    def avg_monthly_cost(self) -> float:
+        """Total cost per month touched in EUR."""
+        return self.total_cost / self.months if self.months else 0.0
+
+
+def _group_starts(keys: np.ndarray) -> np.ndarray:
+    """Index of the first element of every run of equal keys."""
+    if len(keys) == 0:
+        return np.empty(0, dtype=np.int64)
+    return np.concatenate(([0], np.flatnonzero(keys[1:] != keys[:-1]) + 1))
+
+
+def _period_start(granularity: str, days: np.ndarray) -> np.ndarray:
+    """First day of the period containing each day (datetime64[D])."""
+    if granularity == 'week':
+        # 1970-01-01 was a Thursday
+        return days - (days.astype(np.int64) + 3) % 7
+    if granularity == 'month':
+        return days.astype('datetime64[M]').astype('datetime64[D]')
+    if granularity == 'year':
+        return days.astype('datetime64[Y]').astype('datetime64[D]')
+    return days
+
+
+class RollupCube:
+    """
+    Sums per day, ISO week, month and year of merged interval costs.
+
+    Only periods with data have rows. Monthly charges are not attributable to days or weeks: the
+    month level charges monthly_fee once per month, the year level once per month with data.
+
+    Parameters
+    ----------
+    wall_times : np.ndarray
+        Naive local datetime64 interval starts in time order (see merge_engine.wall_time).
+    consumption, market_cost, variable_fee : np.ndarray
+        Per-interval values in kWh and EUR.
+    monthly_fee : float, optional
+        Monthly charges of the tariff in EUR. Default: 0.
+    """
+
+    def __init__(self, wall_times: np.ndarray, consumption: np.ndarray, market_cost: np.ndarray,
+                 variable_fee: np.ndarray, monthly_fee: float = 0.0):
+        """
+        Initialize a RollupCube and build all levels.
+
+        See class docstring for parameter details.
+        """
+        self.monthly_fee = monthly_fee
+        days = np.asarray(wall_times, dtype='datetime64[ns]').astype('datetime64[D]')
+        values = np.vstack((consumption, market_cost, variable_fee, np.ones(len(days))))
+        day_starts = _group_starts(days)
+        self.day_keys = days[day_starts]
+        if len(days):
+            day_values = np.add.reduceat(values, day_starts, axis=1)
+        else:
+            day_values = np.zeros((len(MEASURES), 0))
+
+        # Rows: MEASURES; columns: periods with data
+        self._keys = {'day': self.day_keys}
+        self._values = {'day': day_values}
+        self._month_rows = np.empty(0, dtype=np.int64)
+        for granularity in GRANULARITIES[1:]:
+            keys = _period_start(granularity, self.day_keys)
+            starts = _group_starts(keys)
+            self._keys[granularity] = keys[starts]
+            self._values[granularity] = (np.add.reduceat(day_values, starts, axis=1) if len(starts)
+                                         else np.zeros((len(MEASURES), 0)))
+            if granularity == 'month':
+                # Running month number per day, for the months a window touches
+                new_month = np.zeros(len(keys), dtype=bool)
+                new_month[starts] = True
+                self._month_rows = np.cumsum(new_month) - 1
+
+        self._cumulative = np.zeros((len(MEASURES), len(self.day_keys) + 1))
+        np.cumsum(day_values, axis=1, out=self._cumulative[:, 1:])
+
+    def periods(self, granularity: str) -> pd.PeriodIndex:
+        """Return the periods with data of a granularity, in order."""
+        return pd.DatetimeIndex(self._keys[granularity]).to_period(PERIOD_FREQ[granularity])
+
+    def values(self, granularity: str, measure: str) -> np.ndarray:
+        """Return one measure per period of a granularity (read-only view)."""
+        return self._values[granularity][MEASURES.index(measure)]
+
+    def fixed_fee(self, granularity: str) -> np.ndarray:
+        """Return the monthly charges per period of a granularity in EUR."""
+        if granularity == 'month':
+            return np.full(len(self._keys['month']), float(self.monthly_fee))
+        if granularity == 'year':
+            months = self._keys['month']
+            years = self._keys['year']
+            per_year = np.bincount(np.searchsorted(years, _period_start('year', months), side='right') - 1,
+                                   minlength=len(years))
+            return per_year * float(self.monthly_fee)
+        return np.zeros(len(self._keys[granularity]))
+
+    def frame(self, granularity: str = 'month', start_date=None, end_date=None) -> pd.DataFrame:
+        """
+        Return the sums of one granularity as a DataFrame indexed by period.
+
+        Parameters
+        ----------
+        granularity : {'day', 'week', 'month', 'year'}, optional
+            Period length. Default: 'month'.
+        start_date, end_date : date-like, optional
+            Keep the periods containing start_date to end_date (inclusive). Default: all.
+
+        Returns
+        -------
+        pd.DataFrame
+            Columns consumption, market_cost, variable_fee, fixed_fee, total_cost, avg_price
+            (EUR/kWh) and intervals, like CostResult.monthly_frame() plus the interval count.
+
+        Raises
+        ------
+        ValueError
+            If granularity is unknown.
+        """
+        if granularity not in GRANULARITIES:
+            raise ValueError(f"granularity must be one of {GRANULARITIES}, got {granularity!r}")
+        keys = self._keys[granularity]
+        lo, hi = 0, len(keys)
+        if start_date is not None:
+            first = _period_start(granularity, np.datetime64(pd.Timestamp(start_date).date(), 'D'))
+            lo = int(np.searchsorted(keys, first, side='left'))
+        if end_date is not None:
+            last = _period_start(granularity, np.datetime64(pd.Timestamp(end_date).date(), 'D'))
+            hi = max(int(np.searchsorted(keys, last, side='right')), lo)
+
+        consumption, market_cost, variable_fee, intervals = self._values[granularity][:, lo:hi]
+        fixed_fee = self.fixed_fee(granularity)[lo:hi]
+        total_cost = market_cost + variable_fee + fixed_fee
+        with np.errstate(divide='ignore', invalid='ignore'):
+            avg_price = total_cost / consumption
+        return pd.DataFrame({
+            'consumption': consumption,
+            'market_cost': market_cost,
+            'variable_fee': variable_fee,
+            'fixed_fee': fixed_fee,
+            'total_cost': total_cost,
+            'avg_price': avg_price,
+            'intervals': intervals.astype(np.int64),
+        }, index=self.periods(granularity)[lo:hi])
+
+    def window(self, start_date=None, end_date=None) -> WindowTotals:
+        """
+        Return the totals of local days start_date to end_date (inclusive).
+
+        Parameters
+        ----------
+        start_date, end_date : date-like, optional
+            First and last day. Default: first/last day with data.
+
+        Returns
+        -------
+        WindowTotals
+            Totals of the days; monthly charges once per calendar month with data in the window.
+        """
+        lo, hi = 0, len(self.day_keys)
+        if start_date is not None:
+            lo = int(np.searchsorted(self.day_keys, np.datetime64(pd.Timestamp(start_date).date(), 'D'), side='left'))
+        if end_date is not None:
+            hi = max(int(np.searchsorted(self.day_keys, np.datetime64(pd.Timestamp(end_date).date(), 'D'),
+                                         side='right')), lo)
+        consumption, market_cost, variable_fee, intervals = self._cumulative[:, hi] - self._cumulative[:, lo]
+        months = int(self._month_rows[hi - 1] - self._month_rows[lo]) + 1 if hi > lo else 0
+        return WindowTotals(
+            intervals=int(round(intervals)),
+            months=months,
+            consumption=float(consumption),
+            market_cost=float(market_cost),
+            variable_fee=float(variable_fee),
+            fixed_fee=months * self.monthly_fee,
+        )
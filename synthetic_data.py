@@ -0,0 +1,356 @@
+"""
+Synthetic input data module.
+
+Generates realistic consumption and price series of any length and writes them in the exact
+formats of the real exports, so loaders, merges and reports can be exercised at scale:
+
+- ökostrom consumption XLSX: one sheet with shared-string columns 'Datum' (local 'dd.mm.yyyy
+  HH:MM'), 'Timestamp' (the same wall time as epoch seconds, as in the real export, so repeated
+  autumn wall times repeat) and 'Verbrauch' (kWh, decimal comma)
+- APG day-ahead CSV (EXAAD1P): two byte order marks, ';'-separated 'Zeit von'/'Zeit bis' in
+  Vienna wall time with '2A'/'2B' for the repeated hour of the autumn DST change, prices with a
+  decimal comma, 15-minute or hourly resolution
+
+Series are deterministic for a given seed. Consumption follows a daily household shape (night
+base load, morning and evening peaks) with seasonal scaling and random appliance spikes; prices
+follow a daily duck curve with seasonal level, weekend discount, noise and occasional negative
+midday hours.
+"""
+
+import os
+import zipfile
+from xml.sax.saxutils import escape
+
+import numpy as np
+import pandas as pd
+
+from data_loader import CONSUMPTION_COL, PRICE_COL, TIMEZONE
+
+PRICE_RESOLUTIONS = {'15min': '15M', 'hourly': '60M'}
+
+_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '<Override PartName="/xl/sharedStrings.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sharedStrings+xml"/>'
+    '</Types>'
+)
+_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="xl/workbook.xml"/></Relationships>'
+)
+_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name="Verbrauchswerte" sheetId="1" r:id="rId1"/></sheets></workbook>'
+)
+_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+    'Target="worksheets/sheet1.xml"/>'
+    '<Relationship Id="rId2" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/sharedStrings" '
+    'Target="sharedStrings.xml"/></Relationships>'
+)
+
+
+def interval_starts(start, years: int, freq: str = '15min') -> pd.DatetimeIndex:
+    """
+    Return local interval starts from start over whole years.
+
+    Parameters
+    ----------
+    start : date-like
+        First local day.
+    years : int
+        Number of years covered.
+    freq : str, optional
+        Interval length. Default: '15min'.
+
+    Returns
+    -------
+    pd.DatetimeIndex
+        Timezone-aware (Europe/Vienna) interval starts; DST days have 92 or 100 quarter-hours.
+    """
+    first = pd.Timestamp(start).tz_localize(TIMEZONE)
+    last = (pd.Timestamp(start) + pd.DateOffset(years=years)).tz_localize(TIMEZONE)
+    return pd.date_range(first, last, freq=freq, inclusive='left')
+
+
+def _day_fraction(timestamps: pd.DatetimeIndex) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Local hour of day (fractional), day of year and weekday of every interval."""
+    hour = timestamps.hour.to_numpy() + timestamps.minute.to_numpy() / 60
+    return hour, timestamps.dayofyear.to_numpy(), timestamps.dayofweek.to_numpy()
+
+
+def synthetic_consumption(timestamps: pd.DatetimeIndex, seed: int = 0, annual_kwh: float = 3000.0) -> np.ndarray:
+    """
+    Generate household consumption per interval.
+
+    Parameters
+    ----------
+    timestamps : pd.DatetimeIndex
+        Local interval starts (15 minutes).
+    seed : int, optional
+        Random seed; one seed per meter gives different households. Default: 0.
+    annual_kwh : float, optional
+        Approximate yearly consumption in kWh. Default: 3000.
+
+    Returns
+    -------
+    np.ndarray
+        Consumption in kWh per interval, rounded to Wh like the real export.
+    """
+    rng = np.random.default_rng(seed)
+    hour, day_of_year, weekday = _day_fraction(timestamps)
+    shape = (0.6
+             + 1.2 * np.exp(-((hour - 7.5) / 1.2) ** 2)
+             + 2.0 * np.exp(-((hour - 19.0) / 2.0) ** 2)
+             + 0.5 * (weekday >= 5) * np.exp(-((hour - 12.5) / 2.5) ** 2))
+    season = 1 + 0.3 * np.cos(2 * np.pi * (day_of_year - 15) / 365.25)
+    base = shape * season * rng.lognormal(0.0, 0.25, len(timestamps))
+    spikes = rng.random(len(timestamps)) < 0.01
+    base[spikes] += rng.uniform(2, 8, spikes.sum())
+    interval_kwh = annual_kwh / (365.25 * 96)
+    return np.round(base * interval_kwh / base.mean(), 3)
+
+
+def synthetic_prices(timestamps: pd.DatetimeIndex, seed: int = 0) -> np.ndarray:
+    """
+    Generate day-ahead prices per interval.
+
+    Parameters
+    ----------
+    timestamps : pd.DatetimeIndex
+        Local interval starts (15 minutes or hourly).
+    seed : int, optional
+        Random seed. Default: 0.
+
+    Returns
+    -------
+    np.ndarray
+        Prices in EUR/MWh, rounded to cents.
+    """
+    rng = np.random.default_rng(seed)
+    hour, day_of_year, weekday = _day_fraction(timestamps)
+    level = 90 + 30 * np.cos(2 * np.pi * (day_of_year - 15) / 365.25)
+    duck = (25 * np.exp(-((hour - 8) / 2) ** 2)
+            + 40 * np.exp(-((hour - 19.5) / 2) ** 2)
+            - 45 * np.exp(-((hour - 13) / 2.5) ** 2) * (1 - np.cos(2 * np.pi * (day_of_year - 172) / 365.25)) / 2
+            - 15 * np.exp(-((hour - 3) / 2) ** 2))
+    # Day-to-day level changes, shared by all intervals of a day
+    days = np.asarray(timestamps.tz_localize(None).normalize(), dtype='datetime64[D]').astype(np.int64)
+    day_index = days - days.min() if len(days) else days
+    daily = rng.normal(0, 20, int(day_index.max()) + 1 if len(days) else 0)[day_index]
+    prices = level + duck - 15 * (weekday >= 5) + daily + rng.normal(0, 8, len(timestamps))
+    return np.round(prices, 2)
+
+
+def _decimal_comma(values: np.ndarray, decimals: int) -> np.ndarray:
+    """Format floats with a decimal comma."""
+    return np.char.replace(np.char.mod(f'%.{decimals}f', values), '.', ',')
+
+
+def _local_text(timestamps: pd.DatetimeIndex, with_seconds: bool = True) -> list[str]:
+    """Format local times as 'dd.mm.yyyy HH:MM[:SS]' (numpy formatting, much faster than strftime)."""
+    naive = np.asarray(timestamps.tz_localize(None), dtype='datetime64[s]')
+    stop = 19 if with_seconds else 16
+    return [f'{t[8:10]}.{t[5:7]}.{t[:4]} {t[11:stop]}' for t in np.datetime_as_string(naive).tolist()]
+
+
+def _wall_time_text(timestamps: pd.DatetimeIndex) -> list[str]:
+    """Format local times like _local_text with '2A'/'2B' hours in the repeated DST hour."""
+    text = _local_text(timestamps)
+    naive = timestamps.tz_localize(None)
+    ambiguous = naive.tz_localize(TIMEZONE, ambiguous='NaT', nonexistent='NaT').isna()
+    if ambiguous.any():
+        offset = naive - timestamps.tz_convert('UTC').tz_localize(None)
+        summer = offset > pd.Timedelta(hours=1)
+        for i in np.flatnonzero(ambiguous):
+            text[i] = f"{text[i][:11]}{'2A' if summer[i] else '2B'}{text[i][13:]}"
+    return text
+
+
+def write_price_csv(path: str, timestamps: pd.DatetimeIndex, prices: np.ndarray):
+    """
+    Write prices as an APG EXAAD1P day-ahead export.
+
+    Parameters
+    ----------
+    path : str
+        Output file.
+    timestamps : pd.DatetimeIndex
+        Local interval starts, evenly spaced.
+    prices : np.ndarray
+        Prices in EUR/MWh.
+    """
+    step = timestamps[1] - timestamps[0] if len(timestamps) > 1 else pd.Timedelta(minutes=15)
+    start = _wall_time_text(timestamps)
+    end = _wall_time_text(timestamps + step)
+    price_text = _decimal_comma(np.asarray(prices, dtype=np.float64), 2).tolist()
+    header = f'Zeit von [CET/CEST];Zeit bis [CET/CEST];{PRICE_COL};MC Referenzpreis [EUR/MWh]\r\n'
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        f.write('\ufeff\ufeff' + header)
+        f.writelines(f'{a};{b};{p};\r\n' for a, b, p in zip(start, end, price_text))
+
+
+class ConsumptionWorkbookWriter:
+    """
+    Writes ökostrom consumption XLSX exports for one timeline.
+
+    Every cell is a shared string like in the real workbook. The date and timestamp strings and
+    the row markup do not depend on the values, so they are rendered once and reused for every
+    meter written with the same writer.
+
+    Parameters
+    ----------
+    timestamps : pd.DatetimeIndex
+        Local interval starts.
+    """
+
+    def __init__(self, timestamps: pd.DatetimeIndex):
+        """
+        Initialize a ConsumptionWorkbookWriter and render the value-independent parts.
+
+        See class docstring for parameter details.
+        """
+        n = len(timestamps)
+        self.rows = n
+        dates = _local_text(timestamps, with_seconds=False)
+        # Wall time as epoch seconds like the real export ('Datum' read as UTC), not the instant
+        seconds = (np.asarray(timestamps.tz_localize(None), dtype='datetime64[s]')
+                   .astype(np.int64).tolist())
+        # Shared strings: headers, then date and timestamp of every row, then the distinct values
+        self._strings = ''.join(f'<si><t>{escape(s)}</t></si>' for s in ('Datum', 'Timestamp', CONSUMPTION_COL))
+        self._strings += ''.join(f'<si><t>{d}</t></si><si><t>{s}</t></si>' for d, s in zip(dates, seconds))
+        self._row_prefix = [
+            f'<row r="{r}"><c r="A{r}" t="s"><v>{d}</v></c><c r="B{r}" t="s"><v>{d + 1}</v></c>'
+            f'<c r="C{r}" t="s"><v>'
+            for r, d in zip(range(2, n + 2), range(3, 3 + 2 * n, 2))]
+
+    def write(self, path: str, consumption: np.ndarray):
+        """
+        Write one export.
+
+        Parameters
+        ----------
+        path : str
+            Output file.
+        consumption : np.ndarray
+            Consumption in kWh per interval, one value per timestamp.
+
+        Raises
+        ------
+        ValueError
+            If the number of values does not match the timeline.
+        """
+        if len(consumption) != self.rows:
+            raise ValueError(f"Expected {self.rows} consumption values, got {len(consumption)}")
+        values, value_index = np.unique(_decimal_comma(np.asarray(consumption, dtype=np.float64), 3),
+                                        return_inverse=True)
+        value_index = (value_index.ravel() + 3 + 2 * self.rows).tolist()
+        sheet = (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+            f'<dimension ref="A1:C{self.rows + 1}"/><sheetData>'
+            '<row r="1"><c r="A1" t="s"><v>0</v></c><c r="B1" t="s"><v>1</v></c><c r="C1" t="s"><v>2</v></c></row>'
+            + ''.join(f'{prefix}{v}</v></c></row>' for prefix, v in zip(self._row_prefix, value_index))
+            + '</sheetData></worksheet>'
+        )
+        shared = (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<sst xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+            f'count="{3 + 3 * self.rows}" uniqueCount="{3 + 2 * self.rows + len(values)}">'
+            + self._strings + ''.join(f'<si><t>{v}</t></si>' for v in values.tolist()) + '</sst>'
+        )
+        with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as archive:
+            archive.writestr('[Content_Types].xml', _CONTENT_TYPES)
+            archive.writestr('_rels/.rels', _ROOT_RELS)
+            archive.writestr('xl/workbook.xml', _WORKBOOK)
+            archive.writestr('xl/_rels/workbook.xml.rels', _WORKBOOK_RELS)
+            archive.writestr('xl/worksheets/sheet1.xml', sheet)
+            archive.writestr('xl/sharedStrings.xml', shared)
+
+
+def write_consumption_xlsx(path: str, timestamps: pd.DatetimeIndex, consumption: np.ndarray):
+    """
+    Write consumption as an ökostrom XLSX export (see ConsumptionWorkbookWriter).
+
+    Parameters
+    ----------
+    path : str
+        Output file.
+    timestamps : pd.DatetimeIndex
+        Local interval starts.
+    consumption : np.ndarray
+        Consumption in kWh per interval.
+    """
+    ConsumptionWorkbookWriter(timestamps).write(path, consumption)
+
+
+def price_file_name(timestamps: pd.DatetimeIndex, resolution: str) -> str:
+    """Return an EXAAD1P file name for the covered range, like the APG download."""
+    def utc(t):
+        return t.tz_convert('UTC').strftime('%Y-%m-%dT%H_%M_%SZ')
+    step = timestamps[1] - timestamps[0] if len(timestamps) > 1 else pd.Timedelta(minutes=15)
+    return (f'EXAAD1P_{utc(timestamps[0])}_{utc(timestamps[-1] + step)}_'
+            f'{PRICE_RESOLUTIONS[resolution]}_de_{utc(timestamps[-1] + step)}.csv')
+
+
+def write_dataset(directory: str, start='2020-01-01', years: int = 1, meters: int = 1,
+                  price_resolution: str = '15min', seed: int = 0) -> tuple[list[str], str]:
+    """
+    Write consumption exports for several meters and one matching price export.
+
+    Parameters
+    ----------
+    directory : str
+        Output directory (created if missing).
+    start : date-like, optional
+        First local day. Default: 2020-01-01.
+    years : int, optional
+        Years covered. Default: 1.
+    meters : int, optional
+        Number of consumption exports ('verbrauch_anlage_<n>.xlsx'). Default: 1.
+    price_resolution : {'15min', 'hourly'}, optional
+        Price interval length. Default: '15min'.
+    seed : int, optional
+        Base random seed; meter i uses seed + i. Default: 0.
+
+    Returns
+    -------
+    tuple
+        Consumption file paths and the price file path.
+
+    Raises
+    ------
+    ValueError
+        If price_resolution is unknown.
+    """
+    if price_resolution not in PRICE_RESOLUTIONS:
+        raise ValueError(f"price_resolution must be one of {tuple(PRICE_RESOLUTIONS)}, got {price_resolution!r}")
+    os.makedirs(directory, exist_ok=True)
+    quarter_hours = interval_starts(start, years)
+    writer = ConsumptionWorkbookWriter(quarter_hours)
+    consumption_files = []
+    for meter in range(meters):
+        path = os.path.join(directory, f'verbrauch_anlage_{100000 + meter}.xlsx')
+        writer.write(path, synthetic_consumption(quarter_hours, seed + meter))
+        consumption_files.append(path)
+
+    price_times = quarter_hours if price_resolution == '15min' else interval_starts(start, years, 'h')
+    price_path = os.path.join(directory, price_file_name(price_times, price_resolution))
+    write_price_csv(price_path, price_times, synthetic_prices(price_times, seed))
+    return consumption_files, price_path
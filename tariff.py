@@ -0,0 +1,347 @@
+"""
+Tariff model module.
+
+Describes electricity tariffs declaratively: a share of the spot market price, energy charges
+per kWh (provider fees, Netzentgelte grid fees, levies) that may apply only in time-of-use
+windows, monthly charges, and VAT. A tariff compiles against the local wall times of the merged
+intervals to a per-interval rate array, so costs of any tariff are one vectorized pass over
+consumption and price.
+
+Tariffs round-trip through plain dicts (JSON):
+
+    {"name": "Spot + grid", "market_factor": 1.0, "vat_rate": 0.2,
+     "energy_charges": [{"name": "Netznutzung", "rate": 0.0911, "category": "grid",
+                         "windows": [{"start": "06:00", "end": "22:00", "weekdays": [0, 1, 2, 3, 4]}]}],
+     "monthly_charges": [{"name": "Grundgebühr", "amount": 6.24, "category": "grid"}]}
+"""
+
+from dataclasses import dataclass, replace
+
+import numpy as np
+
+CATEGORIES = ('provider', 'grid', 'levy')
+
+ALL_WEEKDAYS = tuple(range(7))  # Monday = 0
+ALL_MONTHS = tuple(range(1, 13))
+
+PROVIDER_FIXED = 'Provider base fee'
+PROVIDER_ENERGY = 'Provider energy fee'
+
+# Netzentgelte Steiermark 2025, as in the web app's gridConfig
+GRID_BASE_FEE = 6.24  # EUR/month
+GRID_WORK_FEE = 0.0911  # EUR/kWh
+
+
+def _minutes(hhmm: str) -> int:
+    """Convert 'HH:MM' to minutes after midnight ('24:00' is 1440)."""
+    hours, minutes = hhmm.split(':')
+    return int(hours) * 60 + int(minutes)
+
+
+def calendar_fields(wall_times: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Return minute of day, weekday (Monday = 0) and month (1-12) of naive local wall times.
+
+    Computed once, the fields can be shared by many Tariff.compile() calls.
+    """
+    wall_times = np.asarray(wall_times, dtype='datetime64[ns]')
+    days = wall_times.astype('datetime64[D]')
+    minute = ((wall_times - days) // np.timedelta64(1, 'm')).astype(np.int64)
+    weekday = (days.astype(np.int64) + 3) % 7  # 1970-01-01 was a Thursday
+    month = wall_times.astype('datetime64[M]').astype(np.int64) % 12 + 1
+    return minute, weekday, month
+
+
+@dataclass(frozen=True)
+class TimeWindow:
+    """
+    Local wall-clock window in which a charge applies.
+
+    Attributes
+    ----------
+    start, end : str
+        'HH:MM' bounds, start inclusive and end exclusive. A window with end <= start wraps
+        past midnight; '00:00'-'24:00' is the whole day.
+    weekdays : tuple of int
+        Days of the week (Monday = 0). Default: all.
+    months : tuple of int
+        Calendar months (1-12). Default: all.
+    """
+
+    start: str = '00:00'
+    end: str = '24:00'
+    weekdays: tuple[int, ...] = ALL_WEEKDAYS
+    months: tuple[int, ...] = ALL_MONTHS
+
+    def __post_init__(self):
+        """Reject bounds that are not 'HH:MM' between 00:00 and 24:00."""
+        for bound in (self.start, self.end):
+            try:
+                minutes = _minutes(bound)
+                valid = 0 <= minutes <= 1440 and 0 <= int(bound.split(':')[1]) < 60
+            except (AttributeError, ValueError):
+                valid = False
+            if not valid:
+                raise ValueError(f"Invalid time {bound!r}, expected 'HH:MM'")
+
+    def mask(self, minute: np.ndarray, weekday: np.ndarray, month: np.ndarray) -> np.ndarray:
+        """Return True for intervals (given by minute of day, weekday, month) inside the window."""
+        start, end = _minutes(self.start), _minutes(self.end)
+        if start < end:
+            in_time = (minute >= start) & (minute < end)
+        else:
+            in_time = (minute >= start) | (minute < end)
+        return in_time & np.isin(weekday, self.weekdays) & np.isin(month, self.months)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'TimeWindow':
+        """Build a TimeWindow from a dict."""
+        return cls(
+            start=data.get('start', '00:00'),
+            end=data.get('end', '24:00'),
+            weekdays=tuple(data.get('weekdays', ALL_WEEKDAYS)),
+            months=tuple(data.get('months', ALL_MONTHS)),
+        )
+
+    def to_dict(self) -> dict:
+        """Return the window as a JSON-compatible dict."""
+        return {'start': self.start, 'end': self.end,
+                'weekdays': list(self.weekdays), 'months': list(self.months)}
+
+
+@dataclass(frozen=True)
+class EnergyCharge:
+    """
+    Charge per kWh, optionally limited to time-of-use windows.
+
+    Attributes
+    ----------
+    name : str
+        Display name.
+    rate : float
+        EUR/kWh (net of VAT).
+    category : {'provider', 'grid', 'levy'}
+        Kind of charge.
+    windows : tuple of TimeWindow
+        Windows in which the charge applies; empty means always.
+    """
+
+    name: str
+    rate: float
+    category: str = 'provider'
+    windows: tuple[TimeWindow, ...] = ()
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'EnergyCharge':
+        """Build an EnergyCharge from a dict."""
+        return cls(
+            name=data['name'],
+            rate=float(data['rate']),
+            category=data.get('category', 'provider'),
+            windows=tuple(TimeWindow.from_dict(w) for w in data.get('windows', ())),
+        )
+
+    def to_dict(self) -> dict:
+        """Return the charge as a JSON-compatible dict."""
+        return {'name': self.name, 'rate': self.rate, 'category': self.category,
+                'windows': [w.to_dict() for w in self.windows]}
+
+
+@dataclass(frozen=True)
+class MonthlyCharge:
+    """
+    Fixed charge per calendar month.
+
+    Attributes
+    ----------
+    name : str
+        Display name.
+    amount : float
+        EUR per month (net of VAT).
+    category : {'provider', 'grid', 'levy'}
+        Kind of charge.
+    """
+
+    name: str
+    amount: float
+    category: str = 'provider'
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'MonthlyCharge':
+        """Build a MonthlyCharge from a dict."""
+        return cls(name=data['name'], amount=float(data['amount']), category=data.get('category', 'provider'))
+
+    def to_dict(self) -> dict:
+        """Return the charge as a JSON-compatible dict."""
+        return {'name': self.name, 'amount': self.amount, 'category': self.category}
+
+
+@dataclass
+class CompiledTariff:
+    """
+    Gross (VAT-inclusive) rates of a tariff for a fixed set of intervals.
+
+    Attributes
+    ----------
+    market_factor : float
+        Multiplier on the market cost (consumption x price).
+    energy_rate : np.ndarray
+        EUR/kWh per interval from all energy charges.
+    monthly_fee : float
+        EUR per calendar month from all monthly charges.
+    """
+
+    market_factor: float
+    energy_rate: np.ndarray
+    monthly_fee: float
+
+
+@dataclass(frozen=True)
+class Tariff:
+    """
+    Declarative electricity tariff.
+
+    Attributes
+    ----------
+    name : str
+        Display name.
+    market_factor : float
+        Share of the spot market price paid (1.0 for spot-indexed tariffs, 0.0 for fixed-price
+        tariffs whose energy price is an EnergyCharge). Default: 1.0.
+    energy_charges : tuple of EnergyCharge
+        Charges per kWh.
+    monthly_charges : tuple of MonthlyCharge
+        Charges per month.
+    vat_rate : float
+        VAT applied to all components (0.2 for 20 %). Default: 0.0.
+    """
+
+    name: str
+    market_factor: float = 1.0
+    energy_charges: tuple[EnergyCharge, ...] = ()
+    monthly_charges: tuple[MonthlyCharge, ...] = ()
+    vat_rate: float = 0.0
+
+    @property
+    def monthly_fee(self) -> float:
+        """Net sum of monthly charges in EUR."""
+        return sum(charge.amount for charge in self.monthly_charges)
+
+    def energy_rate(self, name: str) -> float:
+        """Net rate of the named energy charge in EUR/kWh (0 if absent)."""
+        return sum(charge.rate for charge in self.energy_charges if charge.name == name)
+
+    def monthly_amount(self, name: str) -> float:
+        """Net amount of the named monthly charge in EUR (0 if absent)."""
+        return sum(charge.amount for charge in self.monthly_charges if charge.name == name)
+
+    def with_energy_charge(self, name: str, rate: float, category: str = 'provider') -> 'Tariff':
+        """Return a copy with the named always-on energy charge set to rate."""
+        others = tuple(c for c in self.energy_charges if c.name != name)
+        return replace(self, energy_charges=(*others, EnergyCharge(name, rate, category)))
+
+    def with_monthly_charge(self, name: str, amount: float, category: str = 'provider') -> 'Tariff':
+        """Return a copy with the named monthly charge set to amount."""
+        others = tuple(c for c in self.monthly_charges if c.name != name)
+        return replace(self, monthly_charges=(*others, MonthlyCharge(name, amount, category)))
+
+    @property
+    def time_of_use(self) -> bool:
+        """True if any energy charge is limited to time windows."""
+        return any(charge.windows for charge in self.energy_charges)
+
+    def compile(self, wall_times: np.ndarray, calendar: tuple | None = None) -> CompiledTariff:
+        """
+        Evaluate the tariff for intervals starting at the given local wall times.
+
+        Parameters
+        ----------
+        wall_times : np.ndarray
+            Naive local datetime64 interval starts (see merge_engine.wall_time).
+        calendar : tuple of np.ndarray, optional
+            calendar_fields(wall_times), if already computed.
+
+        Returns
+        -------
+        CompiledTariff
+            VAT-inclusive market factor, per-interval energy rate and monthly fee.
+        """
+        wall_times = np.asarray(wall_times, dtype='datetime64[ns]')
+        gross = 1.0 + self.vat_rate
+        rate = np.zeros(len(wall_times))
+
+        always = sum(c.rate for c in self.energy_charges if not c.windows)
+        rate += always
+        windowed = [c for c in self.energy_charges if c.windows]
+        if windowed:
+            minute, weekday, month = calendar if calendar is not None else calendar_fields(wall_times)
+            for charge in windowed:
+                applies = np.zeros(len(wall_times), dtype=bool)
+                for window in charge.windows:
+                    applies |= window.mask(minute, weekday, month)
+                rate += np.where(applies, charge.rate, 0.0)
+
+        return CompiledTariff(
+            market_factor=self.market_factor * gross,
+            energy_rate=rate * gross,
+            monthly_fee=self.monthly_fee * gross,
+        )
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'Tariff':
+        """
+        Build a Tariff from a dict (e.g. parsed JSON).
+
+        Raises
+        ------
+        ValueError
+            If a charge has an unknown category.
+        """
+        tariff = cls(
+            name=data.get('name', 'Tariff'),
+            market_factor=float(data.get('market_factor', 1.0)),
+            energy_charges=tuple(EnergyCharge.from_dict(c) for c in data.get('energy_charges', ())),
+            monthly_charges=tuple(MonthlyCharge.from_dict(c) for c in data.get('monthly_charges', ())),
+            vat_rate=float(data.get('vat_rate', 0.0)),
+        )
+        for charge in (*tariff.energy_charges, *tariff.monthly_charges):
+            if charge.category not in CATEGORIES:
+                raise ValueError(f"Unknown category {charge.category!r} of charge {charge.name!r}")
+        return tariff
+
+    def to_dict(self) -> dict:
+        """Return the tariff as a JSON-compatible dict."""
+        return {
+            'name': self.name,
+            'market_factor': self.market_factor,
+            'energy_charges': [c.to_dict() for c in self.energy_charges],
+            'monthly_charges': [c.to_dict() for c in self.monthly_charges],
+            'vat_rate': self.vat_rate,
+        }
+
+
+def provider_tariff(fixed_fee: float = 2.16, variable_fee_per_kwh: float = 0.018, name: str = 'Spot') -> Tariff:
+    """Spot-indexed tariff with only the provider's fixed and variable fee (the calculator's default)."""
+    return Tariff(
+        name=name,
+        energy_charges=(EnergyCharge(PROVIDER_ENERGY, variable_fee_per_kwh),),
+        monthly_charges=(MonthlyCharge(PROVIDER_FIXED, fixed_fee),),
+    )
+
+
+def fixed_price_tariff(energy_price: float, fixed_fee: float = 0.0, name: str = 'Fixed price') -> Tariff:
+    """Tariff with a fixed energy price in EUR/kWh instead of the spot market price."""
+    return Tariff(
+        name=name,
+        market_factor=0.0,
+        energy_charges=(EnergyCharge(PROVIDER_ENERGY, energy_price),),
+        monthly_charges=(MonthlyCharge(PROVIDER_FIXED, fixed_fee),),
+    )
+
+
+def spot_tariff_with_grid(fixed_fee: float = 2.16, variable_fee_per_kwh: float = 0.018,
+                          grid_base_fee: float = GRID_BASE_FEE, grid_work_fee: float = GRID_WORK_FEE) -> Tariff:
+    """Spot-indexed provider tariff plus Netzentgelte, as computed by the web app."""
+    return (provider_tariff(fixed_fee, variable_fee_per_kwh, name='Spot + grid fees')
+            .with_energy_charge('Netznutzungsentgelt', grid_work_fee, category='grid')
+            .with_monthly_charge('Netzgrundgebühr', grid_base_fee, category='grid'))
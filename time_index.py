@@ -0,0 +1,84 @@
+"""
+Time index module.
+
+Maps time and date windows to row ranges of time-sorted data with np.searchsorted on an int64
+epoch array, so filtering costs O(log n) and slices are views instead of per-row comparisons
+and copies.
+"""
+
+import numpy as np
+import pandas as pd
+
+from merge_engine import to_epoch_ns
+
+
+class TimeIndex:
+    """
+    Sorted UTC epoch index of a timestamp column.
+
+    Parameters
+    ----------
+    timestamps : array-like
+        Time-sorted datetime values (Series or DatetimeIndex). Timezone-aware values keep their
+        timezone for interpreting naive bounds and calendar days.
+
+    Raises
+    ------
+    ValueError
+        If the timestamps are not sorted.
+    """
+
+    def __init__(self, timestamps):
+        """
+        Initialize a TimeIndex.
+
+        See class docstring for parameter details.
+        """
+        self.epoch_ns = to_epoch_ns(timestamps)
+        if np.any(self.epoch_ns[1:] < self.epoch_ns[:-1]):
+            raise ValueError("TimeIndex requires time-sorted timestamps")
+        self.tz = getattr(getattr(timestamps, 'dtype', None), 'tz', None)
+
+    def __len__(self) -> int:
+        return len(self.epoch_ns)
+
+    def instant(self, value) -> int:
+        """Return a bound as UTC epoch ns; naive bounds are in the index's timezone."""
+        value = pd.Timestamp(value)
+        if value.tzinfo is None and self.tz is not None:
+            value = value.tz_localize(self.tz, ambiguous=True, nonexistent='shift_forward')
+        return value.as_unit('ns').value
+
+    def row_range(self, start=None, end=None) -> tuple[int, int]:
+        """
+        Map a [start, end) time window to a row range.
+
+        Parameters
+        ----------
+        start : datetime-like, optional
+            Start of the window (inclusive). Default: first row.
+        end : datetime-like, optional
+            End of the window (exclusive). Default: after the last row.
+
+        Returns
+        -------
+        tuple of int
+            (lo, hi) with lo <= hi.
+        """
+        lo, hi = 0, len(self.epoch_ns)
+        if start is not None:
+            lo = int(np.searchsorted(self.epoch_ns, self.instant(start), side='left'))
+        if end is not None:
+            hi = int(np.searchsorted(self.epoch_ns, self.instant(end), side='left'))
+        return lo, max(lo, hi)
+
+    def date_range(self, start_date=None, end_date=None) -> tuple[int, int]:
+        """Map local calendar days start_date..end_date (inclusive) to a row range."""
+        start = None if start_date is None else pd.Timestamp(start_date).normalize()
+        end = None if end_date is None else pd.Timestamp(end_date).normalize() + pd.Timedelta(days=1)
+        return self.row_range(start, end)
+
+    def select(self, df: pd.DataFrame, start_date=None, end_date=None) -> pd.DataFrame:
+        """Return the rows of df (indexed by this TimeIndex) within the given days, as a view."""
+        lo, hi = self.date_range(start_date, end_date)
+        return df.iloc[lo:hi]
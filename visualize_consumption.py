@@ -1,4 +1,8 @@
 from cost_calculator import PowerCostCalculator
+from data_loader import TIMEZONE, load_consumption, load_prices
+from merge_engine import wall_time
+from price_bands import BANDS, clock_window_mask
+from profile_cube import SLOT_LABELS, ProfileCube
 
 import pandas as pd
 import matplotlib.pyplot as plt
@@ -8,14 +12,13 @@ import matplotlib.pyplot as plt
 # TODO order of fees on bottom in plots
 # TODO automate data fetching from URLs
 
-# === XLSX einlesen ===
-df = pd.read_excel("verbrauch_anlage_919667.xlsx")
-
-# Zeitspalte aus Unix-Timestamp (zweite Spalte) umwandeln
-df["timestamp"] = pd.to_datetime(df["Timestamp"], unit="s", errors="coerce")
+# === XLSX einlesen (geparste Daten werden zwischengespeichert) ===
+# Zeitspalte aus Unix-Timestamp (Ortszeit Wien), Verbrauch bereits als float, ungültige Werte entfernt
+df_all = load_consumption("verbrauch_anlage_919667.xlsx")
+df = df_all
 
 # Verfügbare Monate extrahieren
-available_months = df["timestamp"].dt.to_period("M").dropna().unique()
+available_months = df["timestamp"].dt.tz_localize(None).dt.to_period("M").dropna().unique()
 available_months_str = sorted([str(m) for m in available_months])
 print("Verfügbare Monate im Datensatz:")
 for idx, m in enumerate(available_months_str):
@@ -30,53 +33,29 @@ else:
 
 if 0 <= choice_idx < len(available_months_str):
     start_month = available_months_str[choice_idx]
-    start_date = pd.Timestamp(start_month + "-01")
-    df = df[df["timestamp"] >= start_date]
+    start_date = pd.Timestamp(start_month + "-01", tz=TIMEZONE)
+    df = df[df["timestamp"] >= start_date].copy()
 else:
     choice_idx = 0
     print("Ungültige Auswahl. Es werden alle Daten verwendet.")
 
-# Verbrauchsspalte in float umwandeln (Komma als Dezimaltrenner)
-df["Verbrauch"] = df["Verbrauch"].str.replace(",", ".").astype(float)
-
-# Ungültige Werte entfernen
-df = df.dropna(subset=["timestamp", "Verbrauch"])
-
-# Zeit als hh:mm extrahieren
-df["hhmm"] = df["timestamp"].dt.strftime("%H:%M")
-
-# Gesamter Verbrauch pro Zeit-Slot (hh:mm) für ausgewählten Zeitraum
-total_by_time_selected = df.groupby("hhmm")["Verbrauch"].sum().sort_index()
-
-# Gesamter Verbrauch pro Zeit-Slot (hh:mm) für alle Daten
-df_all = pd.read_excel("verbrauch_anlage_919667.xlsx")
-df_all["timestamp"] = pd.to_datetime(
-    df_all["Timestamp"], unit="s", errors="coerce")
-df_all["Verbrauch"] = df_all["Verbrauch"].str.replace(",", ".").astype(float)
-df_all = df_all.dropna(subset=["timestamp", "Verbrauch"])
-df_all["hhmm"] = df_all["timestamp"].dt.strftime("%H:%M")
-total_by_time_all = df_all.groupby("hhmm")["Verbrauch"].sum().sort_index()
+# Verbrauch pro Zeit-Slot (hh:mm) aus dem Tag x Slot-Würfel statt groupby über alle Zeilen
+profile_cube = ProfileCube(df_all)
+profile_start = None if choice_idx == 0 else start_date
+total_by_time_selected = pd.Series(profile_cube.profile(profile_start), index=SLOT_LABELS)
+total_by_time_all = pd.Series(profile_cube.profile(), index=SLOT_LABELS)
 
 # Gesamter Stromverbrauch berechnen
-total_consumption_selected = df["Verbrauch"].sum()
-total_consumption_all = df_all["Verbrauch"].sum()
+total_consumption_selected = total_by_time_selected.sum()
+total_consumption_all = total_by_time_all.sum()
 print(f"Gesamter Stromverbrauch seit {available_months_str[choice_idx]}: {
       total_consumption_selected:.2f} kWh")
 print(f"Gesamter Stromverbrauch insgesamt: {total_consumption_all:.2f} kWh")
 
 # --- Kostenberechnung mit Marktpreisen ---
-# Lade Preisdaten
-price_df = pd.read_csv(
-    "EXAAD1P_2024-12-31T23_00_00Z_2025-12-31T23_00_00Z_15M_de_2025-10-22T20_37_02Z.csv",
-    sep=';',
-    decimal=','
-)
-# Zeitspalte korrekt parsen
-price_df['timestamp'] = pd.to_datetime(
-    price_df['\ufeffZeit von [CET/CEST]'], format="%d.%m.%Y %H:%M:%S", errors="coerce")
-# Preis umwandeln (Komma als Dezimaltrenner)
-price_df['Preis MC Auktion [EUR/MWh]'] = price_df['Preis MC Auktion [EUR/MWh]'].astype(
-    str).str.replace(',', '.').astype(float)
+# Lade Preisdaten (Zeitspalte und Preise bereits geparst)
+price_df = load_prices(
+    "EXAAD1P_2024-12-31T23_00_00Z_2025-12-31T23_00_00Z_15M_de_2025-10-22T20_37_02Z.csv")
 
 # Initialisiere und nutze die Kostenklasse
 cost_calc = PowerCostCalculator(
@@ -113,18 +92,9 @@ plt.legend()
 plt.tight_layout()
 
 # --- Analyse: Verbrauch teure vs. günstige Stunden ---
-# Definiere teure Stunden als Zeitbereiche
-
-
-def is_expensive_hour(hhmm):
-    from datetime import time
-    t = pd.to_datetime(hhmm, format="%H:%M").time()
-    morning = time(7, 0) <= t < time(10, 1)  # 07:00 bis 10:00 inkl. 10:00
-    evening = time(18, 0) <= t < time(20, 1)  # 18:00 bis 20:00 inkl. 20:00
-    return morning or evening
-
-
-expensive_mask = df["hhmm"].apply(is_expensive_hour)
+# Teure Stunden als feste Zeitbereiche: 07:00 bis 10:00 und 18:00 bis 20:00 (jeweils inkl.),
+# per Viertelstunden-Slot statt zeilenweisem Parsen
+expensive_mask = clock_window_mask(wall_time(df["timestamp"]), [("07:00", "10:00"), ("18:00", "20:00")])
 expensive_consumption = df[expensive_mask]["Verbrauch"].sum()
 cheap_consumption = df[~expensive_mask]["Verbrauch"].sum()
 total = expensive_consumption + cheap_consumption
@@ -133,6 +103,14 @@ cheap_pct = 100 * cheap_consumption / total if total > 0 else 0
 print(f"Teure Stunden: {expensive_consumption:.2f} kWh ({expensive_pct:.1f}%)")
 print(f"Günstige Stunden: {cheap_consumption:.2f} kWh ({cheap_pct:.1f}%)")
 
+# Preisbänder nach tatsächlichem Marktpreis: günstigste / teuerste 25 % der Viertelstunden je Tag
+band_names = {"cheap": "Günstigste 25%", "normal": "Mittlere 50%", "expensive": "Teuerste 25%"}
+bands = cost_calc.price_bands(share=0.25).frame()
+for band in BANDS:
+    row = bands.loc[band]
+    print(f"{band_names[band]} der Viertelstunden: {row.consumption:.2f} kWh "
+          f"({100 * row.consumption_share:.1f}%), {row.cost:.2f} EUR")
+
 # Barplot für Vergleich
 plt.figure(figsize=(6, 8))  # mehr Höhe
 bars = plt.bar(["Teure Stunden", "Günstige Stunden"], [